@@ -0,0 +1,59 @@
+# trade_simulator/benchmarks/bench_batch_costs.py
+"""
+Benchmark TradingModels.evaluate_batch against per-size scalar model calls
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_batch_costs
+"""
+import time
+
+import numpy as np
+
+from trade_simulator.models.orderbook import OrderBook
+from trade_simulator.models.trading_models import TradingModels
+
+
+def make_orderbook(levels=400, mid=95000.0, seed=0):
+    """Build a synthetic orderbook with the given number of levels per side"""
+    rng = np.random.default_rng(seed)
+    ask_prices = mid + 0.05 + np.cumsum(rng.uniform(0.01, 0.5, levels))
+    bid_prices = mid - 0.05 - np.cumsum(rng.uniform(0.01, 0.5, levels))
+    return OrderBook(ask_prices, rng.uniform(0.01, 5.0, levels),
+                     bid_prices, rng.uniform(0.01, 5.0, levels))
+
+
+def time_call(func, repeat):
+    """Return the best wall time in seconds over repeat calls"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes=10000, levels=400, repeat=20):
+    """Run the benchmark and print timings"""
+    models = TradingModels()
+    orderbook = make_orderbook(levels)
+    quantities = np.linspace(0.01, 500.0, sizes)
+
+    batch_time = time_call(lambda: models.evaluate_batch(orderbook, quantities), repeat)
+    print(f"evaluate_batch: {sizes} sizes x 2 sides, {levels} levels: {batch_time*1000:.3f} ms")
+
+    scalar_sizes = quantities[:200]
+
+    def scalar_loop():
+        mid = orderbook.mid_price
+        for quantity in scalar_sizes:
+            maker = models.predict_maker_taker(orderbook, quantity)
+            models.calculate_slippage(orderbook, quantity)
+            models.calculate_fees("OKX", "VIP0", quantity, mid, maker)
+            models.calculate_market_impact(orderbook, quantity, 0.02, mid)
+
+    scalar_time = time_call(scalar_loop, 3) / len(scalar_sizes) * sizes
+    print(f"scalar calls (extrapolated to {sizes} sizes, buy side only): {scalar_time*1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
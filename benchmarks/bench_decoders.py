@@ -0,0 +1,76 @@
+# trade_simulator/benchmarks/bench_decoders.py
+"""
+Benchmark the WebSocket message decoders on recorded or synthetic frames
+
+Each decoder is timed on decoding alone and on decoding plus building the
+OrderBook arrays, since the typed decoder moves numeric conversion into the
+parse step.
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_decoders [frames.jsonl]
+
+frames.jsonl holds one raw WebSocket frame per line, as received from the feed.
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+from trade_simulator.models.book_builder import OrderBookBuilder
+from trade_simulator.network.decoders import available_decoders, get_decoder
+
+
+def synthetic_frames(count=200, levels=400, mid=95000.0, seed=0):
+    """Generate raw L2 frames shaped like the GoQuant OKX feed"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        asks = mid + 0.1 * np.arange(1, levels + 1)
+        bids = mid - 0.1 * np.arange(levels)
+        frames.append(json.dumps({
+            "timestamp": "2025-05-04T10:39:13Z",
+            "exchange": "OKX",
+            "symbol": "BTC-USDT-SWAP",
+            "asks": [[f"{price:.1f}", f"{size:.2f}"] for price, size in zip(asks, rng.uniform(0.01, 50, levels))],
+            "bids": [[f"{price:.1f}", f"{size:.2f}"] for price, size in zip(bids, rng.uniform(0.01, 50, levels))],
+        }))
+    return frames
+
+
+def load_frames(path):
+    """Load one raw frame per line from a file"""
+    with open(path) as frames_file:
+        return [line.rstrip("\n") for line in frames_file if line.strip()]
+
+
+def time_frames(func, frames, repeat=3):
+    """Best mean time per frame in microseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            func(frame)
+        best = min(best, (time.perf_counter() - start) / len(frames))
+    return best * 1e6
+
+
+def main(path=None):
+    """Run the benchmark and print per-frame timings for each decoder"""
+    frames = load_frames(path) if path else synthetic_frames()
+    print(f"{len(frames)} frames, mean size {sum(map(len, frames)) / len(frames):.0f} bytes")
+    for name in available_decoders():
+        decoder = get_decoder(name)
+        builder = OrderBookBuilder()
+
+        def decode_and_build(frame):
+            builder.apply(decoder.decode(frame))
+            return builder.orderbook
+
+        decode_time = time_frames(decoder.decode, frames)
+        build_time = time_frames(decode_and_build, frames)
+        print(f"{name:>8}: decode {decode_time:8.1f} us/frame, decode + book {build_time:8.1f} us/frame")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,92 @@
+# trade_simulator/benchmarks/bench_depth_chart.py
+"""
+Benchmark DepthChart frame times against a full matplotlib redraw
+
+Renders a stream of books whose top levels change on every frame with the
+Agg backend, once by clearing and redrawing the axes (the previous
+visualization) and once per DepthChart mode, and reports mean and p99
+frame times. Requires matplotlib.
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_depth_chart
+"""
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from trade_simulator.benchmarks.bench_batch_costs import make_orderbook
+from trade_simulator.models.orderbook import OrderBook
+from trade_simulator.ui.depth_chart import DepthChart
+
+
+def make_books(count, levels=10, seed=0):
+    """Books around a slowly drifting mid whose top-level sizes change every tick"""
+    rng = np.random.default_rng(seed)
+    base = make_orderbook(levels, mid=95000.0, seed=seed)
+    books = []
+    drift = 0.0
+    for _ in range(count):
+        drift += rng.normal(0.0, 0.05)
+        books.append(OrderBook(base.ask_prices + drift, rng.uniform(0.01, 5.0, levels),
+                               base.bid_prices + drift, rng.uniform(0.01, 5.0, levels)))
+    return books
+
+
+def new_axes():
+    """Figure with the size of the GUI chart on a window-less Agg canvas"""
+    fig = Figure(figsize=(5, 3), dpi=80)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def full_redraw(books, levels):
+    """Frame times of clearing and redrawing the axes for every book"""
+    fig, ax = new_axes()
+    times = []
+    for book in books:
+        start = time.perf_counter()
+        ax.clear()
+        ax.bar(book.ask_prices[:levels], book.ask_sizes[:levels], color='red', alpha=0.5, label='Asks')
+        ax.bar(book.bid_prices[:levels], book.bid_sizes[:levels], color='green', alpha=0.5, label='Bids')
+        ax.set_title("Order Book Depth")
+        ax.set_xlabel("Price")
+        ax.set_ylabel("Quantity")
+        ax.legend()
+        ax.tick_params(axis='x', rotation=45)
+        fig.canvas.draw()
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def incremental(books, levels, mode):
+    """Frame times of DepthChart.update for every book, plus the chart"""
+    fig, ax = new_axes()
+    chart = DepthChart(ax, levels=levels, mode=mode)
+    fig.canvas.draw()
+    times = []
+    for book in books:
+        start = time.perf_counter()
+        chart.update(book)
+        times.append(time.perf_counter() - start)
+    return np.array(times), chart
+
+
+def report(name, times):
+    print(f"{name:<22} mean {times.mean()*1000:7.2f} ms   p99 {np.percentile(times, 99)*1000:7.2f} ms")
+
+
+def main(frames=300, levels=10):
+    """Run the benchmark and print timings"""
+    books = make_books(frames, levels)
+    print(f"{frames} frames, {levels} levels per side")
+    report("full redraw", full_redraw(books, levels))
+    for mode in ("bars", "depth"):
+        times, chart = incremental(books, levels, mode)
+        report(f"DepthChart ({mode})", times)
+        print(f"{'':<22} {chart.full_draws} full draws, {chart.skipped_frames} skipped frames")
+
+
+if __name__ == "__main__":
+    main()
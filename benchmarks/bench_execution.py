@@ -0,0 +1,43 @@
+# trade_simulator/benchmarks/bench_execution.py
+"""
+Benchmark ExecutionSimulator over a day of synthetic books
+
+Builds one book per second for 24 hours as (n, depth) matrices, the layout
+of a TickStore slice, and times a full-day parent order per slicing policy
+with one child order per minute.
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_execution
+"""
+import time
+
+import numpy as np
+
+from trade_simulator.models.execution_simulator import BookSeries, ExecutionSimulator
+
+
+def make_day(books=86400, depth=20, mid=95000.0, seed=0):
+    """Random-walk books with random top-level sizes, one per second"""
+    rng = np.random.default_rng(seed)
+    mids = mid + np.cumsum(rng.normal(0.0, 2.0, books))
+    steps = np.cumsum(rng.uniform(0.01, 0.5, depth))
+    return BookSeries(np.arange(books, dtype=np.float64),
+                      mids[:, None] + 0.05 + steps, rng.uniform(0.01, 5.0, (books, depth)),
+                      mids[:, None] - 0.05 - steps, rng.uniform(0.01, 5.0, (books, depth)))
+
+
+def main(books=86400, slices=1440, quantity=500.0):
+    """Run the benchmark and print timings"""
+    day = make_day(books)
+    simulator = ExecutionSimulator(refill_time=30.0)
+    print(f"{books} books, {slices} child orders over {books} s")
+    for policy in ("twap", "vwap", "ac"):
+        start = time.perf_counter()
+        result = simulator.run(day, quantity, "buy", policy, horizon=float(books), slices=slices)
+        elapsed = time.perf_counter() - start
+        print(f"{policy:<5} {elapsed*1000:8.1f} ms   shortfall {result.shortfall:12.2f}   "
+              f"impact {result.impact:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
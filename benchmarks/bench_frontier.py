@@ -0,0 +1,32 @@
+# trade_simulator/benchmarks/bench_frontier.py
+"""
+Benchmark the vectorized Almgren-Chriss efficient frontier against
+solving one schedule per risk aversion
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_frontier
+"""
+import numpy as np
+
+from trade_simulator.benchmarks.bench_batch_costs import make_orderbook, time_call
+from trade_simulator.models.trading_models import TradingModels
+
+
+def main(points=5000, slices=50, repeat=20, quantity=50.0):
+    models = TradingModels()
+    orderbook = make_orderbook()
+    risk_aversions = np.logspace(-9, -2, points)
+
+    frontier_time = time_call(
+        lambda: models.efficient_frontier(orderbook, quantity, 0.02, risk_aversions, slices), repeat)
+    loop_points = risk_aversions[:200]
+    loop_time = time_call(
+        lambda: [models.optimal_execution(orderbook, quantity, 0.02, l, slices) for l in loop_points], 3)
+
+    print(f"{points} frontier points, {slices} slices")
+    print(f"efficient_frontier: {frontier_time*1000:.3f} ms")
+    print(f"per-point optimal_execution (extrapolated): {loop_time / len(loop_points) * points * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
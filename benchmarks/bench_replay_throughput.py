@@ -0,0 +1,71 @@
+# trade_simulator/benchmarks/bench_replay_throughput.py
+"""
+End-to-end throughput of the book and model pipeline using max-speed replay
+
+Replays a tick file through OrderBookBuilder and TradingModels.estimate_costs
+as fast as possible. Without a file argument, synthetic frames are recorded
+to a temporary tick file first.
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_replay_throughput [ticks.bin]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from trade_simulator.benchmarks.bench_decoders import synthetic_frames
+from trade_simulator.models.book_builder import OrderBookBuilder
+from trade_simulator.models.trading_models import TradingModels
+from trade_simulator.network.replay_client import ReplayClient
+from trade_simulator.storage.tick_file import TickFileWriter
+
+PARAMS = {
+    "exchange": "OKX",
+    "order_type": "market",
+    "quantity": 100.0,
+    "volatility": 0.02,
+    "fee_tier": "VIP0",
+}
+
+
+def record_synthetic(path, count=2000):
+    """Record synthetic frames to a tick file and return the raw JSON size"""
+    raw_bytes = 0
+    with TickFileWriter(path, {"exchange": "OKX", "symbol": "BTC-USDT-SWAP"}) as writer:
+        for i, frame in enumerate(synthetic_frames(count)):
+            raw_bytes += len(frame)
+            writer.write(json.loads(frame), time.time() + i * 0.1)
+    return raw_bytes
+
+
+def main(path=None):
+    """Replay at max speed and print throughput"""
+    temporary = None
+    if path is None:
+        temporary = tempfile.NamedTemporaryFile(suffix=".bin", delete=False)
+        temporary.close()
+        path = temporary.name
+        raw_bytes = record_synthetic(path)
+        print(f"recorded {raw_bytes / 1e6:.1f} MB of JSON into {os.path.getsize(path) / 1e6:.1f} MB")
+
+    try:
+        builder = OrderBookBuilder()
+        models = TradingModels()
+
+        def process(message):
+            if builder.apply(message):
+                models.estimate_costs(builder.orderbook, PARAMS)
+
+        client = ReplayClient(path, process, speed="max")
+        client.run()
+        print(f"{client.messages_replayed} ticks in {client.elapsed:.3f}s: "
+              f"{client.messages_per_second:.0f} ticks/s through book build + cost models")
+    finally:
+        if temporary is not None:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
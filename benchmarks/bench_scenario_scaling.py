@@ -0,0 +1,57 @@
+# trade_simulator/benchmarks/bench_scenario_scaling.py
+"""
+Benchmark ScenarioRunner scaling from 1 to N worker processes
+
+Evaluates a symbols x snapshots x sizes x volatility x fee tier x side grid
+with an increasing number of workers and reports wall time and speed-up
+over the in-process run.
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_scenario_scaling
+"""
+import os
+import time
+
+import numpy as np
+
+from trade_simulator.benchmarks.bench_batch_costs import make_orderbook
+from trade_simulator.models.scenario_runner import ScenarioRunner
+
+
+def worker_counts(max_workers):
+    """1, 2, 4, ... up to and including max_workers"""
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    return counts + [max_workers]
+
+
+def main(symbols=4, snapshots=25, levels=400, sizes=500, max_workers=None, repeat=3):
+    """Run the benchmark and print timings"""
+    max_workers = max_workers or os.cpu_count() or 1
+    books = [make_orderbook(levels, mid=100.0 * (i // snapshots + 1), seed=i)
+             for i in range(symbols * snapshots)]
+    quantities = np.linspace(0.01, 500.0, sizes)
+    grid = dict(sides=("buy", "sell"), volatilities=(0.01, 0.02, 0.05),
+                fee_tiers=("VIP0", "VIP1", "VIP2", "VIP3", "VIP4", "VIP5"))
+    scenarios = 2 * 3 * 6
+    print(f"{len(books)} books x {levels} levels, {sizes} sizes, {scenarios} scenarios "
+          f"({len(books) * sizes * scenarios:,} evaluations), {os.cpu_count()} CPUs")
+
+    baseline = None
+    for workers in worker_counts(max_workers):
+        with ScenarioRunner(max_workers=workers) as runner:
+            runner.run(books[:1], quantities[:1], **grid)  # Start the pool outside the timing
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                runner.run(books, quantities, **grid)
+                best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"{workers:3d} workers: {best*1000:9.1f} ms  speed-up {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
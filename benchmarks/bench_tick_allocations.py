@@ -0,0 +1,78 @@
+# trade_simulator/benchmarks/bench_tick_allocations.py
+"""
+Microbenchmark of per-tick allocations in the metrics update path
+
+Compares the old pattern, which built a new TradingModels on every UI tick,
+with a long-lived engine calling estimate_costs. The allocation figure is the
+peak number of bytes traced by tracemalloc while one tick runs.
+
+Run from the directory containing the package:
+    python -m trade_simulator.benchmarks.bench_tick_allocations
+"""
+import time
+import tracemalloc
+
+from trade_simulator.benchmarks.bench_batch_costs import make_orderbook
+from trade_simulator.models.trading_models import TradingModels
+
+PARAMS = {
+    "exchange": "OKX",
+    "order_type": "market",
+    "quantity": 100.0,
+    "volatility": 0.02,
+    "fee_tier": "VIP0",
+}
+
+
+def tick_per_call_instance(orderbook, _models):
+    """Old update_metrics: a fresh TradingModels and separate model calls every tick"""
+    models = TradingModels()
+    mid_price = orderbook.mid_price
+    maker_proportion = models.predict_maker_taker(orderbook, PARAMS['quantity'])
+    slippage = models.calculate_slippage(orderbook, PARAMS['quantity'], PARAMS['order_type'])
+    models.estimate_fill(orderbook, PARAMS['quantity'])
+    fees = models.calculate_fees(PARAMS['exchange'], PARAMS['fee_tier'],
+                                 PARAMS['quantity'], mid_price, maker_proportion)
+    market_impact = models.calculate_market_impact(orderbook, PARAMS['quantity'],
+                                                   PARAMS['volatility'], mid_price)
+    return (PARAMS['quantity'] * mid_price) * (1 + slippage) + fees + market_impact
+
+
+def tick_long_lived(orderbook, models):
+    """New update_metrics: one injected engine reused across ticks"""
+    return models.estimate_costs(orderbook, PARAMS)["net_cost"]
+
+
+def measure(tick, orderbook, models, ticks):
+    """Return (mean peak bytes, mean microseconds) per tick"""
+    for _ in range(10):
+        tick(orderbook, models)
+
+    peak_bytes = 0
+    tracemalloc.start()
+    for _ in range(ticks):
+        tracemalloc.reset_peak()
+        base_bytes = tracemalloc.get_traced_memory()[0]
+        tick(orderbook, models)
+        peak_bytes += tracemalloc.get_traced_memory()[1] - base_bytes
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick(orderbook, models)
+    elapsed = time.perf_counter() - start
+    return peak_bytes / ticks, elapsed / ticks * 1e6
+
+
+def main(ticks=200, levels=400):
+    """Run the benchmark and print per-tick figures"""
+    orderbook = make_orderbook(levels)
+    models = TradingModels()
+    for label, tick in (("before (new TradingModels per tick)", tick_per_call_instance),
+                        ("after (long-lived engine)", tick_long_lived)):
+        peak_bytes, micros = measure(tick, orderbook, models, ticks)
+        print(f"{label}: peak {peak_bytes:.0f} B allocated/tick, {micros:.1f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
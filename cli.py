@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Trade Simulator - Headless batch simulation entry point
+
+Runs the cost models over live feeds, a recorded tick file or a tick store
+for a grid of parameters and streams one row per (book, parameter set,
+quantity) to CSV or Parquet. Nothing here imports tkinter or matplotlib, so
+it runs on machines without a display:
+
+    python -m trade_simulator.cli --replay btc.ticks --quantities 1,10,100 \\
+        --fee-tiers VIP0,VIP5 --sides buy,sell --output costs.parquet
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+import urllib.parse
+
+import numpy as np
+
+from trade_simulator.models.book_builder import OrderBookBuilder
+from trade_simulator.models.fee_schedule import FeeSchedule
+from trade_simulator.models.limit_orders import LimitOrderModel
+from trade_simulator.models.online_models import OnlineCostModels
+from trade_simulator.models.trading_models import BATCH_DTYPE, MATRIX_ORDER_TYPES, ORDER_TYPES, TradingModels
+from trade_simulator.network.replay_client import ReplayClient
+from trade_simulator.network.feed_manager import FeedManager
+from trade_simulator.storage.tick_file import TickFileWriter
+from trade_simulator.storage.tick_store import TickStore
+from trade_simulator.utils.logger import setup_logger
+from trade_simulator.utils.performance_monitor import PerformanceMonitor
+from trade_simulator.utils.timestamps import parse_exchange_timestamp
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional dependency, only needed for Parquet output
+    pyarrow = None
+
+logger = setup_logger("TradeSimulatorCLI")
+
+# Parameter columns preceding the BATCH_DTYPE result columns in every row
+PARAMETER_COLUMNS = ("timestamp", "exchange", "symbol", "side", "order_type", "volatility", "fee_tier")
+COLUMNS = PARAMETER_COLUMNS + BATCH_DTYPE.names
+
+
+class CsvResultWriter:
+    """Streams result rows to a CSV file or stdout"""
+    def __init__(self, path):
+        self._file = sys.stdout if path == "-" else open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+        self.rows_written = 0
+
+    def write(self, columns):
+        """
+        Write a block of rows
+
+        Args:
+            columns (dict): Column name to equal-length array or list
+        """
+        rows = zip(*(np.asarray(columns[name]).tolist() for name in COLUMNS))
+        self._writer.writerows(rows)
+        self.rows_written += len(columns["timestamp"])
+
+    def close(self):
+        if self._file is sys.stdout:
+            self._file.flush()
+        else:
+            self._file.close()
+
+
+class ParquetResultWriter:
+    """Streams result rows to a Parquet file in row groups"""
+    def __init__(self, path, row_group_size=65536):
+        if pyarrow is None:
+            raise ImportError("pyarrow is required for Parquet output")
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._pending = []
+        self._pending_rows = 0
+        self._writer = None
+
+    def write(self, columns):
+        """
+        Write a block of rows
+
+        Args:
+            columns (dict): Column name to equal-length array or list
+        """
+        self._pending.append(pyarrow.table({name: columns[name] for name in COLUMNS}))
+        self._pending_rows += len(columns["timestamp"])
+        if self._pending_rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as one row group"""
+        if not self._pending:
+            return
+        table = pyarrow.concat_tables(self._pending)
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        self.rows_written += self._pending_rows
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_result_writer(path, output_format=None):
+    """
+    Create a result writer for a path
+
+    Args:
+        path (str): Output file, or '-' for CSV on stdout
+        output_format (str): 'csv' or 'parquet' (inferred from the extension if None)
+    """
+    if output_format is None:
+        output_format = "parquet" if path.endswith((".parquet", ".pq")) else "csv"
+    if output_format == "parquet":
+        return ParquetResultWriter(path)
+    if output_format == "csv":
+        return CsvResultWriter(path)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+class BatchSimulator:
+    """
+    Evaluates a parameter grid on every book from a feed and writes the results
+
+    Quantities are evaluated together per book with TradingModels.evaluate_batch;
+    every combination of order type, volatility, fee tier and side is a
+    separate block of rows.
+    """
+    def __init__(self, models, writer, quantities, sides=("buy", "sell"), order_types=("market",),
+                 volatilities=(0.02,), fee_tiers=("VIP0",), exchange="OKX", max_depth=None,
+                 monitor=None):
+        """
+        Initialize the simulator
+
+        Args:
+            models (TradingModels): Cost models
+            writer: CsvResultWriter or ParquetResultWriter
+            quantities: Order sizes evaluated on every book
+            sides, order_types, volatilities, fee_tiers: Parameter grid axes
+            exchange (str): Exchange used for the fee lookup
+            max_depth (int): Levels per side kept when building books
+            monitor (PerformanceMonitor): Receives book_build, compute and write spans
+        """
+        self.models = models
+        self.monitor = monitor or PerformanceMonitor()
+        self.writer = writer
+        self.quantities = np.asarray(quantities, dtype=np.float64)
+        self.sides = tuple(sides)
+        self.grid = list(itertools.product(order_types, volatilities, fee_tiers))
+        self.exchange = exchange
+        self.book_builder = OrderBookBuilder(max_depth=max_depth)
+        self.books_evaluated = 0
+
+    def process_message(self, data):
+        """Feed callback: apply an L2 message and evaluate the resulting book"""
+        try:
+            start_ns = self.monitor.now()
+            if not self.book_builder.apply(data):
+                return
+            orderbook = self.book_builder.orderbook
+            if not orderbook.is_valid:
+                return
+            self.monitor.stop("book_build", start_ns)
+            timestamp = parse_exchange_timestamp(orderbook.timestamp)
+            if timestamp is None:
+                timestamp = data.get('receive_time', time.time())
+            self.evaluate(orderbook, timestamp)
+        except Exception as e:
+            logger.error(f"Error evaluating orderbook: {e}")
+
+    def evaluate(self, orderbook, timestamp, symbol=None):
+        """Evaluate the parameter grid on one book"""
+        count = len(self.quantities)
+        symbol = orderbook.symbol or symbol
+        self.models.observe(orderbook, symbol)
+        for order_type, volatility, fee_tier in self.grid:
+            start_ns = self.monitor.now()
+            results = self.models.evaluate_batch(orderbook, self.quantities, order_type, volatility,
+                                                 self.exchange, fee_tier, self.sides)
+            self.monitor.stop("compute", start_ns)
+            for side, result in results.items():
+                self._write(np.full(count, timestamp), orderbook.exchange or self.exchange,
+                            symbol, side, order_type, volatility, fee_tier, result)
+        self.books_evaluated += 1
+
+    def run_store(self, store, start_time=None, end_time=None, chunk_size=10000):
+        """Evaluate the parameter grid on every snapshot of a tick store in a time range"""
+        symbol = store.metadata.get('symbol')
+        exchange = store.metadata.get('exchange', self.exchange)
+        for order_type, volatility, fee_tier in self.grid:
+            for side in self.sides:
+                for timestamps, results in self.models.evaluate_range(
+                        store, self.quantities, start_time, end_time, side, order_type,
+                        volatility, self.exchange, fee_tier, chunk_size):
+                    self._write(np.repeat(timestamps, len(self.quantities)), exchange, symbol,
+                                side, order_type, volatility, fee_tier, results.ravel())
+        self.books_evaluated = len(range(*store.index_range(start_time, end_time)))
+
+    def _write(self, timestamps, exchange, symbol, side, order_type, volatility, fee_tier, result):
+        """Write one block of result rows sharing the same parameters"""
+        count = len(result)
+        columns = {
+            "timestamp": timestamps,
+            "exchange": [exchange] * count,
+            "symbol": [symbol] * count,
+            "side": [side] * count,
+            "order_type": [order_type] * count,
+            "volatility": np.full(count, volatility),
+            "fee_tier": [fee_tier] * count,
+        }
+        for name in BATCH_DTYPE.names:
+            columns[name] = result[name]
+        with self.monitor.span("write"):
+            self.writer.write(columns)
+
+
+def parse_list(value, convert=str):
+    """Parse a comma-separated command line list"""
+    return [convert(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def symbol_from_uri(uri):
+    """Symbol of a feed URI: its last path segment, as in the {symbol} of FEED_URI"""
+    parsed = urllib.parse.urlparse(uri)
+    return parsed.path.rstrip("/").rsplit("/", 1)[-1] or parsed.netloc or uri
+
+
+def build_parser():
+    """Command line interface definition"""
+    parser = argparse.ArgumentParser(
+        prog="python -m trade_simulator.cli",
+        description="Run the trade cost models headless over a feed, tick file or tick store")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--live", metavar="ASSETS", type=parse_list,
+                        help="Comma-separated spot assets for live OKX L2 feeds, e.g. BTC-USDT-SWAP,ETH-USDT-SWAP")
+    source.add_argument("--uri", help="Live L2 feed WebSocket URI; its last path segment is the symbol")
+    source.add_argument("--replay", metavar="PATH", help="Tick file recorded with TickFileWriter")
+    source.add_argument("--store", metavar="DIR", help="Tick store directory written by TickStoreWriter")
+
+    parser.add_argument("--quantities", type=lambda v: parse_list(v, float), default=[100.0],
+                        help="Comma-separated order sizes (default: 100)")
+    parser.add_argument("--sides", type=parse_list, default=["buy"], help="buy,sell (default: buy)")
+    parser.add_argument("--order-types", type=parse_list, default=["market"],
+                        help="Comma-separated order types: market, limit, stop (default: market); "
+                             "limit orders need a single live or replayed feed")
+    parser.add_argument("--volatilities", type=lambda v: parse_list(v, float), default=[0.02],
+                        help="Comma-separated volatilities as decimals (default: 0.02)")
+    parser.add_argument("--fee-tiers", type=parse_list, default=["VIP0"],
+                        help="Comma-separated fee tiers (default: VIP0)")
+    parser.add_argument("--exchange", default="OKX", help="Exchange for fee lookups (default: OKX)")
+    parser.add_argument("--fee-config", metavar="PATH", default=None,
+                        help="JSON fee schedule (default: config/fee_schedules.json)")
+    parser.add_argument("--online-models", metavar="PATH", default=None,
+                        help="Checkpoint of the online slippage/maker models: loaded if it exists, "
+                             "trained on every live or replayed book and saved when done")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="Record live feeds to a tick file for --replay; with several assets "
+                             "PATH must contain {symbol}, e.g. {symbol}.ticks")
+    parser.add_argument("--depth", type=int, default=None, help="Levels per side kept when building books")
+
+    parser.add_argument("--output", default="-", help="Output file; .parquet writes Parquet (default: CSV on stdout)")
+    parser.add_argument("--format", choices=("csv", "parquet"), default=None,
+                        help="Output format (inferred from --output if omitted)")
+
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-stage timing percentiles to stderr when done")
+    parser.add_argument("--speed", default="max", help="Replay speed: max, realtime or a factor (default: max)")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds to run a live feed (until Ctrl+C if omitted)")
+    parser.add_argument("--start", default=None, help="Tick store range start (ISO time or epoch seconds)")
+    parser.add_argument("--end", default=None, help="Tick store range end (ISO time or epoch seconds)")
+    return parser
+
+
+def run_live(simulator, symbols, uris=None, duration=None, record=None):
+    """
+    Evaluate books from live feeds until the duration elapses or Ctrl+C
+
+    All feeds share one FeedManager loop; books are evaluated on that loop,
+    so a slow grid pushes back on the sockets instead of queueing books.
+    With record set, every decoded message of a feed is also appended to the
+    tick file at record.format(symbol=symbol), which --replay reads back.
+    """
+    def on_book(symbol, orderbook, sequence):
+        try:
+            timestamp = parse_exchange_timestamp(orderbook.timestamp)
+            simulator.evaluate(orderbook, time.time() if timestamp is None else timestamp, symbol)
+        except Exception as e:
+            logger.error(f"Error evaluating {symbol} orderbook: {e}")
+
+    manager = FeedManager(max_depth=simulator.book_builder.max_depth, on_book=on_book,
+                          monitor=simulator.monitor)
+    recorders = []
+    for symbol, uri in zip(symbols, uris or [None] * len(symbols)):
+        recorder = None
+        if record:
+            recorder = TickFileWriter(record.format(symbol=symbol), {"exchange": "OKX", "symbol": symbol})
+            recorders.append(recorder)
+        manager.add_symbol(symbol, uri, recorder)
+    manager.start()
+    deadline = None if duration is None else time.monotonic() + duration
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.stop()
+        for recorder in recorders:
+            recorder.close()
+
+
+def run_replay(simulator, path, speed="max"):
+    """Evaluate every book in a recorded tick file"""
+    client = ReplayClient(path, simulator.process_message, speed=speed, monitor=simulator.monitor)
+    try:
+        client.run()
+    except KeyboardInterrupt:
+        client.stop()
+
+
+def main(argv=None):
+    """Main function to run a headless simulation"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.record:
+        if not (args.live or args.uri):
+            parser.error("--record needs a live feed (--live or --uri)")
+        if args.live and len(args.live) > 1 and "{symbol}" not in args.record:
+            parser.error("--record needs a {symbol} placeholder when recording several assets")
+    for order_type in args.order_types:
+        if order_type not in ORDER_TYPES:
+            parser.error(f"unknown order type {order_type!r}; use one of {', '.join(ORDER_TYPES)}")
+    if "limit" in args.order_types:
+        # The queue model learns depletion rates from consecutive books of one feed
+        if args.store:
+            parser.error(f"--store supports the order types {', '.join(MATRIX_ORDER_TYPES)}")
+        if args.live and len(args.live) > 1:
+            parser.error("limit orders need a single asset")
+    bounds = {}
+    for name in ("start", "end"):
+        value = getattr(args, name)
+        bounds[name] = parse_exchange_timestamp(value)
+        if value is not None and bounds[name] is None:
+            parser.error(f"--{name} must be an ISO time or epoch seconds, got {value!r}")
+    writer = open_result_writer(args.output, args.format)
+    fee_schedule = FeeSchedule.load(args.fee_config) if args.fee_config else None
+    online_models = None
+    if args.online_models:
+        online_models = OnlineCostModels()
+        if os.path.exists(args.online_models):
+            online_models.load(args.online_models)
+    limit_orders = LimitOrderModel() if "limit" in args.order_types else None
+    models = TradingModels(fee_schedule=fee_schedule, online_models=online_models,
+                           limit_orders=limit_orders)
+    simulator = BatchSimulator(models, writer, args.quantities, args.sides, args.order_types,
+                               args.volatilities, args.fee_tiers, args.exchange, args.depth)
+    started = time.perf_counter()
+    try:
+        if args.store:
+            simulator.run_store(TickStore(args.store), bounds["start"], bounds["end"])
+        elif args.replay:
+            run_replay(simulator, args.replay, args.speed)
+        elif args.uri:
+            run_live(simulator, [symbol_from_uri(args.uri)], [args.uri], args.duration, args.record)
+        else:
+            run_live(simulator, args.live, duration=args.duration, record=args.record)
+    finally:
+        writer.close()
+        if online_models is not None:
+            online_models.save(args.online_models)
+    logger.info(f"Evaluated {simulator.books_evaluated} books, wrote {writer.rows_written} rows "
+                f"in {time.perf_counter() - started:.2f}s")
+    if args.profile:
+        print(simulator.monitor.format_report(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
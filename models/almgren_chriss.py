@@ -0,0 +1,170 @@
+# trade_simulator/models/almgren_chriss.py
+from collections import namedtuple
+
+import numpy as np
+
+# Linear impact model of Almgren & Chriss (2000) in price units per share:
+# - sigma: absolute price volatility per square root of a time unit
+# - eta: temporary impact per share per time unit of trading rate
+# - gamma: permanent impact per share traded
+# - epsilon: fixed cost per share, e.g. half the spread
+ACParameters = namedtuple("ACParameters", ["sigma", "eta", "gamma", "epsilon"])
+
+# Optimal schedule of one order, as returned by optimal_schedule
+ExecutionSchedule = namedtuple("ExecutionSchedule", [
+    "times", "holdings", "trades", "expected_cost", "variance", "kappa",
+])
+
+# Fields of the structured arrays returned by efficient_frontier
+FRONTIER_DTYPE = np.dtype([
+    ("risk_aversion", np.float64),
+    ("kappa", np.float64),
+    ("expected_cost", np.float64),
+    ("variance", np.float64),
+    ("std", np.float64),
+    ("utility", np.float64),
+])
+
+# Calibration of Almgren & Chriss: trading this fraction of daily volume per
+# day moves the price by one spread temporarily (eta) or permanently (gamma)
+TEMPORARY_VOLUME_FRACTION = 0.01
+PERMANENT_VOLUME_FRACTION = 0.1
+
+
+def calibrate(mid_price, spread, volatility, daily_volume):
+    """
+    Impact parameters from market observables, with time measured in days
+
+    Args:
+        mid_price (float): Current mid price
+        spread (float): Absolute bid-ask spread
+        volatility (float): Daily volatility as a decimal
+        daily_volume (float): Daily volume in the order's units
+
+    Returns:
+        ACParameters: sigma, eta, gamma and epsilon
+    """
+    return ACParameters(sigma=volatility * mid_price,
+                        eta=spread / (TEMPORARY_VOLUME_FRACTION * daily_volume),
+                        gamma=spread / (PERMANENT_VOLUME_FRACTION * daily_volume),
+                        epsilon=spread / 2)
+
+
+def _adjusted_eta(params, tau):
+    """Temporary impact net of the permanent impact within one slice (eta tilde)"""
+    eta = params.eta - 0.5 * params.gamma * tau
+    if eta <= 0:
+        raise ValueError("Permanent impact too large for the slice length: eta - gamma * tau / 2 must be positive")
+    return eta
+
+
+def urgency(params, horizon, slices, risk_aversion):
+    """
+    Decay rate kappa of the optimal trajectory
+
+    Solves cosh(kappa * tau) = 1 + risk_aversion * sigma^2 * tau^2 / (2 * eta tilde)
+    with a log1p form that stays accurate for tiny risk aversion.
+
+    Args:
+        params (ACParameters): Impact parameters
+        horizon (float): Execution horizon in time units
+        slices (int): Number of slices
+        risk_aversion: Risk aversion lambda, scalar or array
+
+    Returns:
+        float or np.ndarray: kappa per time unit (0 for a risk-neutral trader)
+    """
+    tau = horizon / slices
+    z = np.asarray(risk_aversion, dtype=np.float64) * params.sigma ** 2 * tau ** 2 / (2 * _adjusted_eta(params, tau))
+    kappa = np.log1p(z + np.sqrt(z * (z + 2))) / tau
+    return float(kappa) if kappa.ndim == 0 else kappa
+
+
+def trajectory(kappa, horizon, slices):
+    """
+    Fraction of the order still held at each slice boundary
+
+    x(t) / X = sinh(kappa * (T - t)) / sinh(kappa * T), evaluated as
+    exp(-kappa * t) * expm1(-2 * kappa * (T - t)) / expm1(-2 * kappa * T),
+    which neither overflows for urgent schedules nor loses precision near
+    kappa = 0, where it becomes the straight TWAP line.
+
+    Args:
+        kappa: Decay rate, scalar or array of shape (L,)
+        horizon (float): Execution horizon in time units
+        slices (int): Number of slices
+
+    Returns:
+        np.ndarray: Shape (slices + 1,) for a scalar kappa, else (L, slices + 1)
+    """
+    times = np.linspace(0.0, horizon, slices + 1)
+    kappa = np.asarray(kappa, dtype=np.float64)
+    k = kappa[..., None]
+    remaining = horizon - times
+    with np.errstate(invalid="ignore", divide="ignore"):
+        curved = np.exp(-k * times) * np.expm1(-2 * k * remaining) / np.expm1(-2 * k * horizon)
+    return np.where(k > 0, curved, remaining / horizon)
+
+
+def _costs(quantity, params, horizon, slices, fractions):
+    """Expected cost and variance of holdings fractions (..., slices + 1)"""
+    tau = horizon / slices
+    holdings = quantity * fractions
+    trades = -np.diff(holdings, axis=-1)
+    expected_cost = (0.5 * params.gamma * quantity ** 2 + params.epsilon * quantity
+                     + _adjusted_eta(params, tau) / tau * np.sum(trades ** 2, axis=-1))
+    variance = params.sigma ** 2 * tau * np.sum(holdings[..., 1:] ** 2, axis=-1)
+    return holdings, trades, expected_cost, variance
+
+
+def optimal_schedule(quantity, params, horizon, slices, risk_aversion):
+    """
+    Almgren-Chriss optimal schedule for one order
+
+    Args:
+        quantity (float): Order size X
+        params (ACParameters): Impact parameters
+        horizon (float): Execution horizon T in time units
+        slices (int): Number of slices N
+        risk_aversion (float): Risk aversion lambda per unit of currency
+
+    Returns:
+        ExecutionSchedule: Slice boundary times, holdings x_0..x_N, slice sizes
+        n_1..n_N, expected cost E[x], cost variance V[x] and kappa
+    """
+    kappa = urgency(params, horizon, slices, risk_aversion)
+    holdings, trades, expected_cost, variance = _costs(quantity, params, horizon, slices,
+                                                       trajectory(kappa, horizon, slices))
+    return ExecutionSchedule(np.linspace(0.0, horizon, slices + 1), holdings, trades,
+                             float(expected_cost), float(variance), kappa)
+
+
+def efficient_frontier(quantity, params, horizon, slices, risk_aversions):
+    """
+    Expected cost and variance of the optimal schedule for many risk aversions
+
+    All trajectories are evaluated at once as an (L, slices + 1) matrix, so
+    a sweep of thousands of risk aversions costs a few array operations.
+
+    Args:
+        quantity (float): Order size X
+        params (ACParameters): Impact parameters
+        horizon (float): Execution horizon T in time units
+        slices (int): Number of slices N
+        risk_aversions: Risk aversion values lambda
+
+    Returns:
+        np.ndarray: Structured array of FRONTIER_DTYPE, one row per risk aversion
+    """
+    risk_aversions = np.atleast_1d(np.asarray(risk_aversions, dtype=np.float64))
+    kappa = np.atleast_1d(urgency(params, horizon, slices, risk_aversions))
+    _, _, expected_cost, variance = _costs(quantity, params, horizon, slices,
+                                           trajectory(kappa, horizon, slices))
+    frontier = np.empty(len(risk_aversions), dtype=FRONTIER_DTYPE)
+    frontier["risk_aversion"] = risk_aversions
+    frontier["kappa"] = kappa
+    frontier["expected_cost"] = expected_cost
+    frontier["variance"] = variance
+    frontier["std"] = np.sqrt(variance)
+    frontier["utility"] = expected_cost + risk_aversions * variance
+    return frontier
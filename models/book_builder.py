@@ -0,0 +1,273 @@
+# trade_simulator/models/book_builder.py
+import zlib
+
+import numpy as np
+
+from ..utils.logger import setup_logger
+from .orderbook import OrderBook, levels_array
+
+# Number of levels per side covered by the exchange checksum
+CHECKSUM_LEVELS = 25
+
+
+def okx_checksum(bids, asks, levels=CHECKSUM_LEVELS):
+    """
+    Compute an OKX-style orderbook checksum
+
+    The top levels of both sides are interleaved as
+    bid_price:bid_size:ask_price:ask_size:... using the raw strings from the
+    feed, and the CRC32 of that string is returned as a signed 32-bit integer.
+
+    Args:
+        bids (list): Best-first (price_str, size_str) bid levels
+        asks (list): Best-first (price_str, size_str) ask levels
+        levels (int): Number of levels per side to include
+
+    Returns:
+        int: Signed CRC32 checksum
+    """
+    fields = []
+    for i in range(levels):
+        if i < len(bids):
+            fields.extend(bids[i])
+        if i < len(asks):
+            fields.extend(asks[i])
+    checksum = zlib.crc32(":".join(map(str, fields)).encode())
+    return checksum - (1 << 32) if checksum >= (1 << 31) else checksum
+
+
+class _BookSide:
+    """
+    One side of an incrementally maintained book
+
+    Levels are kept best-first in preallocated price-key and size arrays
+    (keys are negated prices on the bid side, so both sides sort ascending).
+    A delta finds its level with np.searchsorted and updates the size in
+    place, or shifts the tail of the arrays by one slot to insert or remove
+    a level, so no Python-level work scales with the book depth. Reading the
+    top levels is a slice of the arrays.
+
+    The raw (price_str, size_str) pairs needed for checksums are kept in a
+    parallel list; after a snapshot it is only built when the first delta
+    arrives, so full-book feeds never pay for it.
+    """
+    def __init__(self, descending):
+        self.descending = descending
+        self.clear()
+
+    def clear(self):
+        self._keys = np.empty(0, dtype=np.float64)
+        self._sizes = np.empty(0, dtype=np.float64)
+        self.count = 0
+        self._raw = None
+        self._pending_raw = None
+
+    @property
+    def is_empty(self):
+        return self.count == 0
+
+    def replace(self, levels):
+        """Replace every level at once from a snapshot"""
+        array = levels_array(levels)
+        keys = -array[:, 0] if self.descending else array[:, 0]
+        order = np.argsort(keys, kind="stable")
+        order = order[array[order, 1] != 0]
+        count = len(order)
+        capacity = max(16, 2 * count)
+        self._keys = np.empty(capacity, dtype=np.float64)
+        self._sizes = np.empty(capacity, dtype=np.float64)
+        self._keys[:count] = keys[order]
+        self._sizes[:count] = array[order, 1]
+        self.count = count
+        self._raw = None
+        # Typed decoders deliver floats, which carry no raw strings
+        self._pending_raw = None if isinstance(levels, np.ndarray) else (levels, order)
+
+    def _expand_raw(self):
+        """Build the raw level list of a pending snapshot before applying deltas"""
+        if self._pending_raw is None:
+            return
+        levels, order = self._pending_raw
+        self._pending_raw = None
+        self._raw = [(levels[index][0], levels[index][1]) for index in order.tolist()]
+
+    def set(self, price, size, raw_price, raw_size):
+        """Insert, update or (when size is 0) remove one price level"""
+        self._expand_raw()
+        key = -price if self.descending else price
+        count = self.count
+        keys, sizes = self._keys, self._sizes
+        index = int(np.searchsorted(keys[:count], key))
+        found = index < count and keys[index] == key
+        if size == 0:
+            if found:
+                keys[index:count - 1] = keys[index + 1:count]
+                sizes[index:count - 1] = sizes[index + 1:count]
+                self.count -= 1
+                if self._raw is not None:
+                    del self._raw[index]
+            return
+        if found:
+            sizes[index] = size
+            if self._raw is not None:
+                self._raw[index] = (raw_price, raw_size)
+            return
+        if count == len(keys):
+            self._grow()
+            keys, sizes = self._keys, self._sizes
+        keys[index + 1:count + 1] = keys[index:count]
+        sizes[index + 1:count + 1] = sizes[index:count]
+        keys[index] = key
+        sizes[index] = size
+        self.count += 1
+        if self._raw is not None:
+            self._raw.insert(index, (raw_price, raw_size))
+
+    def _grow(self):
+        """Double the capacity of the level arrays"""
+        capacity = max(16, 2 * len(self._keys))
+        keys = np.empty(capacity, dtype=np.float64)
+        sizes = np.empty(capacity, dtype=np.float64)
+        keys[:self.count] = self._keys[:self.count]
+        sizes[:self.count] = self._sizes[:self.count]
+        self._keys, self._sizes = keys, sizes
+
+    def arrays(self, depth=None):
+        """Best-first price and size arrays for the top depth levels"""
+        count = self.count if depth is None else min(depth, self.count)
+        keys = self._keys[:count]
+        prices = -keys if self.descending else keys
+        return prices, self._sizes[:count]
+
+    def raw_levels(self, depth):
+        """Best-first (price_str, size_str) pairs for the top depth levels"""
+        if self._pending_raw is not None:
+            levels, order = self._pending_raw
+            return [(levels[index][0], levels[index][1]) for index in order[:depth].tolist()]
+        if self._raw is not None:
+            return self._raw[:depth]
+        prices, sizes = self.arrays(depth)
+        return list(zip(prices.tolist(), sizes.tolist()))
+
+
+class OrderBookBuilder:
+    """
+    Maintains an L2 book from a snapshot followed by incremental updates
+
+    Messages with action 'snapshot' (or no action, as with full-book feeds)
+    replace the book; messages with action 'update' apply per-level deltas in
+    place, where a size of 0 removes the level. Sequence gaps (seqId and
+    prevSeqId) and checksum mismatches mark the book as out of sync: further
+    updates are ignored until the next snapshot arrives, and the optional
+    resync callback is invoked so the feed can request one.
+    """
+    def __init__(self, max_depth=None, on_resync=None):
+        """
+        Initialize the builder
+
+        Args:
+            max_depth (int): Levels per side exposed in built OrderBooks (all if None)
+            on_resync (callable): Called with a reason string when the book goes out of sync
+        """
+        self.max_depth = max_depth
+        self.on_resync = on_resync
+        self.logger = setup_logger("OrderBookBuilder")
+        self.asks = _BookSide(descending=False)
+        self.bids = _BookSide(descending=True)
+        self.sequence = None
+        self.in_sync = False
+        self.gap_count = 0
+        self.checksum_failures = 0
+        self.raw_levels = True
+        self.timestamp = None
+        self.exchange = None
+        self.symbol = None
+        self._orderbook = None
+
+    def apply(self, message):
+        """
+        Apply a snapshot or delta message
+
+        Only the changed levels are touched; the OrderBook arrays are built
+        lazily the next time the orderbook property is read.
+
+        Args:
+            message (dict): Decoded L2 message
+
+        Returns:
+            bool: True if the book is in sync after applying the message
+        """
+        action = message.get('action', "snapshot")
+        if action == "snapshot":
+            self.asks.clear()
+            self.bids.clear()
+            self.in_sync = True
+            self.raw_levels = True
+        elif not self.in_sync:
+            return False
+        else:
+            prev_sequence = message.get('prevSeqId')
+            if prev_sequence is not None and self.sequence is not None and prev_sequence != self.sequence:
+                self.gap_count += 1
+                self._resync(f"sequence gap: expected {self.sequence}, got prevSeqId {prev_sequence}")
+                return False
+
+        self._apply_levels(self.asks, message.get('asks'))
+        self._apply_levels(self.bids, message.get('bids'))
+        self.sequence = message.get('seqId', self.sequence)
+        self.timestamp = message.get('timestamp', self.timestamp)
+        self.exchange = message.get('exchange', self.exchange)
+        self.symbol = message.get('symbol', self.symbol)
+        self._orderbook = None
+
+        checksum = message.get('checksum')
+        # Checksums are defined over the exchange's raw strings, which typed
+        # decoders do not keep
+        if checksum is not None and self.raw_levels:
+            actual = self.checksum()
+            if checksum != actual:
+                self.checksum_failures += 1
+                self._resync(f"checksum mismatch: expected {checksum}, got {actual}")
+                return False
+
+        return True
+
+    def _apply_levels(self, side, levels):
+        """Apply [price, size, ...] levels to one side"""
+        if levels is None:
+            return
+        if isinstance(levels, np.ndarray):
+            # Levels already decoded to floats
+            self.raw_levels = False
+        if side.is_empty:
+            side.replace(levels)
+            return
+        for level in levels:
+            raw_price, raw_size = level[0], level[1]
+            side.set(float(raw_price), float(raw_size), raw_price, raw_size)
+
+    def _resync(self, reason):
+        """Mark the book out of sync and ask the feed for a fresh snapshot"""
+        self.logger.warning(f"Orderbook out of sync ({reason}), waiting for snapshot")
+        self.in_sync = False
+        self._orderbook = None
+        if self.on_resync:
+            self.on_resync(reason)
+
+    def checksum(self):
+        """OKX-style checksum of the current book"""
+        return okx_checksum(self.bids.raw_levels(CHECKSUM_LEVELS),
+                            self.asks.raw_levels(CHECKSUM_LEVELS))
+
+    @property
+    def orderbook(self):
+        """Current book as an immutable OrderBook, built lazily once per change"""
+        if not self.in_sync:
+            return None
+        if self._orderbook is None:
+            ask_prices, ask_sizes = self.asks.arrays(self.max_depth)
+            bid_prices, bid_sizes = self.bids.arrays(self.max_depth)
+            self._orderbook = OrderBook(ask_prices, ask_sizes, bid_prices, bid_sizes,
+                                        timestamp=self.timestamp, exchange=self.exchange,
+                                        symbol=self.symbol)
+        return self._orderbook
@@ -0,0 +1,176 @@
+# trade_simulator/models/compute_worker.py
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from types import MappingProxyType
+
+from ..utils.logger import setup_logger
+from ..utils.mailbox import ConflatingMailbox
+
+# Immutable result of one model evaluation, published by ComputeWorker
+CostSnapshot = namedtuple("CostSnapshot", [
+    "sequence", "orderbook", "params", "price", "slippage", "fill_ratio", "fees",
+    "market_impact", "net_cost", "maker_proportion", "compute_time", "queue_depth", "trace",
+])
+
+# Sentinel asking the worker to re-run the models on the last book it saw
+_RECOMPUTE = object()
+
+
+class ComputeWorker:
+    """
+    Pipeline stage that runs the cost models off the UI thread
+
+    The WebSocket thread submits parsed books, the UI thread publishes its
+    current input parameters, and the worker thread evaluates the models and
+    publishes the result as an immutable CostSnapshot for the UI to display.
+    Results are handed over through a ConflatingMailbox, so the UI always
+    reads the newest complete snapshot.
+    """
+    def __init__(self, models, max_queue=64, monitor=None):
+        """
+        Initialize the compute worker
+
+        Args:
+            models (TradingModels): Calculation engine used for every evaluation
+            max_queue (int): Maximum number of books waiting to be processed
+            monitor (PerformanceMonitor): Receives a 'compute' span per evaluation (optional)
+        """
+        self.models = models
+        self.monitor = monitor
+        self.logger = setup_logger("ComputeWorker")
+        self.books = queue.Queue(maxsize=max_queue)
+        self.running = False
+        self.thread = None
+
+        self._params = None
+        self._last_book = None
+        # Books dropped from a full queue, still fed to the online models
+        self._superseded = deque()
+        self._superseded_lock = threading.Lock()
+        self.results = ConflatingMailbox()
+
+        self.dropped_books = 0
+        self.max_queue_depth = 0
+
+    def start(self):
+        """Start the worker thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="ComputeWorker")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop the worker thread"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def submit(self, orderbook, sequence=0, trace=None):
+        """
+        Queue a parsed orderbook for evaluation (called from the feed thread)
+
+        When compute falls behind and the queue is full, the oldest waiting
+        book is discarded so the worker always catches up to recent data.
+        Discarded books are not evaluated but are still passed to the models'
+        observe(), so the streaming estimates see every book regardless of load.
+
+        Args:
+            orderbook (OrderBook): Parsed orderbook
+            sequence (int): Feed sequence number of the book, carried into the snapshot
+            trace (TickTrace): Latency trace of the book, stamped with the compute
+                start and end times and carried into the snapshot (optional)
+        """
+        item = (sequence, orderbook, trace)
+        while True:
+            try:
+                self.books.put_nowait(item)
+                break
+            except queue.Full:
+                with self._superseded_lock:
+                    try:
+                        dropped = self.books.get_nowait()
+                    except queue.Empty:
+                        continue
+                    # A queued recompute request is not a book
+                    if dropped is not _RECOMPUTE:
+                        self._superseded.append(dropped[1])
+                        self.dropped_books += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.books.qsize())
+
+    def set_parameters(self, params):
+        """
+        Publish the current input parameters (called from the UI thread)
+
+        A change in parameters triggers a re-evaluation of the last book so
+        the display does not wait for the next feed message.
+        """
+        if params == self._params:
+            return
+        self._params = MappingProxyType(dict(params))
+        if self._last_book is not None:
+            try:
+                self.books.put_nowait(_RECOMPUTE)
+            except queue.Full:
+                pass  # A queued book will pick up the new parameters anyway
+
+    @property
+    def latest(self):
+        """Most recent CostSnapshot, or None before the first evaluation"""
+        return self.results.peek().value
+
+    @property
+    def queue_depth(self):
+        """Number of books waiting to be processed"""
+        return self.books.qsize()
+
+    def _run(self):
+        """Worker loop: evaluate queued books until stopped"""
+        while self.running:
+            try:
+                item = self.books.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            new_book = item is not _RECOMPUTE
+            if not new_book:
+                item = self._last_book
+            if item is None:
+                continue
+            sequence, orderbook, trace = item
+            start_ns = time.perf_counter_ns()
+            if new_book:
+                # Online models learn from every book, before it is evaluated,
+                # including the older ones dropped from the queue
+                with self._superseded_lock:
+                    superseded = list(self._superseded)
+                    self._superseded.clear()
+                for dropped in superseded:
+                    self.models.observe(dropped)
+                self.models.observe(orderbook)
+            # Re-evaluations of the last book are not ticks and carry no trace
+            self._last_book = (sequence, orderbook, None)
+            params = self._params
+            if params is None:
+                continue
+
+            try:
+                metrics = self.models.estimate_costs(orderbook, params, version=sequence)
+                end_ns = time.perf_counter_ns()
+                compute_ns = end_ns - start_ns
+                if self.monitor:
+                    self.monitor.record_span("compute", compute_ns)
+                if trace is not None:
+                    trace.compute_start_ns = start_ns
+                    trace.compute_done_ns = end_ns
+                compute_time = compute_ns / 1e9
+                self.results.put(CostSnapshot(sequence=sequence, orderbook=orderbook,
+                                              params=params, compute_time=compute_time,
+                                              queue_depth=self.books.qsize(), trace=trace,
+                                              **metrics))
+            except Exception as e:
+                self.logger.error(f"Error computing costs: {e}")
@@ -0,0 +1,115 @@
+# trade_simulator/models/cost_cache.py
+from collections import OrderedDict
+
+
+class CostCache:
+    """
+    Bounded LRU cache of cost estimates for the current book version
+
+    Entries are keyed on (book sequence, quantity, order_type, volatility,
+    fee_tier, side, exchange, live_volatility, live_volume, limit_price, mid_price). The cache only ever holds results
+    for one book: a lookup with a different sequence number or a different
+    OrderBook object clears it, so results of an older book can never be
+    returned once the feed has moved on. Re-evaluating the same book with
+    parameters seen before, e.g. when toggling between inputs or re-running
+    a frame, is served without running the models.
+
+    The cache is meant for a single evaluating thread such as the compute
+    worker and does no locking of its own.
+    """
+    def __init__(self, max_size=256):
+        """
+        Initialize the cache
+
+        Args:
+            max_size (int): Maximum number of cached results for the current book
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.version = None
+        self.orderbook = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(version, params, mid_price=None):
+        """Cache key of one evaluation"""
+        return (version, params['quantity'], params['order_type'], params['volatility'],
+                params['fee_tier'], params.get('side', "buy"), params['exchange'],
+                params.get('live_volatility', False), params.get('live_volume', False),
+                params.get('limit_price'), mid_price)
+
+    def _select(self, orderbook, version):
+        """Make (orderbook, version) the current book, dropping entries of any other"""
+        if version != self.version or orderbook is not self.orderbook:
+            if self.entries:
+                self.entries.clear()
+                self.invalidations += 1
+            self.version = version
+            self.orderbook = orderbook
+
+    def get(self, orderbook, version, params, mid_price=None):
+        """
+        Look up a cached result
+
+        Args:
+            orderbook (OrderBook): Book being evaluated
+            version (int): Sequence number of the book
+            params (dict): Input parameters
+            mid_price (float): Reference price passed to the models, if any
+
+        Returns:
+            dict or None: A copy of the cached result, or None on a miss
+        """
+        self._select(orderbook, version)
+        key = self.key(version, params, mid_price)
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return dict(result)
+
+    def put(self, orderbook, version, params, result, mid_price=None):
+        """
+        Store the result of an evaluation of the current book
+
+        Args:
+            orderbook (OrderBook): Book that was evaluated
+            version (int): Sequence number of the book
+            params (dict): Input parameters
+            result (dict): Result of TradingModels.estimate_costs
+            mid_price (float): Reference price passed to the models, if any
+        """
+        self._select(orderbook, version)
+        self.entries[self.key(version, params, mid_price)] = dict(result)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry"""
+        self.entries.clear()
+        self.version = None
+        self.orderbook = None
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def stats(self):
+        """Hit, miss, invalidation and eviction counts"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+        }
@@ -0,0 +1,249 @@
+# trade_simulator/models/execution_simulator.py
+from collections import namedtuple
+
+import numpy as np
+
+from . import almgren_chriss
+from .market_stats import SECONDS_PER_DAY, traded_volume_proxies
+from .orderbook import OrderBook
+from .scenario_runner import pack_books
+from .trading_models import TradingModels
+
+# Books over time in the layout of a TickStore BookMatrix: (n,) timestamps and
+# (n, depth) matrices, best level first, padded with NaN prices and zero sizes
+BookSeries = namedtuple("BookSeries", ["timestamps", "ask_prices", "ask_sizes", "bid_prices", "bid_sizes"])
+
+# Fields of the per-slice structured array of an ExecutionResult
+SLICE_DTYPE = np.dtype([
+    ("time", np.float64),
+    ("row", np.int64),
+    ("target", np.float64),
+    ("filled", np.float64),
+    ("vwap", np.float64),
+    ("mid_price", np.float64),
+    ("depletion", np.float64),
+    ("slippage", np.float64),
+    ("impact", np.float64),
+    ("shortfall", np.float64),
+])
+
+# Outcome of ExecutionSimulator.run
+ExecutionResult = namedtuple("ExecutionResult", [
+    "policy", "side", "quantity", "filled", "arrival_price", "average_price",
+    "shortfall", "impact", "slices",
+])
+
+POLICIES = ("twap", "vwap", "ac")
+
+
+def book_series(orderbooks, timestamps, depth=None):
+    """
+    Stack OrderBook snapshots from a feed into a BookSeries
+
+    Args:
+        orderbooks (list): OrderBook objects in time order
+        timestamps: Epoch seconds of each book
+        depth (int): Levels per side to keep (deepest book if None)
+
+    Returns:
+        BookSeries: Matrix view accepted by ExecutionSimulator.run
+    """
+    packed = pack_books(orderbooks, depth)
+    return BookSeries(np.asarray(timestamps, dtype=np.float64), *packed)
+
+
+class ExecutionSimulator:
+    """
+    Replays a sliced parent order against successive book snapshots
+
+    Child orders are sent at evenly spaced times over the horizon and each
+    walks the latest book at or before its time. Liquidity taken by earlier
+    children is not yet replenished: the simulator keeps the size removed
+    from the touch as a depletion that decays exponentially with the refill
+    time, and a child fills from that depth onwards instead of from the
+    best level. Size that cannot be filled is carried into the next slice.
+
+    Books are read as rows of (n, depth) matrices, such as TickStore slices,
+    so only the rows used by the slices are touched. The VWAP profile needs
+    a pass over the best level of every row in the horizon, which is
+    vectorized.
+    """
+    def __init__(self, models=None, refill_time=5.0):
+        """
+        Initialize the simulator
+
+        Args:
+            models (TradingModels): Source of the Almgren-Chriss calibration (default models if None)
+            refill_time (float): Seconds for the depletion to decay by a factor e;
+                0 refills instantly and None never refills
+        """
+        self.models = models or TradingModels()
+        self.refill_time = refill_time
+
+    def schedule(self, books, quantity, policy="twap", start_time=None, horizon=60.0, slices=10,
+                 volatility=0.02, risk_aversion=1e-6):
+        """
+        Child order times and target sizes of a slicing policy
+
+        'twap' splits the order evenly, 'vwap' in proportion to the
+        traded-volume proxy of the books in each slice interval (a historical
+        profile, as the books cover the whole horizon), and 'ac' along the
+        Almgren-Chriss trajectory calibrated on the arrival book.
+
+        Args:
+            books: BookSeries or TickStore BookMatrix
+            quantity (float): Parent order size
+            policy: 'twap', 'vwap', 'ac' or an array of per-slice weights
+            start_time (float): Epoch seconds of the first slice (first book if None)
+            horizon (float): Seconds over which the slices are spread
+            slices (int): Number of child orders
+            volatility (float): Daily volatility for the 'ac' policy
+            risk_aversion (float): Risk aversion for the 'ac' policy
+
+        Returns:
+            tuple: (times, sizes) arrays of length slices
+        """
+        timestamps = books.timestamps
+        if start_time is None:
+            start_time = float(timestamps[0])
+        times = start_time + np.arange(slices) * (horizon / slices)
+
+        if not isinstance(policy, str):
+            weights = np.asarray(policy, dtype=np.float64)
+            if len(weights) != slices:
+                raise ValueError(f"Expected {slices} slice weights, got {len(weights)}")
+        elif policy == "twap":
+            weights = np.ones(slices)
+        elif policy == "vwap":
+            weights = self._volume_profile(books, start_time, horizon, slices)
+        elif policy == "ac":
+            arrival = self._book(books, self._rows(timestamps, times[:1])[0])
+            params = self.models.execution_parameters(arrival, volatility)
+            weights = almgren_chriss.optimal_schedule(1.0, params, horizon / SECONDS_PER_DAY,
+                                                      slices, risk_aversion).trades
+        else:
+            raise ValueError(f"Unknown slicing policy: {policy}")
+
+        total = weights.sum()
+        if total <= 0:
+            weights, total = np.ones(slices), slices
+        return times, quantity * weights / total
+
+    def run(self, books, quantity, side="buy", policy="twap", start_time=None, horizon=60.0, slices=10,
+            volatility=0.02, risk_aversion=1e-6):
+        """
+        Simulate the execution of a parent order
+
+        Args:
+            books: BookSeries or TickStore BookMatrix covering the horizon
+            quantity (float): Parent order size
+            side (str): 'buy' walks the asks, 'sell' walks the bids
+            policy, start_time, horizon, slices, volatility, risk_aversion: See schedule
+
+        Returns:
+            ExecutionResult: Totals in quote currency and a SLICE_DTYPE array with
+            per-slice fills, slippage against the slice mid price, impact of the
+            depletion left by earlier slices and shortfall against the arrival mid
+        """
+        if side == "buy":
+            prices_matrix, sizes_matrix = books.ask_prices, books.ask_sizes
+            sign = 1.0
+        elif side == "sell":
+            prices_matrix, sizes_matrix = books.bid_prices, books.bid_sizes
+            sign = -1.0
+        else:
+            raise ValueError(f"Unknown order side: {side}")
+
+        times, targets = self.schedule(books, quantity, policy, start_time, horizon, slices,
+                                       volatility, risk_aversion)
+        rows = self._rows(books.timestamps, times)
+        mids = (books.ask_prices[rows, 0] + books.bid_prices[rows, 0]) / 2
+        arrival_price = float(mids[0])
+
+        result = np.zeros(slices, dtype=SLICE_DTYPE)
+        result["time"] = times
+        result["row"] = rows
+        result["target"] = targets
+        result["mid_price"] = mids
+
+        depletion = 0.0
+        carry = 0.0
+        previous_time = times[0]
+        for k in range(slices):
+            depletion *= self._refill_factor(times[k] - previous_time)
+            previous_time = times[k]
+            prices = prices_matrix[rows[k]]
+            sizes = sizes_matrix[rows[k]]
+            levels = sizes > 0
+            cum_sizes = np.concatenate(([0.0], np.cumsum(sizes[levels])))
+            cum_notional = np.concatenate(([0.0], np.cumsum(prices[levels] * sizes[levels])))
+            depth = cum_sizes[-1]
+
+            start = min(depletion, depth)
+            wanted = targets[k] + carry
+            filled = min(wanted, depth - start)
+            carry = wanted - filled
+            notional = np.interp(start + filled, cum_sizes, cum_notional) - np.interp(start, cum_sizes, cum_notional)
+            undepleted = np.interp(filled, cum_sizes, cum_notional)
+            depletion = start + filled
+
+            result["depletion"][k] = start
+            result["filled"][k] = filled
+            if filled > 0:
+                vwap = notional / filled
+                result["vwap"][k] = vwap
+                result["slippage"][k] = sign * (vwap - mids[k]) / mids[k]
+                result["impact"][k] = sign * (notional - undepleted)
+                result["shortfall"][k] = sign * (notional - filled * arrival_price)
+            else:
+                result["vwap"][k] = np.nan
+
+        filled = float(result["filled"].sum())
+        notional = float(np.nansum(result["vwap"] * result["filled"]))
+        return ExecutionResult(
+            policy=policy if isinstance(policy, str) else "custom",
+            side=side,
+            quantity=quantity,
+            filled=filled,
+            arrival_price=arrival_price,
+            average_price=notional / filled if filled > 0 else float("nan"),
+            shortfall=float(result["shortfall"].sum()),
+            impact=float(result["impact"].sum()),
+            slices=result,
+        )
+
+    def _refill_factor(self, elapsed):
+        """Fraction of the depletion left after elapsed seconds"""
+        if self.refill_time is None:
+            return 1.0
+        if self.refill_time <= 0:
+            return 0.0
+        return float(np.exp(-elapsed / self.refill_time))
+
+    @staticmethod
+    def _rows(timestamps, times):
+        """Index of the latest book at or before each time (the first book for earlier times)"""
+        return np.maximum(np.searchsorted(timestamps, times, side="right") - 1, 0)
+
+    @staticmethod
+    def _book(books, row):
+        """OrderBook of one matrix row, without the padding levels"""
+        asks = books.ask_sizes[row] > 0
+        bids = books.bid_sizes[row] > 0
+        return OrderBook(books.ask_prices[row][asks], books.ask_sizes[row][asks],
+                         books.bid_prices[row][bids], books.bid_sizes[row][bids])
+
+    @staticmethod
+    def _volume_profile(books, start_time, horizon, slices):
+        """Traded-volume proxy of the recording summed per slice interval"""
+        timestamps = books.timestamps
+        start = max(int(np.searchsorted(timestamps, start_time, side="left")) - 1, 0)
+        stop = int(np.searchsorted(timestamps, start_time + horizon, side="left"))
+        if stop - start < 2:
+            return np.ones(slices)
+        volumes = traded_volume_proxies(books.ask_prices[start:stop], books.ask_sizes[start:stop],
+                                        books.bid_prices[start:stop], books.bid_sizes[start:stop])
+        # Volume between two books is attributed to the slice of the later one
+        buckets = ((timestamps[start + 1:stop] - start_time) * slices / horizon).astype(np.int64)
+        buckets = np.clip(buckets, 0, slices - 1)
+        return np.bincount(buckets, weights=volumes, minlength=slices)
@@ -0,0 +1,162 @@
+# trade_simulator/models/fee_schedule.py
+import json
+import os
+
+import numpy as np
+
+from ..utils.logger import setup_logger
+
+# Fee schedule shipped with the simulator
+DEFAULT_FEE_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "config", "fee_schedules.json")
+
+# Rates used when the exchange or tier is not in the schedule (OKX VIP0)
+DEFAULT_FEE_RATES = (0.0008, 0.001)
+
+
+class FeeSchedule:
+    """
+    Registry of maker/taker fee rates for several exchanges and tiers
+
+    All tiers are compiled into one (n, 2) float64 rate table at load time,
+    with the fallback rates in the last row. An (exchange, tier) pair is
+    resolved to a row once: the exchange name is lowercased on the first
+    lookup only, and later lookups hit a dict keyed on the caller's
+    strings. Fees are computed with NumPy, so the same call works for one
+    order or for arrays of notionals and maker proportions.
+    """
+    def __init__(self, tables=None, default_rates=DEFAULT_FEE_RATES):
+        """
+        Compile fee tables
+
+        Args:
+            tables (dict): Exchange name mapped to {tier: (maker, taker)}
+            default_rates (tuple): (maker, taker) for unknown exchanges or tiers
+        """
+        self.logger = setup_logger("FeeSchedule")
+        self._rows = {}
+        self._tiers = {}
+        rates = []
+        for exchange, tiers in (tables or {}).items():
+            exchange = exchange.lower()
+            self._tiers[exchange] = list(tiers)
+            for tier, (maker, taker) in tiers.items():
+                self._rows[(exchange, tier)] = len(rates)
+                rates.append((float(maker), float(taker)))
+        rates.append((float(default_rates[0]), float(default_rates[1])))
+        self.rate_table = np.array(rates, dtype=np.float64)
+        self.rate_table.flags.writeable = False
+        self.default_row = len(rates) - 1
+        self._resolved = {}
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Load a fee schedule from a JSON config file
+
+        The file holds an 'exchanges' object mapping exchange names to
+        {tier: [maker, taker]} and an optional 'default_rates' pair.
+
+        Args:
+            path (str): Config file (the bundled config/fee_schedules.json if None)
+
+        Returns:
+            FeeSchedule: Compiled schedule
+        """
+        with open(path or DEFAULT_FEE_CONFIG) as f:
+            config = json.load(f)
+        return cls(config.get("exchanges", {}), config.get("default_rates", DEFAULT_FEE_RATES))
+
+    @property
+    def exchanges(self):
+        """Lowercased names of the exchanges in the schedule"""
+        return list(self._tiers)
+
+    def tiers(self, exchange):
+        """Tier names of an exchange, in config order (empty if unknown)"""
+        return list(self._tiers.get(exchange.lower(), ()))
+
+    def resolve(self, exchange, tier):
+        """
+        Row of the rate table for an exchange tier
+
+        Args:
+            exchange (str): Exchange name in any case
+            tier (str): Fee tier, e.g. 'VIP0'
+
+        Returns:
+            int: Row index; default_row for unknown pairs
+        """
+        key = (exchange, tier)
+        row = self._resolved.get(key)
+        if row is None:
+            row = self._rows.get((exchange.lower(), tier))
+            if row is None:
+                self.logger.warning(f"No fee rates for {exchange} {tier}, using default rates")
+                row = self.default_row
+            self._resolved[key] = row
+        return row
+
+    def rates(self, exchange, tier):
+        """(maker, taker) rates of an exchange tier"""
+        row = self.rate_table[self.resolve(exchange, tier)]
+        return float(row[0]), float(row[1])
+
+    def rate_arrays(self, exchange, tiers):
+        """
+        Maker and taker rates for several tiers of one exchange
+
+        Returns:
+            tuple: (maker, taker) float64 arrays aligned with tiers
+        """
+        rows = self.rate_table[[self.resolve(exchange, tier) for tier in tiers]]
+        return rows[:, 0], rows[:, 1]
+
+    def fees(self, exchange, tier, notional, maker_proportion, out=None):
+        """
+        Fees of orders split between maker and taker fills
+
+        Args:
+            exchange (str): Exchange name
+            tier (str): Fee tier
+            notional: Order notional, scalar or array
+            maker_proportion: Fraction filled as maker, scalar or array broadcastable with notional
+            out (np.ndarray): Optional output array
+
+        Returns:
+            float or np.ndarray: notional * (maker * p + taker * (1 - p))
+        """
+        maker, taker = self.rates(exchange, tier)
+        rate = taker + (maker - taker) * np.asarray(maker_proportion)
+        return np.multiply(notional, rate, out=out)
+
+    def fees_by_tier(self, exchange, tiers, notional, maker_proportion):
+        """
+        Fees for every tier of one exchange at once
+
+        Args:
+            exchange (str): Exchange name
+            tiers (list): Fee tiers
+            notional: Order notional, scalar or array
+            maker_proportion: Fraction filled as maker, broadcastable with notional
+
+        Returns:
+            np.ndarray: Shape (len(tiers),) + broadcast shape of notional and maker_proportion
+        """
+        maker, taker = self.rate_arrays(exchange, tiers)
+        notional = np.asarray(notional, dtype=np.float64)
+        proportion = np.asarray(maker_proportion, dtype=np.float64)
+        shape = (len(tiers),) + (1,) * max(notional.ndim, proportion.ndim)
+        rate = taker.reshape(shape) + (maker - taker).reshape(shape) * proportion
+        return notional * rate
+
+
+_default_schedule = None
+
+
+def default_fee_schedule():
+    """Fee schedule of the bundled config, loaded once per process"""
+    global _default_schedule
+    if _default_schedule is None:
+        _default_schedule = FeeSchedule.load()
+    return _default_schedule
@@ -0,0 +1,234 @@
+# trade_simulator/models/limit_orders.py
+import math
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from ..utils.timestamps import parse_exchange_timestamp
+from .orderbook import OrderBook
+
+# Fill outlook of a resting order, as returned by LimitOrderModel.queue_estimate;
+# volume_ahead is the size that must be depleted first
+QueueEstimate = namedtuple("QueueEstimate", [
+    "price", "level", "volume_ahead", "fill_probability", "expected_time",
+])
+
+
+def default_stop_price(orderbook, side="buy"):
+    """Stop price used when none is given: the second level of the side a triggered stop walks"""
+    prices = orderbook.ask_prices if side == "buy" else orderbook.bid_prices
+    return float(prices[min(1, len(prices) - 1)])
+
+
+# Complementary error function over arrays of sizes
+_erfc = np.vectorize(math.erfc, otypes=[np.float64])
+
+
+class LevelDepletionTracker:
+    """
+    Per-level depletion rates of both book sides, updated incrementally
+
+    Each new book is compared with the previous one level by level, with
+    levels indexed by distance from the touch rather than price: a level that was
+    traded through or removed counts as fully depleted, otherwise the drop
+    in size at its price does. Trades and cancellations both shrink the
+    volume ahead of a resting order, so both count.
+
+    Per level, exponentially weighted averages of the depletion, its square
+    and the time between books give a depletion rate in size per second and
+    the variance of the depleted volume per second. Updates cost O(levels)
+    per book and keep no history.
+    """
+    def __init__(self, levels=10, halflife=50):
+        """
+        Args:
+            levels (int): Levels per side tracked from the touch
+            halflife (float): Books after which an observation has half its weight
+        """
+        self.levels = levels
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.reset()
+
+    def reset(self):
+        """Forget every observed book"""
+        levels = self.levels
+        self.depletion = {"bids": np.zeros(levels), "asks": np.zeros(levels)}
+        self.squared_depletion = {"bids": np.zeros(levels), "asks": np.zeros(levels)}
+        self.interval = 0.0
+        self.books_observed = 0
+        self._previous = None
+        self._previous_time = None
+
+    def update(self, orderbook, timestamp):
+        """
+        Add one book of the feed
+
+        Args:
+            orderbook (OrderBook): Newest valid book
+            timestamp (float): Epoch seconds of the book
+        """
+        previous = self._previous
+        if previous is not None:
+            interval = max(0.0, timestamp - self._previous_time)
+            weight = 1.0 if self.books_observed == 1 else 1.0 - self.decay
+            self.interval += weight * (interval - self.interval)
+            for side in ("bids", "asks"):
+                depleted = self._depleted(previous, orderbook, side)
+                self.depletion[side] += weight * (depleted - self.depletion[side])
+                self.squared_depletion[side] += weight * (depleted ** 2 - self.squared_depletion[side])
+        self._previous = orderbook
+        self._previous_time = timestamp
+        self.books_observed += 1
+
+    def _depleted(self, previous, current, side):
+        """Size removed from each of the previous book's top levels on one side"""
+        depleted = np.zeros(self.levels)
+        if side == "bids":
+            prices, sizes = previous.bid_prices[:self.levels], previous.bid_sizes[:self.levels]
+            # Search on negated prices to keep the bid side ascending
+            keys, current_prices, current_sizes = -prices, -current.bid_prices, current.bid_sizes
+        else:
+            prices, sizes = previous.ask_prices[:self.levels], previous.ask_sizes[:self.levels]
+            keys, current_prices, current_sizes = prices, current.ask_prices, current.ask_sizes
+        count = len(prices)
+        if len(current_prices) == 0:
+            depleted[:count] = sizes
+            return depleted
+        idx = np.minimum(np.searchsorted(current_prices, keys), len(current_prices) - 1)
+        present = current_prices[idx] == keys
+        remaining = np.where(present, current_sizes[idx], 0.0)
+        depleted[:count] = np.maximum(0.0, sizes - remaining)
+        return depleted
+
+    @property
+    def ready(self):
+        return self.books_observed >= 2 and self.interval > 0
+
+    def rates(self, side):
+        """
+        Depletion statistics of one side
+
+        Args:
+            side (str): 'bids' or 'asks'
+
+        Returns:
+            tuple: (rate, variance) arrays per level, in size and size squared per second
+        """
+        if self.interval <= 0:
+            zeros = np.zeros(self.levels)
+            return zeros, zeros
+        return self.depletion[side] / self.interval, self.squared_depletion[side] / self.interval
+
+
+class LimitOrderModel:
+    """
+    Fill probability and time-to-fill of resting limit orders
+
+    A new order joins the back of the queue at its price, so it fills once
+    the levels ahead of it and the queue at its own price are depleted.
+    Cancellations and trades at the levels up to its own all shrink that
+    volume, so it is depleted at the sum of their rates from the
+    LevelDepletionTracker. The depleted volume over a horizon is treated as
+    a compound Poisson process, approximated by a normal distribution with
+    the tracked mean and variance rates:
+
+        P(fill) = P(depleted volume >= volume ahead + quantity)
+        E[time to fill] = (volume ahead + quantity) / rate
+
+    """
+    def __init__(self, levels=10, halflife=50, horizon=60.0, min_books=20):
+        """
+        Initialize the model
+
+        Args:
+            levels (int): Levels per side tracked from the touch
+            halflife (float): Books after which a depletion observation has half its weight
+            horizon (float): Default seconds an order rests before it is cancelled
+            min_books (int): Books needed before estimates are reported
+        """
+        self.tracker = LevelDepletionTracker(levels, halflife)
+        self.horizon = horizon
+        self.min_books = min_books
+
+    @property
+    def ready(self):
+        """True once enough books were observed for the estimates to be used"""
+        return self.tracker.books_observed >= self.min_books and self.tracker.ready
+
+    def reset(self):
+        """Forget the depletion rates, e.g. when the feed switches to another instrument"""
+        self.tracker.reset()
+
+    def observe(self, orderbook, timestamp=None):
+        """
+        Update the depletion rates with a new book
+
+        Args:
+            orderbook (OrderBook): Newest book
+            timestamp (float): Epoch seconds of the book (its exchange timestamp,
+                or the current time, if None)
+        """
+        orderbook = OrderBook.coerce(orderbook)
+        if orderbook is None or not orderbook.is_valid:
+            return
+        if timestamp is None:
+            timestamp = parse_exchange_timestamp(orderbook.timestamp)
+            if timestamp is None:
+                timestamp = time.time()
+        self.tracker.update(orderbook, timestamp)
+
+    def queue_estimate(self, orderbook, quantity, price=None, side="buy", horizon=None):
+        """
+        Fill outlook of a limit order joining the queue
+
+        Args:
+            orderbook (OrderBook): Current orderbook
+            quantity: Order size, scalar or NumPy array of sizes
+            price (float): Limit price (the touch on the order's side if None)
+            side (str): 'buy' rests on the bids, 'sell' on the asks
+            horizon (float): Seconds the order rests (the model default if None)
+
+        Returns:
+            QueueEstimate: Marketable orders report a probability of 1 and a time of 0;
+            probability and time are arrays for an array of sizes
+        """
+        orderbook = OrderBook.coerce(orderbook)
+        if side == "buy":
+            if price is None:
+                price = orderbook.best_bid
+            if price >= orderbook.best_ask:
+                return QueueEstimate(price, 0, 0.0, 1.0, 0.0)
+            # Bids at higher prices, and the queue at the same price, fill first
+            prices, sizes, book_side = orderbook.bid_prices, orderbook.bid_sizes, "bids"
+            level = int(np.count_nonzero(prices > price))
+            ahead = float(sizes[:level].sum() + sizes[prices == price].sum())
+        else:
+            if price is None:
+                price = orderbook.best_ask
+            if price <= orderbook.best_bid:
+                return QueueEstimate(price, 0, 0.0, 1.0, 0.0)
+            prices, sizes, book_side = orderbook.ask_prices, orderbook.ask_sizes, "asks"
+            level = int(np.count_nonzero(prices < price))
+            ahead = float(sizes[:level].sum() + sizes[prices == price].sum())
+        return self._estimate(price, level, ahead, quantity, book_side, horizon)
+
+    def _estimate(self, price, level, ahead, quantity, book_side, horizon):
+        """Normal approximation of depleting ahead + quantity at levels up to level"""
+        horizon = self.horizon if horizon is None else horizon
+        rate, variance = self.tracker.rates(book_side)
+        top = min(level, len(rate) - 1) + 1
+        rate, variance = float(rate[:top].sum()), float(variance[:top].sum())
+        needed = ahead + np.asarray(quantity, dtype=np.float64)
+        if rate <= 0:
+            return QueueEstimate(price, level, ahead, 0.0, math.inf)
+        mean = rate * horizon
+        spread = math.sqrt(variance * horizon)
+        if spread > 0:
+            probability = 0.5 * _erfc((needed - mean) / (math.sqrt(2.0) * spread))
+        else:
+            probability = np.where(mean >= needed, 1.0, 0.0)
+        expected_time = needed / rate
+        if np.ndim(needed) == 0:
+            probability, expected_time = float(probability), float(expected_time)
+        return QueueEstimate(price, level, ahead, probability, expected_time)
@@ -0,0 +1,224 @@
+# trade_simulator/models/market_stats.py
+import time
+
+import numpy as np
+
+from ..utils.timestamps import parse_exchange_timestamp
+from .orderbook import OrderBook
+
+SECONDS_PER_DAY = 86400.0
+
+
+class RingBuffer:
+    """
+    Fixed-capacity float64 ring buffer with a running sum
+
+    push() overwrites the oldest value once full and adjusts the sum, so
+    window totals cost O(1) per value. The sum is recomputed from the
+    buffer once per lap to stop floating point drift from accumulating.
+    """
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): Number of values kept
+        """
+        self.capacity = capacity
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.total = 0.0
+        self.count = 0
+        self.index = 0
+
+    def push(self, value):
+        """Append value, evicting the oldest one if the buffer is full"""
+        self.total += value - self.values[self.index]
+        self.values[self.index] = value
+        self.index += 1
+        if self.index == self.capacity:
+            self.index = 0
+            self.total = float(self.values.sum())
+        if self.count < self.capacity:
+            self.count += 1
+
+    def to_array(self):
+        """Values from oldest to newest"""
+        if self.count < self.capacity:
+            return self.values[:self.count].copy()
+        return np.roll(self.values, -self.index)
+
+    def __len__(self):
+        return self.count
+
+
+def traded_volume_proxy(previous, current):
+    """
+    Size taken from the touch between two books
+
+    L2 feeds carry no trades, so volume is approximated by the depletion of
+    the previous best levels: the whole level if the new book traded through
+    its price, otherwise the drop in size at the same price. Cancellations
+    at the touch are counted too, so this overstates traded volume on
+    quiet books.
+
+    Args:
+        previous (OrderBook): Earlier book
+        current (OrderBook): Later book
+
+    Returns:
+        float: Approximate size traded between the books
+    """
+    volume = 0.0
+    price, size = previous.best_bid, float(previous.bid_sizes[0])
+    if current.best_bid < price or current.best_ask <= price:
+        volume += size
+    elif current.best_bid == price:
+        volume += max(0.0, size - float(current.bid_sizes[0]))
+
+    price, size = previous.best_ask, float(previous.ask_sizes[0])
+    if current.best_ask > price or current.best_bid >= price:
+        volume += size
+    elif current.best_ask == price:
+        volume += max(0.0, size - float(current.ask_sizes[0]))
+    return volume
+
+
+def traded_volume_proxies(ask_prices, ask_sizes, bid_prices, bid_sizes):
+    """
+    traded_volume_proxy between every pair of consecutive rows of a book matrix
+
+    Only the best level columns are read, so a day of stored books costs a
+    few vectorized passes over n values.
+
+    Args:
+        ask_prices, ask_sizes, bid_prices, bid_sizes: (n, depth) matrices, best level first
+
+    Returns:
+        np.ndarray: (n - 1,) volume taken between row i and row i + 1
+    """
+    best_ask, ask_size = ask_prices[:, 0], ask_sizes[:, 0]
+    best_bid, bid_size = bid_prices[:, 0], bid_sizes[:, 0]
+    bid_through = (best_bid[1:] < best_bid[:-1]) | (best_ask[1:] <= best_bid[:-1])
+    bid_taken = np.where(best_bid[1:] == best_bid[:-1], np.maximum(0.0, bid_size[:-1] - bid_size[1:]), 0.0)
+    ask_through = (best_ask[1:] > best_ask[:-1]) | (best_bid[1:] >= best_ask[:-1])
+    ask_taken = np.where(best_ask[1:] == best_ask[:-1], np.maximum(0.0, ask_size[:-1] - ask_size[1:]), 0.0)
+    return (np.where(bid_through, bid_size[:-1], bid_taken)
+            + np.where(ask_through, ask_size[:-1], ask_taken))
+
+
+class MarketStatistics:
+    """
+    Streaming volatility and volume estimates from the book feed
+
+    Every book adds one mid-price log return, the time since the previous
+    book and a traded-volume proxy, each in O(1):
+    - EWMA volatility: exponentially weighted averages of squared returns
+      and of elapsed time, whose ratio is the variance per second.
+    - Realized volatility: sum of squared returns over the last window
+      books divided by the time they span, from ring buffer running sums.
+    - Daily volume: the volume proxy over the window scaled to a day.
+
+    Variances are rates per second, so irregular tick spacing and
+    exchange timestamps with whole-second resolution are handled: books
+    sharing a timestamp add their returns but no time. Volatilities are
+    daily, matching the volatility input of the impact model.
+    """
+    def __init__(self, window=600, halflife=100, min_books=20):
+        """
+        Initialize the estimators
+
+        Args:
+            window (int): Books in the realized volatility and volume window
+            halflife (float): Books after which an EWMA observation has half its weight
+            min_books (int): Books needed before estimates are reported
+        """
+        self.window = window
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.min_books = min_books
+        self.reset()
+
+    def reset(self):
+        """Forget every observed book, e.g. when the feed switches to another instrument"""
+        window = self.window
+        self.squared_returns = RingBuffer(window)
+        self.intervals = RingBuffer(window)
+        self.volumes = RingBuffer(window)
+        self.ewma_squared_return = 0.0
+        self.ewma_interval = 0.0
+        self.books_observed = 0
+        self._previous = None
+        self._previous_time = None
+
+    def update(self, orderbook, timestamp=None):
+        """
+        Add one book of the feed
+
+        Args:
+            orderbook (OrderBook): Newest book
+            timestamp (float): Epoch seconds of the book (its exchange timestamp,
+                or the current time, if None)
+        """
+        orderbook = OrderBook.coerce(orderbook)
+        if orderbook is None or not orderbook.is_valid:
+            return
+        if timestamp is None:
+            timestamp = parse_exchange_timestamp(orderbook.timestamp)
+            if timestamp is None:
+                timestamp = time.time()
+
+        previous = self._previous
+        if previous is not None:
+            squared_return = np.log(orderbook.mid_price / previous.mid_price) ** 2
+            interval = max(0.0, timestamp - self._previous_time)
+            self.squared_returns.push(squared_return)
+            self.intervals.push(interval)
+            self.volumes.push(traded_volume_proxy(previous, orderbook))
+            if len(self.intervals) == 1:
+                self.ewma_squared_return = squared_return
+                self.ewma_interval = interval
+            else:
+                weight = 1.0 - self.decay
+                self.ewma_squared_return += weight * (squared_return - self.ewma_squared_return)
+                self.ewma_interval += weight * (interval - self.ewma_interval)
+        self._previous = orderbook
+        self._previous_time = timestamp
+        self.books_observed += 1
+
+    @property
+    def ready(self):
+        """True once enough books spanning some time were observed"""
+        return self.books_observed >= self.min_books and self.intervals.total > 0
+
+    @property
+    def ewma_volatility(self):
+        """Daily volatility from the EWMA variance rate (None until ready)"""
+        if not self.ready or self.ewma_interval <= 0:
+            return None
+        return float(np.sqrt(self.ewma_squared_return / self.ewma_interval * SECONDS_PER_DAY))
+
+    @property
+    def realized_volatility(self):
+        """Daily volatility realized over the window (None until ready)"""
+        if not self.ready:
+            return None
+        return float(np.sqrt(max(0.0, self.squared_returns.total) / self.intervals.total * SECONDS_PER_DAY))
+
+    @property
+    def volatility(self):
+        """Volatility used by the impact model: the EWMA estimate"""
+        return self.ewma_volatility
+
+    @property
+    def daily_volume(self):
+        """Volume proxy over the window scaled to a day (None until ready)"""
+        if not self.ready:
+            return None
+        return max(0.0, self.volumes.total) / self.intervals.total * SECONDS_PER_DAY
+
+    @property
+    def stats(self):
+        """Current estimates, for PerformanceMonitor.register_stats"""
+        return {
+            "books": self.books_observed,
+            "ewma_volatility": self.ewma_volatility,
+            "realized_volatility": self.realized_volatility,
+            "daily_volume": self.daily_volume,
+        }
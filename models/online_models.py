@@ -0,0 +1,365 @@
+# trade_simulator/models/online_models.py
+import json
+
+import numpy as np
+
+from ..utils.logger import setup_logger
+from .orderbook import OrderBook
+
+# Feature vectors; order matters for stored weights and checkpoints
+SLIPPAGE_FEATURES = ("bias", "size_to_depth", "sqrt_size_to_depth", "spread_bps", "pressure")
+MAKER_FEATURES = ("bias", "spread_bps", "pressure")
+
+# Simulated market orders per side and book, as fractions of the visible depth
+TRAINING_FRACTIONS = (0.01, 0.05, 0.1, 0.25, 0.5, 0.9, 1.0)
+
+CHECKPOINT_VERSION = 1
+
+
+class RecursiveLeastSquares:
+    """
+    Linear regression updated one observation at a time
+
+    Keeps the weights and the inverse covariance matrix P, so each update
+    costs O(features^2) and no history is stored. A forgetting factor below
+    1 discounts old observations, letting the fit track a changing market.
+    """
+    def __init__(self, n_features, forgetting=0.999, delta=100.0):
+        """
+        Args:
+            n_features (int): Length of the feature vectors
+            forgetting (float): Weight kept by past observations per update (1 = no forgetting)
+            delta (float): Initial diagonal of P; larger values trust the first observations more
+        """
+        self.forgetting = forgetting
+        self.weights = np.zeros(n_features)
+        self.P = np.eye(n_features) * delta
+        self.updates = 0
+
+    def update(self, x, y):
+        """Fit one observation x (features) -> y"""
+        Px = self.P @ x
+        gain = Px / (self.forgetting + x @ Px)
+        self.weights += gain * (y - x @ self.weights)
+        self.P = (self.P - np.outer(gain, Px)) / self.forgetting
+        self.updates += 1
+
+    def update_batch(self, X, y):
+        """Fit the rows of X -> y in order"""
+        for row, target in zip(X, y):
+            self.update(row, target)
+
+    def predict(self, X):
+        """Predictions for one feature vector or a matrix of rows"""
+        return X @ self.weights
+
+    def state(self):
+        return {"weights": self.weights, "P": self.P, "updates": np.array(self.updates)}
+
+    def load_state(self, state):
+        self.weights = np.array(state["weights"], dtype=np.float64)
+        self.P = np.array(state["P"], dtype=np.float64)
+        self.updates = int(state["updates"])
+
+
+class QuantileSGD:
+    """
+    Linear quantile regression fitted by mini-batch SGD on the pinball loss
+
+    Predicts the given quantile of the target, e.g. a 90th percentile
+    slippage bound. Each update costs O(features) per row.
+    """
+    def __init__(self, n_features, quantile=0.9, learning_rate=0.05):
+        """
+        Args:
+            n_features (int): Length of the feature vectors
+            quantile (float): Quantile to predict, between 0 and 1
+            learning_rate (float): SGD step size
+        """
+        self.quantile = quantile
+        self.learning_rate = learning_rate
+        self.weights = np.zeros(n_features)
+        self.updates = 0
+
+    def update_batch(self, X, y):
+        """One SGD step on the mean pinball-loss gradient of a mini-batch"""
+        below = (y < X @ self.weights).astype(np.float64)
+        self.weights += self.learning_rate * ((self.quantile - below) @ X) / len(y)
+        self.updates += 1
+
+    def predict(self, X):
+        return X @ self.weights
+
+    def state(self):
+        return {"weights": self.weights, "updates": np.array(self.updates)}
+
+    def load_state(self, state):
+        self.weights = np.array(state["weights"], dtype=np.float64)
+        self.updates = int(state["updates"])
+
+
+class OnlineLogisticRegression:
+    """
+    Logistic regression fitted by mini-batch SGD with L2 regularization
+
+    Each update costs O(features) per row.
+    """
+    def __init__(self, n_features, learning_rate=0.1, l2=1e-4):
+        """
+        Args:
+            n_features (int): Length of the feature vectors
+            learning_rate (float): SGD step size
+            l2 (float): L2 penalty on the weights
+        """
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.weights = np.zeros(n_features)
+        self.updates = 0
+
+    def update_batch(self, X, y):
+        """One SGD step on the mean log-loss gradient of a mini-batch of 0/1 labels"""
+        error = np.asarray(y, dtype=np.float64) - self.predict(X)
+        self.weights += self.learning_rate * ((error @ X) / len(error) - self.l2 * self.weights)
+        self.updates += 1
+
+    def predict(self, X):
+        """Probability of label 1"""
+        return 1.0 / (1.0 + np.exp(-(X @ self.weights)))
+
+    def state(self):
+        return {"weights": self.weights, "updates": np.array(self.updates)}
+
+    def load_state(self, state):
+        self.weights = np.array(state["weights"], dtype=np.float64)
+        self.updates = int(state["updates"])
+
+
+def _side_depths(orderbook, side, levels):
+    """(consumed, opposite) depth over the top levels for an order on side"""
+    asks = orderbook.depth("asks", levels)
+    bids = orderbook.depth("bids", levels)
+    return (asks, bids) if side == "buy" else (bids, asks)
+
+
+def _pressure(consumed, opposite):
+    """Depth imbalance from the order's point of view: positive when the side it consumes is deeper"""
+    total = consumed + opposite
+    return (consumed - opposite) / total if total > 0 else 0.0
+
+
+def slippage_features(orderbook, quantities, side="buy", levels=10):
+    """
+    Slippage feature matrix for market orders of several sizes
+
+    Args:
+        orderbook (OrderBook): Current orderbook
+        quantities: Order sizes
+        side (str): 'buy' or 'sell'
+        levels (int): Levels per side used for depth
+
+    Returns:
+        np.ndarray: (len(quantities), len(SLIPPAGE_FEATURES)) matrix
+    """
+    quantities = np.atleast_1d(np.asarray(quantities, dtype=np.float64))
+    consumed, opposite = _side_depths(orderbook, side, levels)
+    size_to_depth = quantities / consumed if consumed > 0 else np.zeros_like(quantities)
+    X = np.empty((len(quantities), len(SLIPPAGE_FEATURES)))
+    X[:, 0] = 1.0
+    X[:, 1] = size_to_depth
+    X[:, 2] = np.sqrt(size_to_depth)
+    X[:, 3] = orderbook.spread / orderbook.mid_price * 1e4
+    X[:, 4] = _pressure(consumed, opposite)
+    return X
+
+
+def maker_features(orderbook, side="buy", levels=5):
+    """
+    Feature vector of a passive order resting at the touch
+
+    Args:
+        orderbook (OrderBook): Current orderbook
+        side (str): 'buy' rests on the best bid, 'sell' on the best ask
+        levels (int): Levels per side used for depth
+
+    Returns:
+        np.ndarray: (len(MAKER_FEATURES),) vector
+    """
+    # A resting buy is filled by sellers, so the pressure is seen from the bid side
+    resting, opposite = _side_depths(orderbook, "sell" if side == "buy" else "buy", levels)
+    return np.array([1.0, orderbook.spread / orderbook.mid_price * 1e4, _pressure(resting, opposite)])
+
+
+def walk_slippage(orderbook, quantities, side="buy"):
+    """Slippage of market orders against mid price from the exact book walk (decimal)"""
+    fill = orderbook.fill(np.asarray(quantities, dtype=np.float64), side)
+    mid = orderbook.mid_price
+    slippage = (fill.vwap - mid) / mid if side == "buy" else (mid - fill.vwap) / mid
+    return np.maximum(0.0, np.nan_to_num(slippage))
+
+
+def traded_through(previous, current, side="buy"):
+    """
+    True if a passive order at the previous touch would have filled by the current book
+
+    A resting buy at the previous best bid fills once sellers trade through
+    that price: the bid moves below it or the ask crosses it. Sells mirror this.
+    """
+    if side == "buy":
+        price = previous.best_bid
+        return current.best_bid < price or current.best_ask <= price
+    price = previous.best_ask
+    return current.best_ask > price or current.best_bid >= price
+
+
+class OnlineCostModels:
+    """
+    Slippage and maker/taker models learned incrementally from streamed books
+
+    Every observed book yields training data without any history:
+    - Slippage: simulated market orders of TRAINING_FRACTIONS of the
+      visible depth are walked through the book on both sides. A recursive
+      least squares fit learns the expected slippage, and a quantile SGD
+      fit learns an upper bound (e.g. the 90th percentile). The exact walk
+      prices any order the book can fill, so the fits are used for what it
+      cannot: orders larger than the visible depth, extrapolated along the
+      square-root size-to-depth feature.
+    - Maker/taker: a passive order at the touch of the previous book of the
+      same symbol is labelled filled when the new book traded through its
+      price. A logistic regression on spread and depth pressure learns the
+      probability of being filled as maker.
+
+    Targets and spreads are in basis points to keep the features well
+    scaled. The state of all models can be saved to and restored from an
+    .npz checkpoint.
+    """
+    def __init__(self, forgetting=0.999, quantile=0.9, learning_rate=0.05,
+                 depth_levels=10, pressure_levels=5, warmup=50):
+        """
+        Initialize the models
+
+        Args:
+            forgetting (float): RLS forgetting factor for the expected slippage
+            quantile (float): Slippage quantile fitted by SGD
+            learning_rate (float): SGD step size for the quantile and logistic models
+            depth_levels (int): Levels per side used for slippage depth features
+            pressure_levels (int): Levels per side used for maker pressure features
+            warmup (int): Books observed before the models are considered ready
+        """
+        self.logger = setup_logger("OnlineCostModels")
+        self.depth_levels = depth_levels
+        self.pressure_levels = pressure_levels
+        self.warmup = warmup
+        self.forgetting = forgetting
+        self.quantile = quantile
+        self.learning_rate = learning_rate
+        self.reset()
+
+    def reset(self):
+        """Start every model afresh, e.g. when the feed switches to another instrument"""
+        self.slippage = RecursiveLeastSquares(len(SLIPPAGE_FEATURES), self.forgetting)
+        self.slippage_quantile = QuantileSGD(len(SLIPPAGE_FEATURES), self.quantile, self.learning_rate)
+        self.maker = OnlineLogisticRegression(len(MAKER_FEATURES), self.learning_rate)
+        self.books_observed = 0
+        # Previous book per symbol, so interleaved feeds are labelled separately
+        self._previous = {}
+
+    @property
+    def ready(self):
+        """True once enough books were observed for the predictions to be used"""
+        return self.books_observed >= self.warmup
+
+    def observe(self, orderbook, symbol=None):
+        """
+        Update every model from one new book
+
+        Args:
+            orderbook (OrderBook): Newest book of the feed
+            symbol (str): Feed the book belongs to (the book's symbol if None)
+        """
+        orderbook = OrderBook.coerce(orderbook)
+        if orderbook is None or not orderbook.is_valid:
+            return
+        features, targets = [], []
+        for side in ("buy", "sell"):
+            depth = orderbook.depth("asks" if side == "buy" else "bids", self.depth_levels)
+            quantities = np.array(TRAINING_FRACTIONS) * depth
+            features.append(slippage_features(orderbook, quantities, side, self.depth_levels))
+            targets.append(walk_slippage(orderbook, quantities, side) * 1e4)
+        X, y = np.concatenate(features), np.concatenate(targets)
+        self.slippage.update_batch(X, y)
+        self.slippage_quantile.update_batch(X, y)
+
+        if symbol is None:
+            symbol = orderbook.symbol
+        previous = self._previous.get(symbol)
+        if previous is not None:
+            X = np.array([maker_features(previous, side, self.pressure_levels) for side in ("buy", "sell")])
+            y = [traded_through(previous, orderbook, side) for side in ("buy", "sell")]
+            self.maker.update_batch(X, y)
+        self._previous[symbol] = orderbook
+        self.books_observed += 1
+
+    def predict_slippage(self, orderbook, quantity, side="buy", upper=False):
+        """
+        Predicted slippage of a market order as a decimal
+
+        Args:
+            orderbook (OrderBook): Current orderbook
+            quantity: Order size, scalar or array
+            side (str): 'buy' or 'sell'
+            upper (bool): Predict the fitted quantile instead of the expected slippage
+
+        Returns:
+            float or np.ndarray: Non-negative slippage
+        """
+        X = slippage_features(orderbook, quantity, side, self.depth_levels)
+        model = self.slippage_quantile if upper else self.slippage
+        slippage = np.maximum(model.predict(X), 0.0) / 1e4
+        return float(slippage[0]) if np.ndim(quantity) == 0 else slippage
+
+    def predict_maker_proportion(self, orderbook, side="buy"):
+        """Probability that a passive order at the touch fills as maker"""
+        return float(self.maker.predict(maker_features(orderbook, side, self.pressure_levels)))
+
+    def save(self, path):
+        """
+        Write a checkpoint of every model
+
+        Args:
+            path (str): Output .npz file
+        """
+        arrays = {"meta": np.array(json.dumps({
+            "version": CHECKPOINT_VERSION,
+            "slippage_features": SLIPPAGE_FEATURES,
+            "maker_features": MAKER_FEATURES,
+            "books_observed": self.books_observed,
+        }))}
+        for name, model in (("slippage", self.slippage), ("slippage_quantile", self.slippage_quantile),
+                            ("maker", self.maker)):
+            for key, value in model.state().items():
+                arrays[f"{name}.{key}"] = value
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    def load(self, path):
+        """
+        Restore the models from a checkpoint written by save
+
+        Args:
+            path (str): Checkpoint file
+
+        Raises:
+            ValueError: If the checkpoint was written for different features
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if (tuple(meta["slippage_features"]) != SLIPPAGE_FEATURES
+                    or tuple(meta["maker_features"]) != MAKER_FEATURES):
+                raise ValueError(f"Checkpoint {path} was written for different model features")
+            for name, model in (("slippage", self.slippage), ("slippage_quantile", self.slippage_quantile),
+                                ("maker", self.maker)):
+                prefix = f"{name}."
+                model.load_state({key[len(prefix):]: data[key] for key in data.files if key.startswith(prefix)})
+        self.books_observed = meta["books_observed"]
+        self._previous = {}
+        self.logger.info(f"Loaded online models from {path} ({self.books_observed} books observed)")
@@ -0,0 +1,302 @@
+# trade_simulator/models/orderbook.py
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+
+# Result of walking one side of the book; fields are floats for scalar
+# quantities and arrays for array quantities
+FillEstimate = namedtuple("FillEstimate", ["filled", "notional", "vwap", "fill_ratio", "levels"])
+
+
+def levels_array(levels):
+    """
+    Convert [price, size, ...] levels into an (n, 2) float64 array
+
+    Levels may hold numeric strings or numbers. Conversion runs through a
+    single flat float() pass, which is considerably faster than building a
+    NumPy string array and casting it.
+
+    Args:
+        levels: Sequence of levels, or an (n, 2+) array
+
+    Returns:
+        np.ndarray: (n, 2) array of prices and sizes
+    """
+    if isinstance(levels, np.ndarray):
+        return levels[:, :2].astype(np.float64, copy=False)
+    if levels is None or len(levels) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    width = len(levels[0])
+    try:
+        flat = np.fromiter(map(float, chain.from_iterable(levels)), dtype=np.float64,
+                           count=len(levels) * width)
+        return flat.reshape(-1, width)[:, :2]
+    except ValueError:
+        # Ragged levels (extra per-level fields of differing length); keep the first two
+        return np.array([[float(level[0]), float(level[1])] for level in levels], dtype=np.float64)
+
+
+def fill_matrix(prices, sizes, quantities):
+    """
+    Walk many books at once for many order sizes
+
+    Each row of prices/sizes is one side of one book, best level first, with
+    NaN prices and zero sizes as padding. The rows' cumulative sizes are
+    shifted by a running offset so they form one increasing array, which
+    lets a single np.searchsorted call locate the last level touched for
+    every (book, quantity) pair.
+
+    Args:
+        prices: (t, d) price matrix
+        sizes: (t, d) size matrix
+        quantities: (q,) order sizes
+
+    Returns:
+        FillEstimate: Fields are (t, q) arrays; vwap is NaN for empty books
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    quantities = np.asarray(quantities, dtype=np.float64)
+    rows, depth = sizes.shape
+
+    cum_sizes = np.cumsum(sizes, axis=1)
+    cum_notional = np.cumsum(np.where(sizes > 0, prices, 0.0) * sizes, axis=1)
+    totals = cum_sizes[:, -1] if depth else np.zeros(rows)
+    filled = np.minimum(np.maximum(quantities, 0.0)[None, :], totals[:, None])
+    if depth == 0 or rows == 0:
+        zeros = np.zeros((rows, len(quantities)))
+        return FillEstimate(zeros, zeros, np.full_like(zeros, np.nan), zeros, zeros.astype(np.intp))
+
+    # Offsets keep every row's cumulative sizes above the previous row's
+    offsets = np.concatenate(([0.0], np.cumsum(totals + 1.0)[:-1]))
+    flat = (cum_sizes + offsets[:, None]).ravel()
+    positions = np.searchsorted(flat, filled + offsets[:, None], side="left")
+    row_index = np.arange(rows)[:, None]
+    idx = np.clip(positions - row_index * depth, 0, depth - 1)
+
+    has_prev = idx > 0
+    prev_idx = np.where(has_prev, idx - 1, 0)
+    prev_sizes = np.where(has_prev, cum_sizes[row_index, prev_idx], 0.0)
+    prev_notional = np.where(has_prev, cum_notional[row_index, prev_idx], 0.0)
+    notional = prev_notional + np.maximum(filled - prev_sizes, 0.0) * prices[row_index, idx]
+
+    positive = filled > 0
+    best = np.broadcast_to(prices[:, :1], filled.shape)
+    vwap = np.divide(notional, filled, out=np.array(best), where=positive)
+    fill_ratio = np.divide(filled, quantities[None, :], out=np.ones_like(filled),
+                           where=quantities[None, :] > 0)
+    levels = np.where(positive, idx + 1, 0)
+    return FillEstimate(filled, notional, vwap, fill_ratio, levels)
+
+
+class OrderBook:
+    """
+    Immutable L2 orderbook snapshot backed by contiguous NumPy arrays
+
+    Each side is stored best-first: asks in ascending price order and bids in
+    descending price order. Cumulative size and notional arrays are computed
+    once when the snapshot is built so every consumer can read depth without
+    re-parsing the raw message.
+    """
+    def __init__(self, ask_prices, ask_sizes, bid_prices, bid_sizes,
+                 timestamp=None, exchange=None, symbol=None):
+        """
+        Initialize the orderbook from per-side price/size arrays
+
+        Args:
+            ask_prices: Ask prices sorted ascending
+            ask_sizes: Ask sizes aligned with ask_prices
+            bid_prices: Bid prices sorted descending
+            bid_sizes: Bid sizes aligned with bid_prices
+            timestamp: Exchange timestamp of the snapshot, if known
+            exchange (str): Exchange name, if known
+            symbol (str): Instrument symbol, if known
+        """
+        self.ask_prices = self._freeze(ask_prices)
+        self.ask_sizes = self._freeze(ask_sizes)
+        self.bid_prices = self._freeze(bid_prices)
+        self.bid_sizes = self._freeze(bid_sizes)
+        self.timestamp = timestamp
+        self.exchange = exchange
+        self.symbol = symbol
+
+        self.ask_cum_sizes = self._freeze(np.cumsum(self.ask_sizes))
+        self.ask_cum_notional = self._freeze(np.cumsum(self.ask_prices * self.ask_sizes))
+        self.bid_cum_sizes = self._freeze(np.cumsum(self.bid_sizes))
+        self.bid_cum_notional = self._freeze(np.cumsum(self.bid_prices * self.bid_sizes))
+
+    @staticmethod
+    def _freeze(values):
+        """Return a read-only contiguous float64 copy of values"""
+        array = np.array(values, dtype=np.float64)
+        array.flags.writeable = False
+        return array
+
+    @staticmethod
+    def _parse_levels(levels):
+        """
+        Convert raw [price, size, ...] levels into price and size arrays
+
+        Args:
+            levels: Sequence of levels as strings or numbers, or an (n, 2+) array
+
+        Returns:
+            tuple: (prices, sizes) float64 arrays
+        """
+        array = levels_array(levels)
+        return array[:, 0], array[:, 1]
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """
+        Build an orderbook from a decoded L2 snapshot message
+
+        Args:
+            data (dict): Message with 'asks' and 'bids' lists of [price, size] pairs
+
+        Returns:
+            OrderBook: Parsed orderbook
+        """
+        ask_prices, ask_sizes = cls._parse_levels(data.get('asks'))
+        bid_prices, bid_sizes = cls._parse_levels(data.get('bids'))
+
+        # Enforce best-first ordering regardless of how the feed sorts levels
+        if len(ask_prices) > 1 and np.any(np.diff(ask_prices) < 0):
+            order = np.argsort(ask_prices, kind="stable")
+            ask_prices, ask_sizes = ask_prices[order], ask_sizes[order]
+        if len(bid_prices) > 1 and np.any(np.diff(bid_prices) > 0):
+            order = np.argsort(-bid_prices, kind="stable")
+            bid_prices, bid_sizes = bid_prices[order], bid_sizes[order]
+
+        return cls(ask_prices, ask_sizes, bid_prices, bid_sizes,
+                   timestamp=data.get('timestamp'),
+                   exchange=data.get('exchange'),
+                   symbol=data.get('symbol'))
+
+    @classmethod
+    def coerce(cls, orderbook):
+        """
+        Return orderbook as an OrderBook, parsing raw snapshot dicts if needed
+
+        Args:
+            orderbook: OrderBook instance, raw snapshot dict or None
+
+        Returns:
+            OrderBook or None: Parsed orderbook, or None if nothing was given
+        """
+        if orderbook is None or isinstance(orderbook, cls):
+            return orderbook
+        return cls.from_snapshot(orderbook)
+
+    @property
+    def is_valid(self):
+        """True if both sides have at least one level"""
+        return len(self.ask_prices) > 0 and len(self.bid_prices) > 0
+
+    @property
+    def best_ask(self):
+        """Lowest ask price"""
+        return float(self.ask_prices[0])
+
+    @property
+    def best_bid(self):
+        """Highest bid price"""
+        return float(self.bid_prices[0])
+
+    @property
+    def mid_price(self):
+        """Mid price between best bid and best ask"""
+        return (self.best_ask + self.best_bid) / 2
+
+    @property
+    def spread(self):
+        """Absolute spread between best ask and best bid"""
+        return self.best_ask - self.best_bid
+
+    def depth(self, side, levels=None):
+        """
+        Total size available on one side
+
+        Args:
+            side (str): 'asks' or 'bids'
+            levels (int): Number of top levels to include (all if None)
+
+        Returns:
+            float: Cumulative size over the requested levels
+        """
+        cum_sizes = self.ask_cum_sizes if side == "asks" else self.bid_cum_sizes
+        if len(cum_sizes) == 0:
+            return 0.0
+        if levels is None or levels >= len(cum_sizes):
+            return float(cum_sizes[-1])
+        if levels <= 0:
+            return 0.0
+        return float(cum_sizes[levels - 1])
+
+    def side_arrays(self, side):
+        """
+        Arrays consumed by an order on the given side
+
+        Args:
+            side (str): 'buy' walks the asks, 'sell' walks the bids
+
+        Returns:
+            tuple: (prices, cum_sizes, cum_notional) for the side being consumed
+        """
+        if side == "buy":
+            return self.ask_prices, self.ask_cum_sizes, self.ask_cum_notional
+        if side == "sell":
+            return self.bid_prices, self.bid_cum_sizes, self.bid_cum_notional
+        raise ValueError(f"Unknown order side: {side}")
+
+    def fill(self, quantity, side="buy"):
+        """
+        Walk the book for one or many order sizes without a Python loop
+
+        The last level touched by each order is found with a binary search on
+        the cumulative size array, so each query costs O(log n) in book depth.
+        Orders larger than the available depth are filled as far as possible
+        and report a fill ratio below 1.
+
+        Args:
+            quantity: Order size, scalar or array of sizes
+            side (str): 'buy' or 'sell'
+
+        Returns:
+            FillEstimate: Filled size, notional, VWAP, fill ratio and levels touched
+        """
+        prices, cum_sizes, cum_notional = self.side_arrays(side)
+        scalar = np.ndim(quantity) == 0
+        quantities = np.asarray(quantity, dtype=np.float64)
+
+        if len(prices) == 0:
+            zeros = np.zeros_like(quantities)
+            nans = np.full_like(quantities, np.nan)
+            result = FillEstimate(zeros, zeros, nans, zeros, zeros.astype(np.intp))
+        else:
+            filled = np.clip(quantities, 0.0, cum_sizes[-1])
+            idx = np.minimum(np.searchsorted(cum_sizes, filled, side="left"), len(prices) - 1)
+            has_prev = idx > 0
+            prev_idx = np.where(has_prev, idx - 1, 0)
+            prev_sizes = np.where(has_prev, cum_sizes[prev_idx], 0.0)
+            prev_notional = np.where(has_prev, cum_notional[prev_idx], 0.0)
+            notional = prev_notional + (filled - prev_sizes) * prices[idx]
+
+            positive = filled > 0
+            vwap = np.divide(notional, filled, out=np.full_like(filled, prices[0]), where=positive)
+            fill_ratio = np.divide(filled, quantities, out=np.ones_like(filled), where=quantities > 0)
+            levels = np.where(positive, idx + 1, 0)
+            result = FillEstimate(filled, notional, vwap, fill_ratio, levels)
+
+        if scalar:
+            return FillEstimate(float(result.filled), float(result.notional), float(result.vwap),
+                                float(result.fill_ratio), int(result.levels))
+        return result
+
+    def __len__(self):
+        return max(len(self.ask_prices), len(self.bid_prices))
+
+    def __repr__(self):
+        return (f"OrderBook(symbol={self.symbol!r}, asks={len(self.ask_prices)}, "
+                f"bids={len(self.bid_prices)})")
@@ -0,0 +1,247 @@
+# trade_simulator/models/scenario_runner.py
+import copy
+import itertools
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..utils.logger import setup_logger
+from ..utils.timestamps import parse_exchange_timestamp
+from .trading_models import BATCH_DTYPE, MATRIX_ORDER_TYPES, TradingModels
+
+# One combination of the non-size parameters; sizes are evaluated together
+Scenario = namedtuple("Scenario", ["order_type", "volatility", "fee_tier", "side"])
+
+# Merged output of ScenarioRunner.run: results[scenario, book, quantity]
+ScenarioResults = namedtuple("ScenarioResults", ["scenarios", "symbols", "timestamps", "quantities", "results"])
+
+# Row slice of the packed book matrices, in the layout TradingModels.evaluate_matrix expects
+_BookRows = namedtuple("_BookRows", ["ask_prices", "ask_sizes", "bid_prices", "bid_sizes"])
+
+# Per-process state of pool workers
+_worker_models = None
+_worker_blocks = None
+
+
+def pack_books(books, depth=None):
+    """
+    Pack orderbooks into one (4, books, depth) float64 matrix
+
+    The planes are ask prices, ask sizes, bid prices and bid sizes, best level
+    first. Shallower books are padded with NaN prices and zero sizes, the
+    layout used by the tick store.
+
+    Args:
+        books (list): OrderBook objects
+        depth (int): Levels per side to keep (deepest book if None)
+
+    Returns:
+        numpy.ndarray: Packed book matrix
+    """
+    if depth is None:
+        depth = max([max(len(book.ask_prices), len(book.bid_prices)) for book in books] + [1])
+    packed = np.zeros((4, len(books), depth), dtype=np.float64)
+    packed[0::2] = np.nan
+    for row, book in enumerate(books):
+        for plane, values in enumerate((book.ask_prices, book.ask_sizes, book.bid_prices, book.bid_sizes)):
+            n = min(len(values), depth)
+            packed[plane, row, :n] = values[:n]
+    return packed
+
+
+class SharedArray:
+    """
+    NumPy array backed by a named shared memory block
+
+    The creating process owns the block and must call unlink(); other
+    processes attach by name through the picklable spec, so the array data
+    itself never goes through pickle.
+    """
+    def __init__(self, shape, dtype, name=None):
+        """
+        Create a new block, or attach to an existing one by name
+
+        Args:
+            shape (tuple): Array shape
+            dtype: NumPy dtype
+            name (str): Name of an existing block to attach to (create if None)
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        if name is None:
+            self.block = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.block = shared_memory.SharedMemory(name=name)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.block.buf)
+
+    @property
+    def spec(self):
+        """Picklable (name, shape, dtype) used to attach from another process"""
+        return self.block.name, self.shape, self.dtype
+
+    def close(self):
+        """Release this process's mapping"""
+        self.array = None
+        self.block.close()
+
+    def unlink(self):
+        """Close and destroy the block (owner only)"""
+        self.close()
+        self.block.unlink()
+
+
+def _worker_copy(models):
+    """Copy of models that can be pickled to workers: without the monitor, cost cache and scratch buffers"""
+    models = copy.copy(models)
+    models.monitor = None
+    models.cache = None
+    models._scratch = {}
+    return models
+
+
+def _init_worker(models):
+    """Pool initializer: receive the models once per worker process"""
+    global _worker_models
+    _worker_models = models
+
+
+def _attach(books_spec, out_spec):
+    """Map the input and output blocks of a run, reusing the mapping across its tasks"""
+    global _worker_blocks
+    if _worker_blocks is None or _worker_blocks[0].spec != books_spec or _worker_blocks[1].spec != out_spec:
+        # Blocks of an earlier run have been unlinked by the parent
+        for block in _worker_blocks or ():
+            block.close()
+        _worker_blocks = (SharedArray(*books_spec[1:], name=books_spec[0]),
+                          SharedArray(*out_spec[1:], name=out_spec[0]))
+    return _worker_blocks[0].array, _worker_blocks[1].array
+
+
+def _evaluate_rows(models, books, out, task):
+    """Evaluate one scenario over a row range of the packed books into out"""
+    scenario_index, scenario, start, stop, quantities, exchange = task
+    rows = _BookRows(*(books[plane, start:stop] for plane in range(4)))
+    out[scenario_index, start:stop] = models.evaluate_matrix(
+        rows, quantities, scenario.side, scenario.order_type, scenario.volatility,
+        exchange, scenario.fee_tier)
+    return stop - start
+
+
+def _evaluate_task(books_spec, out_spec, task):
+    """Pool entry point: evaluate one task against the shared blocks"""
+    books, out = _attach(books_spec, out_spec)
+    return _evaluate_rows(_worker_models, books, out, task)
+
+
+class ScenarioRunner:
+    """
+    Evaluates a grid of scenarios over many books on a process pool
+
+    Books are packed once into a shared memory block and results are written
+    by the workers straight into a second shared block, so neither the book
+    arrays nor the result arrays are pickled. The grid is sharded into
+    (scenario, book rows) tasks, each evaluated with
+    TradingModels.evaluate_matrix over all order sizes at once.
+    """
+    def __init__(self, models=None, max_workers=None, tasks_per_worker=4):
+        """
+        Initialize the runner
+
+        Args:
+            models (TradingModels): Models sent to every worker (default models if None);
+                workers get a copy without the monitor and cost cache, which
+                evaluate_matrix does not use and which cannot be pickled
+            max_workers (int): Worker processes (CPU count if None); 1 runs in-process
+            tasks_per_worker (int): Target number of tasks per worker, for load balancing
+        """
+        self.models = models or TradingModels()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.tasks_per_worker = tasks_per_worker
+        self.logger = setup_logger("ScenarioRunner")
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers, initializer=_init_worker,
+                                                 initargs=(_worker_copy(self.models),))
+        return self._executor
+
+    def run(self, books, quantities, sides=("buy",), order_types=("market",), volatilities=(0.02,),
+            fee_tiers=("VIP0",), exchange="OKX", depth=None):
+        """
+        Evaluate every scenario on every book
+
+        Args:
+            books (list): OrderBook objects, e.g. the latest book of each symbol
+            quantities: Order sizes evaluated in every scenario
+            sides, order_types, volatilities, fee_tiers: Parameter grid axes
+            exchange (str): Exchange used for the fee lookup
+            depth (int): Levels per side to keep (deepest book if None)
+
+        Returns:
+            ScenarioResults: Results with shape (scenarios, books, quantities)
+        
+        Raises:
+            ValueError: For order types evaluate_matrix cannot cost, before any work starts
+        """
+        for order_type in order_types:
+            if order_type not in MATRIX_ORDER_TYPES:
+                raise ValueError(f"Order type {order_type!r} cannot be evaluated by the scenario runner; "
+                                 f"use one of {', '.join(MATRIX_ORDER_TYPES)}")
+        quantities = np.asarray(quantities, dtype=np.float64).ravel()
+        scenarios = [Scenario(order_type, volatility, fee_tier, side) for order_type, volatility, fee_tier, side
+                     in itertools.product(order_types, volatilities, fee_tiers, sides)]
+        symbols = [book.symbol for book in books]
+        timestamps = np.array([parse_exchange_timestamp(book.timestamp) or np.nan for book in books])
+        shape = (len(scenarios), len(books), len(quantities))
+        if not books or not scenarios:
+            return ScenarioResults(scenarios, symbols, timestamps, quantities, np.empty(shape, dtype=BATCH_DTYPE))
+
+        packed = pack_books(books, depth)
+        tasks = list(self._tasks(scenarios, len(books), quantities, exchange))
+
+        if self.max_workers == 1:
+            results = np.empty(shape, dtype=BATCH_DTYPE)
+            for task in tasks:
+                _evaluate_rows(self.models, packed, results, task)
+            return ScenarioResults(scenarios, symbols, timestamps, quantities, results)
+
+        shared_books = SharedArray(packed.shape, packed.dtype)
+        shared_out = SharedArray(shape, BATCH_DTYPE)
+        try:
+            shared_books.array[...] = packed
+            pool = self._pool()
+            futures = [pool.submit(_evaluate_task, shared_books.spec, shared_out.spec, task) for task in tasks]
+            for future in futures:
+                future.result()
+            results = shared_out.array.copy()
+        finally:
+            shared_books.unlink()
+            shared_out.unlink()
+        return ScenarioResults(scenarios, symbols, timestamps, quantities, results)
+
+    def _tasks(self, scenarios, book_count, quantities, exchange):
+        """Shard the grid into (scenario, row range) tasks of roughly equal size"""
+        target_tasks = self.max_workers * self.tasks_per_worker
+        rows_per_task = min(book_count, max(1, math.ceil(book_count * len(scenarios) / target_tasks)))
+        for scenario_index, scenario in enumerate(scenarios):
+            for start in range(0, book_count, rows_per_task):
+                yield (scenario_index, scenario, start, min(start + rows_per_task, book_count),
+                       quantities, exchange)
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -2,170 +2,686 @@
 import numpy as np
 import logging
 from ..utils.logger import setup_logger
+from .orderbook import OrderBook, fill_matrix
+from .cost_cache import CostCache
+from .fee_schedule import FeeSchedule, default_fee_schedule
+from . import almgren_chriss
+from .limit_orders import default_stop_price
+
+# Fields of the structured arrays returned by TradingModels.evaluate_batch
+BATCH_DTYPE = np.dtype([
+    ("quantity", np.float64),
+    ("slippage", np.float64),
+    ("vwap", np.float64),
+    ("fill_ratio", np.float64),
+    ("fees", np.float64),
+    ("market_impact", np.float64),
+    ("net_cost", np.float64),
+    ("maker_proportion", np.float64),
+])
+
+# Order types evaluate_batch can cost
+ORDER_TYPES = ("market", "limit", "stop")
+
+# Order types evaluate_matrix can cost; limit orders need the streamed queue model
+MATRIX_ORDER_TYPES = ("market", "stop")
 
 class TradingModels:
     """
     Class containing all trading models for cost estimation
+    
+    Instances are long-lived calculation engines: fee rates come from a
+    precompiled FeeSchedule, model parameters are fixed at construction and batch evaluation
+    reuses scratch buffers, so per-tick calls only do arithmetic.
     """
-    def __init__(self):
-        """Initialize the TradingModels class"""
+    def __init__(self, fee_tables=None, fee_schedule=None, tau=1/24, permanent_impact_ratio=0.3,
+                 impact_depth_levels=10, imbalance_levels=5, max_maker_proportion=0.8,
+                 monitor=None, cache_size=256, online_models=None, market_stats=None,
+                 limit_orders=None):
+        """
+        Initialize the TradingModels class
+        
+        Args:
+            fee_tables (dict): Exchange name mapped to {tier: (maker, taker)}; overrides fee_schedule
+            fee_schedule (FeeSchedule): Fee rates (the bundled config/fee_schedules.json if None)
+            tau (float): Execution horizon as a fraction of a day
+            permanent_impact_ratio (float): Permanent impact as a fraction of temporary impact
+            impact_depth_levels (int): Levels per side used as the impact depth proxy
+            imbalance_levels (int): Levels per side used for the book imbalance feature
+            max_maker_proportion (float): Upper bound on the predicted maker proportion
+            monitor (PerformanceMonitor): Receives a span per model in estimate_costs (optional)
+            cache_size (int): Results of the current book kept for estimate_costs calls
+                that pass a book version (0 disables the cache)
+            online_models (OnlineCostModels): Learned models fed through observe; once
+                warmed up, predict_maker_taker uses the learned maker probability and
+                market orders beyond the visible depth the learned slippage (optional)
+            market_stats (MarketStatistics): Streaming volatility and volume estimates,
+                fed through observe; once ready, orders with 'live_volatility' or
+                'live_volume' set use the live volatility or volume proxy (optional)
+            limit_orders (LimitOrderModel): Queue depletion model fed through observe;
+                once ready, limit orders are costed by their fill probability (optional)
+        """
         self.logger = setup_logger("TradingModels")
+        self.monitor = monitor
+        self.cache = CostCache(cache_size) if cache_size else None
+        if monitor and self.cache:
+            monitor.register_stats("cost_cache", lambda: self.cache.stats)
+        self.tau = tau
+        self.sqrt_tau = np.sqrt(tau)
+        self.permanent_impact_ratio = permanent_impact_ratio
+        self.impact_depth_levels = impact_depth_levels
+        self.imbalance_levels = imbalance_levels
+        self.max_maker_proportion = max_maker_proportion
+        self.online_models = online_models
+        self.market_stats = market_stats
+        self.limit_orders = limit_orders
+        if monitor and market_stats:
+            monitor.register_stats("market_stats", lambda: market_stats.stats)
+        
+        if fee_tables is not None:
+            fee_schedule = FeeSchedule(fee_tables)
+        self.fee_schedule = fee_schedule or default_fee_schedule()
+        self._scratch = {}
+    
+    def _buffer(self, name, size):
+        """Return a reusable float64 scratch array of the given size"""
+        buffer = self._scratch.get(name)
+        if buffer is None or len(buffer) != size:
+            buffer = np.empty(size, dtype=np.float64)
+            self._scratch[name] = buffer
+        return buffer
     
-    def calculate_slippage(self, orderbook, quantity, order_type="market"):
+    def estimate_costs(self, orderbook, params, mid_price=None, version=None):
         """
-        Calculate expected slippage using linear regression
+        Combine all models into the cost breakdown for a single order
+        
+        Args:
+            orderbook (OrderBook): Current orderbook
+            params (dict): Input parameters (quantity, order_type, volatility, exchange, fee_tier)
+            mid_price (float): Reference price; the book mid price if None
+            version (int): Sequence number of the book; when given, results are
+                memoized until the version changes
+            
+        Returns:
+            dict: price, slippage, fill_ratio, fees, market_impact, net_cost and maker_proportion
+        """
+        cache = self.cache if version is not None else None
+        if cache:
+            result = cache.get(orderbook, version, params, mid_price)
+            if result is not None:
+                return result
+            result = self._estimate_costs(orderbook, params, mid_price)
+            cache.put(orderbook, version, params, result, mid_price)
+            return result
+        return self._estimate_costs(orderbook, params, mid_price)
+    
+    def observe(self, orderbook, symbol=None):
         """
-        if order_type != "market":
-            return 0.0
+        Update the online models, market statistics and limit order model with a new book
+
+        Call once per book, not per evaluation; does nothing without either.
+
+        Args:
+            orderbook (OrderBook): Newest book
+            symbol (str): Feed the book belongs to, when several feeds share these
+                models (the book's symbol if None)
+        """
+        try:
+            if self.market_stats is not None:
+                self.market_stats.update(orderbook)
+            if self.online_models is not None:
+                self.online_models.observe(orderbook, symbol)
+            if self.limit_orders is not None:
+                self.limit_orders.observe(orderbook)
+        except Exception as e:
+            self.logger.error(f"Error observing orderbook: {e}")
+    
+    def reset_market_state(self):
+        """
+        Forget the books streamed into the online models, market statistics
+        and limit order model
+
+        Call when the feed switches to another instrument, so returns, volume
+        and depletion are not measured across the two.
+        """
+        for component in (self.market_stats, self.online_models, self.limit_orders):
+            if component is not None:
+                component.reset()
+    
+    def _estimate_costs(self, orderbook, params, mid_price):
+        """Run every model for one order; see estimate_costs"""
+        orderbook = OrderBook.coerce(orderbook)
+        if mid_price is None:
+            mid_price = orderbook.mid_price
+        quantity = params['quantity']
+        side = params.get('side', "buy")
+        order_type = params['order_type']
+        limit_price = params.get('limit_price')
+        
+        monitor = self.monitor
+        if monitor:
+            start_ns = monitor.now()
+        maker_proportion = self._order_maker_proportion(orderbook, quantity, order_type, side, limit_price)
+        if monitor:
+            start_ns = monitor.stop("model.maker_taker", start_ns)
+        slippage = self.calculate_slippage(orderbook, quantity, order_type, side, limit_price)
+        fill_ratio = orderbook.fill(quantity, side).fill_ratio
+        if monitor:
+            start_ns = monitor.stop("model.slippage", start_ns)
+        fees = self.calculate_fees(params['exchange'], params['fee_tier'],
+                                   quantity, mid_price, maker_proportion)
+        if monitor:
+            start_ns = monitor.stop("model.fees", start_ns)
+        volatility = self.resolve_volatility(params['volatility'], params.get('live_volatility', False))
+        market_impact = self.calculate_market_impact(orderbook, quantity, volatility, mid_price,
+                                                     params.get('live_volume', False))
+        if monitor:
+            monitor.stop("model.impact", start_ns)
+        
+        # Calculate net cost
+        net_cost = (quantity * mid_price) * (1 + slippage) + fees + market_impact
         
-        # For market orders, calculate slippage based on depth available
+        return {
+            "price": mid_price,
+            "slippage": slippage,
+            "fill_ratio": fill_ratio,
+            "fees": fees,
+            "market_impact": market_impact,
+            "net_cost": net_cost,
+            "maker_proportion": maker_proportion,
+        }
+    
+    def estimate_fill(self, orderbook, quantity, side="buy"):
+        """
+        Walk the book for a market order and measure the fill against mid price
+        
+        Args:
+            orderbook (OrderBook): Current orderbook
+            quantity: Order size, scalar or NumPy array of sizes
+            side (str): 'buy' or 'sell'
+            
+        Returns:
+            dict: slippage, vwap, filled, fill_ratio and levels touched
+        """
+        orderbook = OrderBook.coerce(orderbook)
+        fill = orderbook.fill(quantity, side)
+        mid_price = orderbook.mid_price
+        
+        # Slippage is the adverse move of the VWAP away from mid price
+        if side == "buy":
+            slippage = (fill.vwap - mid_price) / mid_price
+        else:
+            slippage = (mid_price - fill.vwap) / mid_price
+        slippage = np.maximum(0, np.nan_to_num(slippage))  # Ensure slippage is non-negative
+        
+        return {
+            "slippage": float(slippage) if np.ndim(slippage) == 0 else slippage,
+            "vwap": fill.vwap,
+            "filled": fill.filled,
+            "fill_ratio": fill.fill_ratio,
+            "levels": fill.levels,
+        }
+    
+    def _market_slippage(self, orderbook, quantity, side, fill):
+        """
+        Slippage of market orders from an estimate_fill result
+        
+        Orders the visible book cannot fill get the larger of the walk over
+        the filled portion and the learned slippage of the online models,
+        once they are ready.
+        """
+        slippage = fill["slippage"]
+        online = self.online_models
+        if online is None or not online.ready:
+            return slippage
+        short = np.asarray(fill["fill_ratio"]) < 1
+        if not np.any(short):
+            return slippage
+        learned = np.where(short, online.predict_slippage(orderbook, quantity, side), 0.0)
+        slippage = np.maximum(slippage, learned)
+        return float(slippage) if np.ndim(slippage) == 0 else slippage
+    
+    def calculate_slippage(self, orderbook, quantity, order_type="market", side="buy", price=None):
+        """
+        Calculate expected slippage of an order against mid price
+        
+        - market: the exact VWAP fill. When the book is too thin for the full
+          quantity, slippage is measured over the filled portion, or
+          extrapolated by the learned slippage model once online models are
+          ready; use estimate_fill to get the fill ratio.
+        - limit: the limit price if the order fills while resting, otherwise
+          a market order when it is cancelled, weighted by the fill
+          probability of the limit order model. Negative when resting below
+          mid is expected to pay off. 0 until the model is ready.
+        - stop: a market order once triggered, starting from the stop price.
+        
+        Args:
+            price (float): Limit or stop price (the touch, or the second level
+                for stops, if None)
+        """
         try:
-            if not orderbook or not orderbook.get('asks') or not orderbook.get('bids'):
+            orderbook = OrderBook.coerce(orderbook)
+            if orderbook is None or not orderbook.is_valid:
                 return 0.0
-                
-            # Get mid price
-            best_ask = float(orderbook['asks'][0][0])
-            best_bid = float(orderbook['bids'][0][0])
-            mid_price = (best_ask + best_bid) / 2
-            
-            # For buy orders, we walk up the ask book
-            total_filled = 0
-            total_cost = 0
-            
-            for price_level, size in orderbook['asks']:
-                price = float(price_level)
-                available = float(size)
-                
-                if total_filled + available >= quantity:
-                    # This level will complete our order
-                    remaining = quantity - total_filled
-                    total_cost += remaining * price
-                    total_filled = quantity
-                    break
-                else:
-                    # Take all available at this level and continue
-                    total_cost += available * price
-                    total_filled += available
-                    
-            if total_filled < quantity:
-                # Not enough depth in the orderbook for the specified quantity
-                return 0.02  # Return a default 2% slippage
-                
-            # Calculate effective price
-            effective_price = total_cost / quantity
-            
-            # Slippage is the percentage difference from mid price
-            slippage = (effective_price - mid_price) / mid_price
             
-            return max(0, slippage)  # Ensure slippage is non-negative
+            return self._order_slippage(orderbook, quantity, order_type, side, price)
         except Exception as e:
             self.logger.error(f"Error calculating slippage: {e}")
             return 0.01  # Default slippage value
     
+    def _order_slippage(self, orderbook, quantity, order_type, side, price, fill=None):
+        """
+        Slippage of any order type for a scalar or array of sizes; see calculate_slippage
+        
+        Args:
+            fill (dict): estimate_fill result for the sizes (computed if None)
+        
+        Raises:
+            ValueError: For an unknown order type
+        """
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Unknown order type: {order_type}")
+        sign = 1.0 if side == "buy" else -1.0
+        touch = orderbook.best_ask if side == "buy" else orderbook.best_bid
+        model = self.limit_orders
+        resting = order_type == "limit" and (price is None or sign * (price - touch) < 0)
+        if resting and (model is None or not model.ready):
+            return np.zeros(np.shape(quantity)) if np.ndim(quantity) else 0.0
+        
+        if fill is None:
+            fill = self.estimate_fill(orderbook, quantity, side)
+        market = self._market_slippage(orderbook, quantity, side, fill)
+        mid_price = orderbook.mid_price
+        if order_type == "stop":
+            if price is None:
+                price = default_stop_price(orderbook, side)
+            return market + max(0.0, sign * (price - touch)) / mid_price
+        if not resting:
+            return market  # Market or marketable limit order
+        estimate = model.queue_estimate(orderbook, quantity, price, side)
+        passive = sign * (estimate.price - mid_price) / mid_price
+        probability = estimate.fill_probability
+        return probability * passive + (1 - probability) * market
+    
+    def _order_maker_proportion(self, orderbook, quantity, order_type, side, price):
+        """
+        Maker proportion of an order: 0 for triggered stops, the fill probability
+        for limit orders once the limit order model is ready, otherwise
+        predict_maker_taker
+        """
+        if order_type == "stop":
+            return 0.0  # Triggered stops execute as market orders
+        if order_type == "limit" and self.limit_orders is not None and self.limit_orders.ready:
+            return self.limit_orders.queue_estimate(orderbook, quantity, price, side).fill_probability
+        return self.predict_maker_taker(orderbook, quantity, side)
+    
     def calculate_fees(self, exchange, fee_tier, quantity, price, maker_taker_proportion):
         """
         Calculate exchange fees based on exchange fee tier and maker/taker proportion
+        
+        Quantity and maker/taker proportion may be arrays; the result then has
+        their broadcast shape.
         """
         try:
-            # Fee rates from OKX documentation (for example)
-            fee_rates = {
-                "VIP0": {"maker": 0.0008, "taker": 0.001},
-                "VIP1": {"maker": 0.0007, "taker": 0.0009},
-                "VIP2": {"maker": 0.0006, "taker": 0.0008},
-                "VIP3": {"maker": 0.0005, "taker": 0.0007},
-                "VIP4": {"maker": 0.0003, "taker": 0.0005},
-                "VIP5": {"maker": 0.0000, "taker": 0.0003},
-            }
-            
-            if exchange.lower() != "okx" or fee_tier not in fee_rates:
-                # Default to VIP0 if not specified or invalid
-                maker_fee = 0.0008
-                taker_fee = 0.001
-            else:
-                maker_fee = fee_rates[fee_tier]["maker"]
-                taker_fee = fee_rates[fee_tier]["taker"]
-            
-            # Calculate weighted fee based on maker/taker proportion
-            maker_portion = maker_taker_proportion
-            taker_portion = 1 - maker_portion
-            
-            weighted_fee_rate = (maker_fee * maker_portion) + (taker_fee * taker_portion)
-            fee_amount = quantity * price * weighted_fee_rate
-            
-            return fee_amount
+            return self.fee_schedule.fees(exchange, fee_tier, np.multiply(quantity, price),
+                                          maker_taker_proportion)
         except Exception as e:
             self.logger.error(f"Error calculating fees: {e}")
             return quantity * price * 0.001  # Default to 0.1% fee
     
-    def calculate_market_impact(self, orderbook, quantity, volatility, price):
+    def resolve_volatility(self, volatility, live=False):
+        """
+        Volatility for the impact model
+        
+        Args:
+            volatility (float): Manual volatility as a decimal
+            live (bool): Prefer the streaming estimate of market_stats
+            
+        Returns:
+            float: The live EWMA volatility if requested and available, else volatility
+        """
+        stats = self.market_stats
+        if live and stats is not None:
+            estimate = stats.volatility
+            if estimate is not None:
+                return estimate
+        return volatility
+    
+    def calculate_market_impact(self, orderbook, quantity, volatility, price, live_volume=False):
         """
         Implementation of Almgren-Chriss market impact model
         Market impact = σ * √τ * (quantity/V) * price
         where:
         - σ is volatility
         - τ is time horizon (normalize to 1 day)
-        - V is daily volume
+        - V is daily volume (book depth, or the live volume proxy if live_volume is set and ready)
         - quantity is order size
         """
         try:
-            # Estimate market depth as sum of available liquidity in top N levels
-            depth = 0
-            for i in range(min(10, len(orderbook['bids']))):
-                depth += float(orderbook['bids'][i][1])
-            for i in range(min(10, len(orderbook['asks']))):
-                depth += float(orderbook['asks'][i][1])
-            
-            # If depth is too small, use a reasonable default
-            if depth < quantity:
-                depth = quantity * 100
+            orderbook = OrderBook.coerce(orderbook)
             
-            # Almgren-Chriss parameters
-            sigma = volatility  # Volatility parameter
-            tau = 1/24  # Assuming ~1 hour execution time (fraction of day)
+            depth = self._impact_volume(orderbook, live_volume)
             
-            # Temporary impact factor (based on market depth)
-            temporary_impact = sigma * np.sqrt(tau) * (quantity / depth) * price
-            
-            # Permanent impact (usually smaller)
-            permanent_impact = temporary_impact * 0.3
-            
-            # Total market impact
-            total_impact = temporary_impact + permanent_impact
-            
-            return total_impact
+            return self._market_impact(depth, quantity, volatility, price)
         except Exception as e:
             self.logger.error(f"Error calculating market impact: {e}")
             return quantity * price * 0.005  # Default to 0.5% market impact
     
-    def predict_maker_taker(self, orderbook, quantity):
+    def _impact_depth(self, orderbook):
+        """Liquidity in the top levels of both sides, used as the volume proxy"""
+        levels = self.impact_depth_levels
+        return orderbook.depth("bids", levels) + orderbook.depth("asks", levels)
+    
+    def _live_volume(self, live):
+        """Daily volume from market_stats if requested and ready, otherwise None"""
+        stats = self.market_stats
+        if live and stats is not None:
+            return stats.daily_volume or None
+        return None
+    
+    def _impact_volume(self, orderbook, live=False):
+        """Live daily volume if requested and ready, otherwise the book depth proxy"""
+        volume = self._live_volume(live)
+        return volume if volume is not None else self._impact_depth(orderbook)
+    
+    def _market_impact(self, depth, quantity, volatility, price):
+        """
+        Almgren-Chriss impact for a scalar quantity or an array of quantities
+        """
+        # If depth is too small, use a reasonable default
+        depth = np.where(depth < quantity, quantity * 100, depth)
+        
+        # Almgren-Chriss parameters
+        sigma = volatility  # Volatility parameter
+        
+        # Temporary impact factor (based on market depth)
+        temporary_impact = sigma * self.sqrt_tau * np.divide(quantity, depth, out=np.zeros_like(depth),
+                                                            where=depth > 0) * price
+        
+        # Permanent impact (usually smaller)
+        permanent_impact = temporary_impact * self.permanent_impact_ratio
+        
+        # Total market impact
+        total_impact = temporary_impact + permanent_impact
+        
+        return float(total_impact) if np.ndim(total_impact) == 0 else total_impact
+    
+    def execution_parameters(self, orderbook, volatility, live_volume=False):
+        """
+        Almgren-Chriss impact parameters for the current book, with time in days
+        
+        The spread comes from the book and the daily volume from the
+        top-level depth proxy, or from market_stats if live_volume is set
+        and the estimate is ready.
+        
+        Args:
+            orderbook (OrderBook): Current orderbook
+            volatility (float): Daily volatility as a decimal
+            live_volume (bool): Prefer the streaming volume estimate of market_stats
+            
+        Returns:
+            ACParameters: sigma, eta, gamma and epsilon in price units
+        """
+        orderbook = OrderBook.coerce(orderbook)
+        return almgren_chriss.calibrate(orderbook.mid_price, orderbook.spread, volatility,
+                                        self._impact_volume(orderbook, live_volume))
+    
+    def optimal_execution(self, orderbook, quantity, volatility, risk_aversion=1e-6, slices=10, horizon=None,
+                          live_volume=False):
+        """
+        Optimal Almgren-Chriss slice schedule for an order
+        
+        Args:
+            orderbook (OrderBook): Current orderbook
+            quantity (float): Order size
+            volatility (float): Daily volatility as a decimal
+            risk_aversion (float): Risk aversion lambda per unit of quote currency
+            slices (int): Number of slices
+            horizon (float): Execution horizon as a fraction of a day (tau if None)
+            live_volume (bool): Calibrate on the streaming volume estimate; see execution_parameters
+            
+        Returns:
+            ExecutionSchedule: Holdings and slice sizes with the expected cost and its variance
+        """
+        params = self.execution_parameters(orderbook, volatility, live_volume)
+        return almgren_chriss.optimal_schedule(quantity, params, horizon or self.tau, slices, risk_aversion)
+    
+    def efficient_frontier(self, orderbook, quantity, volatility, risk_aversions, slices=10, horizon=None,
+                           live_volume=False):
+        """
+        Expected cost against cost variance of optimal schedules over a risk aversion grid
+        
+        Args:
+            orderbook (OrderBook): Current orderbook
+            quantity (float): Order size
+            volatility (float): Daily volatility as a decimal
+            risk_aversions: Risk aversion values
+            slices (int): Number of slices
+            horizon (float): Execution horizon as a fraction of a day (tau if None)
+            live_volume (bool): Calibrate on the streaming volume estimate; see execution_parameters
+            
+        Returns:
+            np.ndarray: Structured array of almgren_chriss.FRONTIER_DTYPE
+        """
+        params = self.execution_parameters(orderbook, volatility, live_volume)
+        return almgren_chriss.efficient_frontier(quantity, params, horizon or self.tau, slices, risk_aversions)
+    
+    def predict_maker_taker(self, orderbook, quantity, side="buy"):
         """
         Use logistic regression to predict maker/taker proportion
         Returns proportion that will be maker orders (0-1)
+        
+        Once the online models are warmed up, their learned fill probability
+        replaces the fixed-coefficient logistic function.
         """
         try:
-            if not orderbook or not orderbook.get('asks') or not orderbook.get('bids'):
+            orderbook = OrderBook.coerce(orderbook)
+            if orderbook is None or not orderbook.is_valid:
                 return 0.0  # Default to all taker orders
+            
+            online = self.online_models
+            if online is not None and online.ready:
+                return float(np.clip(online.predict_maker_proportion(orderbook, side),
+                                     0, self.max_maker_proportion))
                 
             # Calculate spread
-            best_ask = float(orderbook['asks'][0][0])
-            best_bid = float(orderbook['bids'][0][0])
-            spread = (best_ask - best_bid) / best_bid
+            spread = orderbook.spread / orderbook.best_bid
             
             # Calculate order book imbalance (more bids than asks suggests higher liquidity on buy side)
-            bid_volume = sum(float(level[1]) for level in orderbook['bids'][:5])
-            ask_volume = sum(float(level[1]) for level in orderbook['asks'][:5])
+            bid_volume = orderbook.depth("bids", self.imbalance_levels)
+            ask_volume = orderbook.depth("asks", self.imbalance_levels)
             
             if bid_volume + ask_volume == 0:
                 imbalance = 0
             else:
                 imbalance = (bid_volume - ask_volume) / (bid_volume + ask_volume)
             
-            # Simple logistic function to determine maker proportion
-            # Tighter spreads and higher liquidity on ask side make maker orders more likely
-            maker_proportion = 1 / (1 + np.exp(5 * (spread - 0.001) - imbalance))
-            
-            # Constrain between 0 and 0.8 (assuming some portion will always be taker)
-            return max(0, min(0.8, maker_proportion))
+            return float(self._maker_proportion(spread, imbalance))
         except Exception as e:
             self.logger.error(f"Error predicting maker/taker proportion: {e}")
-            return 0.2  # Default maker proportion
\ No newline at end of file
+            return 0.2  # Default maker proportion
+    
+    def _maker_proportion(self, spread, imbalance):
+        """
+        Logistic maker proportion for scalar or array spread/imbalance features
+        """
+        # Simple logistic function to determine maker proportion
+        # Tighter spreads and higher liquidity on ask side make maker orders more likely
+        maker_proportion = 1 / (1 + np.exp(5 * (spread - 0.001) - imbalance))
+        
+        # Constrain between 0 and 0.8 (assuming some portion will always be taker)
+        return np.clip(maker_proportion, 0, self.max_maker_proportion)
+    
+    def evaluate_batch(self, orderbook, quantities, order_type="market", volatility=0.02,
+                       exchange="OKX", fee_tier="VIP0", sides=("buy", "sell"), live_volatility=False,
+                       live_volume=False, price=None):
+        """
+        Evaluate the full cost curve for many order sizes against one snapshot
+        
+        Every metric is computed with broadcast array operations, so the cost
+        of a call grows with log(book depth) per size rather than with one
+        Python-level model call per size.
+        
+        Args:
+            orderbook (OrderBook): Current orderbook
+            quantities: Array of order sizes
+            order_type (str): 'market', 'limit' or 'stop', costed as in calculate_slippage
+            volatility (float): Volatility as a decimal
+            exchange (str): Exchange name for fee lookup
+            fee_tier (str): Fee tier for fee lookup
+            sides (tuple): Order sides to evaluate
+            live_volatility (bool): Use the live volatility of market_stats once ready
+            live_volume (bool): Use the live volume proxy of market_stats once ready
+            price (float): Limit or stop price (the defaults of calculate_slippage if None)
+            
+        Returns:
+            dict: Side name mapped to a structured array with BATCH_DTYPE fields
+        
+        Raises:
+            ValueError: For an unknown order type
+        """
+        orderbook = OrderBook.coerce(orderbook)
+        quantities = np.asarray(quantities, dtype=np.float64).ravel()
+        mid_price = orderbook.mid_price
+        
+        # Quantity-independent terms are computed once per snapshot
+        size = len(quantities)
+        notional = np.multiply(quantities, mid_price, out=self._buffer("notional", size))
+        depth = self._buffer("depth", size)
+        depth.fill(self._impact_volume(orderbook, live_volume))
+        volatility = self.resolve_volatility(volatility, live_volatility)
+        market_impact = self._market_impact(depth, quantities, volatility, mid_price)
+        
+        results = {}
+        for side in sides:
+            result = np.empty(len(quantities), dtype=BATCH_DTYPE)
+            # The learned maker probability depends on the side, the fill probability also on size
+            maker_proportion = self._order_maker_proportion(orderbook, quantities, order_type, side, price)
+            fees = self.fee_schedule.fees(exchange, fee_tier, notional, maker_proportion,
+                                          out=self._buffer("fees", size))
+            fill = self.estimate_fill(orderbook, quantities, side)
+            result["slippage"] = self._order_slippage(orderbook, quantities, order_type, side, price, fill)
+            result["quantity"] = quantities
+            result["vwap"] = fill["vwap"]
+            result["fill_ratio"] = fill["fill_ratio"]
+            result["fees"] = fees
+            result["market_impact"] = market_impact
+            result["net_cost"] = notional * (1 + result["slippage"]) + fees + market_impact
+            result["maker_proportion"] = maker_proportion
+            results[side] = result
+        return results
+
+    
+    def evaluate_range(self, store, quantities, start_time=None, end_time=None, side="buy",
+                       order_type="market", volatility=0.02, exchange="OKX", fee_tier="VIP0",
+                       chunk_size=10000, live_volatility=False, live_volume=False):
+        """
+        Evaluate the cost models over a time range of a tick store in chunks
+        
+        Each chunk is a zero-copy slice of the memory-mapped store, and every
+        model runs as array operations over all snapshots and sizes in it, so
+        a day of books is processed without loading it into memory.
+        
+        Args:
+            store (TickStore): Memory-mapped tick store
+            quantities: Array of order sizes
+            start_time (float): Inclusive start epoch time (beginning of store if None)
+            end_time (float): Exclusive end epoch time (end of store if None)
+            side (str): 'buy' or 'sell'
+            order_type (str): 'market' or 'stop'; see evaluate_matrix
+            volatility (float): Volatility as a decimal
+            exchange (str): Exchange name for fee lookup
+            fee_tier (str): Fee tier for fee lookup
+            chunk_size (int): Snapshots per chunk
+            live_volatility, live_volume (bool): See evaluate_matrix
+            
+        Yields:
+            tuple: (timestamps, results) where results is a (snapshots, sizes)
+            structured array with BATCH_DTYPE fields
+        """
+        for chunk in store.chunks(start_time, end_time, chunk_size):
+            yield chunk.timestamps, self.evaluate_matrix(chunk, quantities, side, order_type,
+                                                         volatility, exchange, fee_tier,
+                                                         live_volatility, live_volume)
+    
+    def evaluate_matrix(self, books, quantities, side="buy", order_type="market", volatility=0.02,
+                        exchange="OKX", fee_tier="VIP0", live_volatility=False, live_volume=False):
+        """
+        Evaluate the cost models for many snapshots and order sizes at once
+        
+        Args:
+            books: BookMatrix-like object with (snapshots, depth) ask_prices,
+                ask_sizes, bid_prices and bid_sizes arrays, best level first,
+                padded with NaN prices and zero sizes
+            quantities: Array of order sizes
+            side (str): 'buy' or 'sell'
+            order_type (str): 'market' walks the book; 'stop' is triggered at the
+                second level of each snapshot and then walks it. Limit orders need
+                the streamed queue model of evaluate_batch and are rejected.
+            volatility (float): Volatility as a decimal
+            exchange (str): Exchange name for fee lookup
+            fee_tier (str): Fee tier for fee lookup
+            live_volatility (bool): Use the current live volatility of market_stats once ready
+            live_volume (bool): Use the current live volume proxy of market_stats once
+                ready, for every snapshot, instead of each snapshot's depth
+            
+        Returns:
+            numpy.ndarray: (snapshots, sizes) structured array with BATCH_DTYPE fields
+        
+        Raises:
+            ValueError: For limit orders and unknown order types
+        """
+        if order_type not in MATRIX_ORDER_TYPES:
+            raise ValueError(f"Order type {order_type!r} cannot be evaluated over stored books; "
+                             f"use one of {', '.join(MATRIX_ORDER_TYPES)}")
+        quantities = np.asarray(quantities, dtype=np.float64).ravel()
+        
+        best_ask = books.ask_prices[:, 0]
+        best_bid = books.bid_prices[:, 0]
+        mid_price = (best_ask + best_bid) / 2
+        
+        # Maker/taker features per snapshot
+        levels = self.imbalance_levels
+        bid_volume = books.bid_sizes[:, :levels].sum(axis=1)
+        ask_volume = books.ask_sizes[:, :levels].sum(axis=1)
+        volume = bid_volume + ask_volume
+        imbalance = np.divide(bid_volume - ask_volume, volume, out=np.zeros_like(volume),
+                              where=volume > 0)
+        maker_proportion = self._maker_proportion((best_ask - best_bid) / best_bid, imbalance)
+        
+        result = np.empty((len(mid_price), len(quantities)), dtype=BATCH_DTYPE)
+        if side == "buy":
+            prices = books.ask_prices
+            fill = fill_matrix(prices, books.ask_sizes, quantities)
+            slippage = (fill.vwap - mid_price[:, None]) / mid_price[:, None]
+        else:
+            prices = books.bid_prices
+            fill = fill_matrix(prices, books.bid_sizes, quantities)
+            slippage = (mid_price[:, None] - fill.vwap) / mid_price[:, None]
+        result["slippage"] = np.maximum(0, slippage)
+        if order_type == "stop":
+            # Triggered at the second level (the touch for one-level books), as default_stop_price
+            stop_price = prices[:, min(1, prices.shape[1] - 1)]
+            stop_price = np.where(np.isnan(stop_price), prices[:, 0], stop_price)
+            result["slippage"] += (np.abs(stop_price - prices[:, 0]) / mid_price)[:, None]
+            maker_proportion = np.zeros_like(maker_proportion)
+        
+        notional = quantities[None, :] * mid_price[:, None]
+        live = self._live_volume(live_volume)
+        if live is not None:
+            depth = np.full(notional.shape, live)
+        else:
+            levels = self.impact_depth_levels
+            depth = books.bid_sizes[:, :levels].sum(axis=1) + books.ask_sizes[:, :levels].sum(axis=1)
+            depth = np.broadcast_to(depth[:, None], notional.shape)
+        volatility = self.resolve_volatility(volatility, live_volatility)
+        
+        result["quantity"] = quantities[None, :]
+        result["vwap"] = fill.vwap
+        result["fill_ratio"] = fill.fill_ratio
+        result["fees"] = self.fee_schedule.fees(exchange, fee_tier, notional, maker_proportion[:, None])
+        result["market_impact"] = self._market_impact(depth, quantities[None, :], volatility,
+                                                      mid_price[:, None])
+        result["net_cost"] = notional * (1 + result["slippage"]) + result["fees"] + result["market_impact"]
+        result["maker_proportion"] = maker_proportion[:, None]
+        return result
@@ -0,0 +1,237 @@
+# trade_simulator/network/connection_supervisor.py
+import asyncio
+import random
+import time
+from collections import deque
+
+import websockets
+
+from ..utils.logger import setup_logger
+
+
+class ConnectionSupervisor:
+    """
+    Keeps one WebSocket connection alive and measures how it behaves
+
+    The supervisor runs as a single coroutine that connects, hands every
+    frame to a callback and reconnects after failures with jittered
+    exponential backoff. A connection is considered dead when the
+    protocol-level ping goes unanswered or when no message arrives within
+    the staleness timeout, which catches feeds that stay connected but stop
+    publishing. stop() and reconnect() may be called from any thread.
+
+    Downtime is measured from the moment a connection is lost until the
+    first message arrives on the next one, i.e. the time to recover the feed.
+    """
+    def __init__(self, uri, on_message, name="Connection", initial_delay=0.5, max_delay=30.0,
+                 jitter=0.5, stale_timeout=15.0, ping_interval=10.0, ping_timeout=10.0,
+                 max_queue=32, fairness_batch=32):
+        """
+        Initialize the supervisor
+
+        Args:
+            uri (str): WebSocket endpoint
+            on_message (callable): Called on the event loop with every raw frame
+            name (str): Name used in log messages
+            initial_delay (float): Backoff before the first retry, doubled per consecutive failure
+            max_delay (float): Upper bound on the backoff
+            jitter (float): Fraction of each backoff that is randomized, spreading out
+                reconnects of many feeds after a shared outage
+            stale_timeout (float): Seconds without a message before the connection is dropped
+            ping_interval (float): Seconds between protocol pings (None to disable)
+            ping_timeout (float): Seconds to wait for a pong before the connection is dropped
+            max_queue (int): Frames buffered by the connection before reads stop
+            fairness_batch (int): Messages handled before yielding to other tasks on the loop
+        """
+        self.uri = uri
+        self.on_message = on_message
+        self.name = name
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.stale_timeout = stale_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.max_queue = max_queue
+        self.fairness_batch = fairness_batch
+        self.logger = setup_logger(name)
+
+        self.running = False
+        self.connected = False
+        self.connects = 0
+        self.reconnects = 0
+        self.failures = 0
+        self.stale_disconnects = 0
+        self.forced_reconnects = 0
+        self.messages = 0
+        self.last_message_time = None
+        self.last_error = None
+        self.total_downtime = 0.0
+        self.recovery_times = deque(maxlen=100)
+
+        self.loop = None
+        self._stop_requested = False
+        self._skip_backoff = False
+        self._websocket = None
+        self._wake = None
+        self._down_since = None
+
+    def next_delay(self):
+        """Backoff before the next connection attempt"""
+        delay = min(self.max_delay, self.initial_delay * 2 ** self.failures)
+        return delay * (1 - self.jitter * random.random())
+
+    async def run(self):
+        """Connect and receive until stop() is called"""
+        if self._stop_requested:
+            return
+        self.loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.running = True
+        try:
+            while not self._stop_requested:
+                try:
+                    self.logger.info(f"Connecting to {self.uri}")
+                    async with websockets.connect(self.uri, ping_interval=self.ping_interval,
+                                                  ping_timeout=self.ping_timeout,
+                                                  max_queue=self.max_queue) as websocket:
+                        self._websocket = websocket
+                        self.connected = True
+                        self.connects += 1
+                        if self.connects > 1:
+                            self.reconnects += 1
+                        self.logger.info("Connected to WebSocket server")
+                        await self._receive(websocket)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.last_error = str(e)
+                    self.logger.warning(f"WebSocket connection error: {e}")
+                finally:
+                    self._websocket = None
+                    if self.connected:
+                        self.connected = False
+                        self._down_since = time.monotonic()
+
+                if self._stop_requested:
+                    break
+                if self._skip_backoff:
+                    self._skip_backoff = False
+                    continue
+                delay = self.next_delay()
+                self.failures += 1
+                self.logger.info(f"Reconnecting in {delay:.2f}s (attempt {self.failures})")
+                await self._sleep(delay)
+        finally:
+            self.running = False
+            self.connected = False
+
+    async def _receive(self, websocket):
+        """Deliver frames until the connection closes, goes stale or is interrupted"""
+        handled = 0
+        while not self._stop_requested:
+            try:
+                message = await asyncio.wait_for(websocket.recv(), self.stale_timeout)
+            except asyncio.TimeoutError:
+                self.stale_disconnects += 1
+                self.last_error = f"no message for {self.stale_timeout}s"
+                self.logger.warning(f"Feed stale ({self.last_error}), reconnecting")
+                return
+            except websockets.exceptions.ConnectionClosed as e:
+                if not self._stop_requested:
+                    self.last_error = f"connection closed: {e}"
+                    self.logger.warning("WebSocket connection closed, attempting to reconnect...")
+                return
+
+            if self._down_since is not None:
+                # First message after an outage: the feed has recovered
+                downtime = time.monotonic() - self._down_since
+                self._down_since = None
+                self.total_downtime += downtime
+                self.recovery_times.append(downtime)
+                self.logger.info(f"Feed recovered after {downtime:.2f}s")
+            self.failures = 0
+            self.messages += 1
+            self.last_message_time = time.time()
+            self.on_message(message)
+
+            # Frames already buffered are returned without suspending, so a
+            # busy connection would otherwise starve other tasks on the loop
+            handled += 1
+            if handled % self.fairness_batch == 0:
+                await asyncio.sleep(0)
+
+    async def _sleep(self, delay):
+        """Backoff sleep that ends early on stop() or reconnect()"""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _interrupt(self):
+        """Close the current connection and cut any backoff short (loop thread only)"""
+        self._wake.set()
+        if self._websocket is not None:
+            self.loop.create_task(self._websocket.close())
+
+    def _call_on_loop(self, callback):
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(callback)
+            except RuntimeError:
+                pass  # Loop closed concurrently; nothing left to interrupt
+
+    def stop(self):
+        """Ask the supervisor to close the connection and return; safe from any thread"""
+        self._stop_requested = True
+        self._call_on_loop(self._interrupt)
+
+    def rearm(self):
+        """Clear a previous stop() so run() can be called again"""
+        self._stop_requested = False
+
+    def reconnect(self, reason=None):
+        """
+        Drop the current connection and reconnect immediately; safe from any thread
+
+        Used to resynchronize state such as an orderbook, since the feed
+        starts every connection with a fresh snapshot.
+
+        Args:
+            reason (str): Logged reason for the reconnect
+        """
+        def force():
+            self.forced_reconnects += 1
+            self._skip_backoff = self._websocket is not None
+            self.logger.info(f"Reconnecting on request: {reason}")
+            self._interrupt()
+        self._call_on_loop(force)
+
+    @property
+    def current_downtime(self):
+        """Seconds since the connection was lost (0 while receiving)"""
+        if self._down_since is None:
+            return 0.0
+        return time.monotonic() - self._down_since
+
+    @property
+    def stats(self):
+        """Connection counters and downtime measurements"""
+        recovery = list(self.recovery_times)
+        return {
+            "connected": self.connected,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "failures": self.failures,
+            "stale_disconnects": self.stale_disconnects,
+            "forced_reconnects": self.forced_reconnects,
+            "messages": self.messages,
+            "last_message_time": self.last_message_time,
+            "last_error": self.last_error,
+            "total_downtime": self.total_downtime,
+            "current_downtime": self.current_downtime,
+            "last_recovery_time": recovery[-1] if recovery else None,
+            "max_recovery_time": max(recovery) if recovery else None,
+        }
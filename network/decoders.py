@@ -0,0 +1,121 @@
+# trade_simulator/network/decoders.py
+"""
+Pluggable WebSocket message decoders
+
+Every decoder turns a raw text or bytes frame into a dict with the fields of
+an L2 message ('asks', 'bids', 'timestamp', ...). The 'json' and 'orjson'
+decoders keep price levels as the raw strings sent by the exchange, which is
+required to validate feed checksums (OrderBookBuilder skips checksum checks
+for float levels). The 'msgspec' decoder validates the
+message against a typed schema and converts the price/size strings to floats
+while parsing, returning each side as an (n, 2) float64 array in one pass.
+All decoders raise ValueError (or a subclass) on malformed frames.
+"""
+import json
+from typing import List, Optional
+
+from ..models.orderbook import levels_array
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional dependency
+    msgspec = None
+
+
+class JsonDecoder:
+    """Decoder based on the standard library json module"""
+    name = "json"
+
+    def decode(self, message):
+        return json.loads(message)
+
+
+class OrjsonDecoder:
+    """Decoder based on orjson"""
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def decode(self, message):
+        return orjson.loads(message)
+
+
+if msgspec is not None:
+    class L2Message(msgspec.Struct):
+        """Typed schema of an L2 orderbook message"""
+        asks: List[List[float]] = []
+        bids: List[List[float]] = []
+        timestamp: Optional[str] = None
+        exchange: Optional[str] = None
+        symbol: Optional[str] = None
+        action: Optional[str] = None
+        seqId: Optional[int] = None
+        prevSeqId: Optional[int] = None
+        checksum: Optional[int] = None
+
+
+class MsgspecDecoder:
+    """Typed schema decoder producing float arrays for the asks and bids"""
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        # strict=False lets the decoder convert the exchange's numeric strings to floats
+        self._decoder = msgspec.json.Decoder(L2Message, strict=False)
+
+    def decode(self, message):
+        decoded = self._decoder.decode(message)
+        data = {
+            'asks': levels_array(decoded.asks),
+            'bids': levels_array(decoded.bids),
+        }
+        for field in ("timestamp", "exchange", "symbol", "action", "seqId", "prevSeqId", "checksum"):
+            value = getattr(decoded, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+
+# Decoders in order of preference for get_decoder("auto")
+DECODERS = {
+    "msgspec": MsgspecDecoder,
+    "orjson": OrjsonDecoder,
+    "json": JsonDecoder,
+}
+
+
+def available_decoders():
+    """Names of the decoders whose dependencies are installed"""
+    names = []
+    for name, decoder_class in DECODERS.items():
+        try:
+            decoder_class()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_decoder(name="auto"):
+    """
+    Create a message decoder
+
+    Args:
+        name (str): 'msgspec', 'orjson', 'json' or 'auto' for the fastest installed one
+
+    Returns:
+        Decoder instance with a decode(message) method
+    """
+    if name == "auto":
+        return DECODERS[available_decoders()[0]]()
+    if name not in DECODERS:
+        raise ValueError(f"Unknown decoder: {name}")
+    return DECODERS[name]()
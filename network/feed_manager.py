@@ -0,0 +1,275 @@
+# trade_simulator/network/feed_manager.py
+import asyncio
+import threading
+import time
+from functools import partial
+
+from ..models.book_builder import OrderBookBuilder
+from ..utils.logger import setup_logger
+from ..utils.mailbox import ConflatingMailbox
+from ..utils.performance_monitor import PerformanceMonitor
+from .connection_supervisor import ConnectionSupervisor
+from .decoders import get_decoder
+
+FEED_URI = "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/{symbol}"
+
+
+class SymbolFeed:
+    """
+    State of one symbol subscription managed by FeedManager
+
+    The book builder is only touched on the feed loop; readers on other
+    threads go through the mailbox, which always holds the newest book.
+    """
+    def __init__(self, symbol, uri, on_message, max_depth=None, recorder=None, **supervisor_options):
+        """
+        Args:
+            symbol (str): Symbol of the feed
+            uri (str): Feed URI
+            on_message (callable): Called as on_message(feed, frame) for every frame
+            max_depth (int): Levels per side exposed in built OrderBooks (all if None)
+            recorder (TickFileWriter): Receives every decoded message of the feed (optional)
+            **supervisor_options: Settings for the feed's ConnectionSupervisor
+        """
+        self.symbol = symbol
+        self.uri = uri
+        self.supervisor = ConnectionSupervisor(uri, partial(on_message, self), name=f"Feed[{symbol}]",
+                                               **supervisor_options)
+        # A broken book is resynchronized from the snapshot sent on reconnect
+        self.book_builder = OrderBookBuilder(max_depth=max_depth, on_resync=self.supervisor.reconnect)
+        self.books = ConflatingMailbox()
+        self.recorder = recorder
+        self.task = None
+        self.decode_errors = 0
+
+    @property
+    def connected(self):
+        return self.supervisor.connected
+
+    @property
+    def reconnects(self):
+        return self.supervisor.reconnects
+
+    @property
+    def messages(self):
+        return self.supervisor.messages
+
+    @property
+    def stats(self):
+        """Counters for monitoring this subscription"""
+        stats = self.supervisor.stats
+        stats.update({
+            "decode_errors": self.decode_errors,
+            "conflated": self.books.total_conflated,
+            "gaps": self.book_builder.gap_count,
+            "checksum_failures": self.book_builder.checksum_failures,
+        })
+        return stats
+
+
+class FeedManager:
+    """
+    Multiplexes many symbol feeds as tasks on one shared asyncio loop
+
+    Each symbol gets its own connection task, book builder and conflating
+    mailbox, but all of them run on a single background thread, so tracking
+    50 symbols costs 50 coroutines rather than 50 threads. Each connection is
+    kept alive by a ConnectionSupervisor (jittered backoff, staleness and
+    ping checks, downtime statistics), and a book that falls out of sync
+    reconnects its feed to get a fresh snapshot. Every delta is
+    applied to its book on the loop; only the publication of finished books
+    is conflated, so a slow consumer sees fewer, never inconsistent, books.
+    Backpressure towards the exchange comes from the bounded receive queue of
+    each connection: when the loop falls behind, frames wait in the socket
+    instead of piling up in memory.
+    """
+    def __init__(self, uri_template=FEED_URI, decoder=None, max_depth=None, on_book=None,
+                 monitor=None, **supervisor_options):
+        """
+        Initialize the feed manager
+
+        Args:
+            uri_template (str): Feed URI with a {symbol} placeholder
+            decoder: Message decoder shared by all feeds (the fastest installed decoder if None)
+            max_depth (int): Levels per side exposed in built OrderBooks (all if None)
+            on_book (callable): Called on the feed loop as on_book(symbol, orderbook, sequence)
+                after every book update; must not block
+            monitor (PerformanceMonitor): Receives receive/decode/book_build spans of all feeds
+            **supervisor_options: Backoff, staleness, ping, max_queue and fairness_batch
+                settings passed to each feed's ConnectionSupervisor
+        """
+        self.uri_template = uri_template
+        self.decoder = decoder or get_decoder()
+        self.max_depth = max_depth
+        self.on_book = on_book
+        self.monitor = monitor or PerformanceMonitor()
+        self.supervisor_options = supervisor_options
+        self.feeds = {}
+        self._tasks = set()
+        self.loop = None
+        self.thread = None
+        self.running = False
+        self.logger = setup_logger("FeedManager")
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the shared event loop on a background thread"""
+        if self.running:
+            return
+        self.running = True
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name="FeedManager")
+        self.thread.daemon = True
+        self.thread.start()
+        with self._lock:
+            for feed in self.feeds.values():
+                self.loop.call_soon_threadsafe(self._start_feed, feed)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.close()
+
+    def stop(self, timeout=2.0):
+        """Cancel every feed, close the connections and stop the loop; start() resumes them"""
+        if not self.running:
+            return
+        self.running = False
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            self.logger.error(f"Error stopping feeds: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+    async def _shutdown(self, timeout=1.0):
+        with self._lock:
+            feeds = list(self.feeds.values())
+        for feed in feeds:
+            feed.supervisor.stop()
+        # Includes tasks of removed symbols that may still be unwinding
+        tasks = list(self._tasks)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for feed in feeds:
+            if feed.recorder:
+                feed.recorder.flush()
+            # Let a later start() run the feed again on a new loop
+            feed.task = None
+            feed.supervisor.rearm()
+
+    def add_symbol(self, symbol, uri=None, recorder=None):
+        """
+        Subscribe to a symbol; safe to call from any thread
+
+        Args:
+            symbol (str): Symbol such as 'BTC-USDT-SWAP'
+            uri (str): Feed URI (built from the URI template if None)
+            recorder (TickFileWriter): Receives a copy of every decoded message; flushed
+                when the manager stops and closed when the symbol is removed (optional)
+
+        Returns:
+            SymbolFeed: State of the subscription
+        """
+        with self._lock:
+            if symbol in self.feeds:
+                return self.feeds[symbol]
+            uri = uri or self.uri_template.format(symbol=symbol)
+            feed = SymbolFeed(symbol, uri, self._on_message, self.max_depth, recorder,
+                              **self.supervisor_options)
+            self.feeds[symbol] = feed
+        if self.running:
+            self.loop.call_soon_threadsafe(self._start_feed, feed)
+        return feed
+
+    def remove_symbol(self, symbol):
+        """Unsubscribe from a symbol; safe to call from any thread"""
+        with self._lock:
+            feed = self.feeds.pop(symbol, None)
+        if feed and self.running:
+            self.loop.call_soon_threadsafe(self._cancel_feed, feed)
+        elif feed and feed.recorder:
+            feed.recorder.close()
+
+    def _start_feed(self, feed):
+        if feed.task is None and self.running:
+            feed.task = self.loop.create_task(self._run_feed(feed), name=f"feed-{feed.symbol}")
+            self._tasks.add(feed.task)
+            feed.task.add_done_callback(self._tasks.discard)
+
+    def _cancel_feed(self, feed):
+        feed.supervisor.stop()
+        if feed.task:
+            feed.task.cancel()
+        if feed.recorder:
+            feed.recorder.close()
+
+    async def _run_feed(self, feed):
+        """Connection loop of one symbol"""
+        await feed.supervisor.run()
+
+    def _on_message(self, feed, message):
+        """Decode one frame of a symbol's feed and apply it"""
+        monitor = self.monitor
+        start_ns = monitor.now()
+        monitor.record_message()
+        try:
+            data = self.decoder.decode(message)
+        except ValueError:
+            feed.decode_errors += 1
+            return
+        if feed.recorder:
+            feed.recorder.write(data, time.time())
+        self._apply(feed, data, monitor.stop("decode", start_ns))
+        monitor.stop("receive", start_ns)
+
+    def _apply(self, feed, data, start_ns):
+        """Apply one decoded message and publish the resulting book"""
+        try:
+            if not feed.book_builder.apply(data):
+                return
+            orderbook = feed.book_builder.orderbook
+            if not orderbook.is_valid:
+                return
+            self.monitor.stop("book_build", start_ns)
+            sequence = feed.books.put(orderbook)
+            if self.on_book:
+                self.on_book(feed.symbol, orderbook, sequence)
+        except Exception as e:
+            self.logger.error(f"Error processing {feed.symbol} orderbook: {e}")
+
+    @property
+    def symbols(self):
+        """Subscribed symbols"""
+        with self._lock:
+            return list(self.feeds)
+
+    def take(self):
+        """
+        Take the newest book of every symbol updated since the last call
+
+        Returns:
+            dict: Symbol to MailboxItem for symbols with a new book
+        """
+        with self._lock:
+            feeds = list(self.feeds.values())
+        updates = {}
+        for feed in feeds:
+            item = feed.books.take()
+            if item is not None:
+                updates[feed.symbol] = item
+        return updates
+
+    def latest(self, symbol):
+        """Newest OrderBook of a symbol (None before the first book)"""
+        feed = self.feeds.get(symbol)
+        return feed.books.peek().value if feed else None
+
+    def stats(self):
+        """Per-symbol counters"""
+        with self._lock:
+            return {symbol: feed.stats for symbol, feed in self.feeds.items()}
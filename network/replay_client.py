@@ -0,0 +1,113 @@
+# trade_simulator/network/replay_client.py
+import time
+import threading
+
+from ..storage.tick_file import TickFileReader
+from ..utils.logger import setup_logger
+from ..utils.performance_monitor import PerformanceMonitor
+
+class ReplayClient:
+    """
+    Drop-in replacement for WebSocketClient that replays a recorded tick file
+
+    Messages are delivered to the same callback as the live client, either
+    paced like the original feed ('realtime'), accelerated by a factor, or as
+    fast as the callback can consume them ('max') to measure throughput.
+    """
+    def __init__(self, path, callback, speed="realtime", loop=False, monitor=None):
+        """
+        Initialize the replay client
+        
+        Args:
+            path (str): Tick file written by TickFileWriter
+            callback (callable): Called with each replayed message
+            speed: 'realtime', 'max' or a numeric speed-up factor
+            loop (bool): Restart from the beginning when the file ends
+            monitor (PerformanceMonitor): Receives a 'receive' span per message (a private one if None)
+        """
+        self.path = path
+        self.callback = callback
+        self.speed = speed
+        self.loop = loop
+        self.running = False
+        self.connection_thread = None
+        self.messages_replayed = 0
+        self.elapsed = 0.0
+        self.monitor = monitor or PerformanceMonitor()
+        self.logger = setup_logger("ReplayClient")
+        
+        if speed == "realtime":
+            self.speed_factor = 1.0
+        elif speed == "max":
+            self.speed_factor = None
+        else:
+            self.speed_factor = float(speed)
+            if self.speed_factor <= 0:
+                raise ValueError(f"Replay speed must be positive: {speed}")
+    
+    def replay(self):
+        """Replay the file on the calling thread until it ends or stop() is called"""
+        start = time.perf_counter()
+        try:
+            while self.running:
+                first_receive_time = None
+                replay_start = time.perf_counter()
+                for message in TickFileReader(self.path):
+                    if not self.running:
+                        break
+                    
+                    # Pace delivery on the original receive times
+                    if self.speed_factor is not None:
+                        if first_receive_time is None:
+                            first_receive_time = message['receive_time']
+                        due = (message['receive_time'] - first_receive_time) / self.speed_factor
+                        delay = due - (time.perf_counter() - replay_start)
+                        if delay > 0:
+                            time.sleep(delay)
+                    
+                    tick_start = self.monitor.now()
+                    self.monitor.record_message()
+                    self.callback(message)
+                    self.monitor.stop("receive", tick_start)
+                    self.messages_replayed += 1
+                if not self.loop:
+                    break
+        except Exception as e:
+            self.logger.error(f"Error replaying {self.path}: {e}")
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.running = False
+        self.logger.info(f"Replayed {self.messages_replayed} messages in {self.elapsed:.3f}s "
+                         f"({self.messages_per_second:.0f} msg/s)")
+    
+    def start(self):
+        """Start replaying in a separate thread"""
+        if self.running:
+            return
+        self.running = True
+        self.connection_thread = threading.Thread(target=self.replay)
+        self.connection_thread.daemon = True
+        self.connection_thread.start()
+    
+    def run(self):
+        """Replay synchronously on the calling thread"""
+        self.running = True
+        self.replay()
+    
+    def stop(self):
+        """Stop replaying"""
+        self.running = False
+        if self.connection_thread:
+            self.connection_thread.join(timeout=1)
+    
+    @property
+    def messages_per_second(self):
+        """Replay throughput over the elapsed replay time"""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.messages_replayed / self.elapsed
+    
+    @property
+    def average_processing_time(self):
+        """Average processing time per tick in seconds"""
+        return self.monitor.mean("receive")
@@ -1,94 +1,138 @@
 # trade_simulator/network/websocket_client.py
-import json
 import time
 import asyncio
 import threading
-import websockets
-import logging
 
 from ..utils.logger import setup_logger
+from ..utils.performance_monitor import PerformanceMonitor
+from .connection_supervisor import ConnectionSupervisor
+from .decoders import get_decoder
 
 class WebSocketClient:
     """
     Class for handling WebSocket connection and data processing
     """
-    def __init__(self, uri, callback):
+    def __init__(self, uri, callback, decoder=None, recorder=None, monitor=None, **supervisor_options):
+        """
+        Initialize the WebSocket client
+
+        Args:
+            uri (str): WebSocket endpoint
+            callback (callable): Called with each decoded message
+            decoder: Message decoder (the fastest installed decoder if None)
+            recorder (TickFileWriter): Optional recorder receiving a copy of every message
+            monitor (PerformanceMonitor): Receives 'decode' and 'receive' spans (a private one if None)
+            **supervisor_options: Backoff, staleness and ping settings for ConnectionSupervisor
+        """
         self.uri = uri
         self.callback = callback
+        self.decoder = decoder or get_decoder()
+        self.recorder = recorder
         self.running = False
-        self.ws = None
+        self.loop = None
         self.connection_thread = None
         self.last_tick_time = time.time()
-        self.processing_times = []
+        # Arrival time of the frame being handled, readable from the callback
+        self.receive_time = None
+        self.receive_ns = None
+        self.monitor = monitor or PerformanceMonitor()
         self.logger = setup_logger("WebSocketClient")
-    
-    async def connect(self):
-        """Connect to WebSocket and process messages"""
+        self.supervisor = ConnectionSupervisor(uri, self.handle_message, name="WebSocketClient",
+                                               **supervisor_options)
+        self._task = None
+
+    def handle_message(self, message):
+        """Decode one frame and pass it to the recorder and callback"""
+        monitor = self.monitor
+        start_ns = monitor.now()
+        start_time = time.time()
+        self.receive_ns = start_ns
+        self.receive_time = start_time
+        monitor.record_message()
         try:
-            self.logger.info(f"Connecting to {self.uri}")
-            async with websockets.connect(self.uri) as websocket:
-                self.ws = websocket
-                self.logger.info("Connected to WebSocket server")
-                
-                while self.running:
-                    try:
-                        message = await websocket.recv()
-                        start_time = time.time()
-                        
-                        # Process the message
-                        data = json.loads(message)
-                        self.callback(data)
-                        
-                        # Calculate processing time
-                        processing_time = time.time() - start_time
-                        self.processing_times.append(processing_time)
-                        if len(self.processing_times) > 100:
-                            self.processing_times.pop(0)
-                            
-                        self.last_tick_time = time.time()
-                    except websockets.exceptions.ConnectionClosed:
-                        self.logger.warning("WebSocket connection closed, attempting to reconnect...")
-                        break
-                    except json.JSONDecodeError:
-                        self.logger.error("Failed to decode JSON message")
-                    except Exception as e:
-                        self.logger.error(f"Error processing WebSocket message: {e}")
+            data = self.decoder.decode(message)
+        except ValueError:
+            self.logger.error(f"Failed to decode message with {self.decoder.name} decoder")
+            return
+        monitor.stop("decode", start_ns)
+
+        try:
+            if self.recorder:
+                self.recorder.write(data, start_time)
+            self.callback(data)
         except Exception as e:
-            self.logger.error(f"WebSocket connection error: {e}")
-            
-        # Try to reconnect after a brief delay if still running
-        if self.running:
-            self.logger.info("Attempting to reconnect in 5 seconds...")
-            await asyncio.sleep(5)
-            asyncio.create_task(self.connect())
-    
+            self.logger.error(f"Error processing WebSocket message: {e}")
+
+        monitor.stop("receive", start_ns)
+        self.last_tick_time = time.time()
+
+    async def connect(self):
+        """Connect and process messages until stopped, reconnecting as needed"""
+        await self.supervisor.run()
+
     def start(self):
         """Start the WebSocket client in a separate thread"""
         if self.running:
             return
-            
+
         self.running = True
-        
+        self.loop = asyncio.new_event_loop()
+
         def run_async_loop():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.connect())
-        
-        self.connection_thread = threading.Thread(target=run_async_loop)
+            asyncio.set_event_loop(self.loop)
+            self._task = self.loop.create_task(self.connect())
+            try:
+                self.loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self.loop.close()
+
+        self.connection_thread = threading.Thread(target=run_async_loop, name="WebSocketClient")
         self.connection_thread.daemon = True
         self.connection_thread.start()
-        
-    def stop(self):
-        """Stop the WebSocket client"""
+
+    def stop(self, timeout=2.0):
+        """
+        Stop the WebSocket client; safe to call from any thread
+
+        Args:
+            timeout (float): Seconds to wait for the connection to close before cancelling it
+        """
         self.running = False
-        if self.ws:
-            asyncio.run(self.ws.close())
+        self.supervisor.stop()
         if self.connection_thread:
-            self.connection_thread.join(timeout=1)
-    
+            self.connection_thread.join(timeout)
+            if self.connection_thread.is_alive() and self._task is not None:
+                # Still inside a connection handshake; cancel it outright
+                try:
+                    self.loop.call_soon_threadsafe(self._task.cancel)
+                except RuntimeError:
+                    pass
+                self.connection_thread.join(timeout)
+        if self.recorder:
+            self.recorder.close()
+
+    def request_resync(self, reason=None):
+        """Reconnect to receive a fresh snapshot, e.g. after an orderbook sequence gap"""
+        self.supervisor.reconnect(reason)
+
+    @property
+    def connected(self):
+        """True while a connection is open"""
+        return self.supervisor.connected
+
+    @property
+    def connection_stats(self):
+        """Reconnect counts and downtime measured by the supervisor"""
+        return self.supervisor.stats
+
     @property
     def average_processing_time(self):
-        """Calculate average processing time per tick"""
-        if not self.processing_times:
-            return 0
-        return sum(self.processing_times) / len(self.processing_times)
\ No newline at end of file
+        """Average processing time per tick in seconds"""
+        return self.monitor.mean("receive")
+
+    @property
+    def messages_per_second(self):
+        """Current feed message rate"""
+        return self.monitor.messages_per_second
@@ -0,0 +1,3 @@
+"""
+Storage Package
+"""
\ No newline at end of file
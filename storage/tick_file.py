@@ -0,0 +1,207 @@
+# trade_simulator/storage/tick_file.py
+"""
+Compact append-only binary format for recorded L2 ticks
+
+Layout:
+    file header   b"TSTK" | u16 version | u32 metadata length | metadata JSON
+    chunk         b"CHNK" | u32 tick count | u32 raw length | u32 compressed length | zlib payload
+
+Each chunk payload is a sequence of tick records:
+    f8 exchange time | f8 receive time | i8 sequence | u1 action | u4 asks | u4 bids
+    asks * (f8 price, f8 size) | bids * (f8 price, f8 size)
+
+Times are epoch seconds (NaN when unknown) and the sequence is -1 when the
+feed does not provide one. Ticks are buffered and written a chunk at a time,
+so a crash loses at most the chunk being filled.
+"""
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from ..models.orderbook import levels_array
+from ..utils.timestamps import format_exchange_timestamp, parse_exchange_timestamp
+
+MAGIC = b"TSTK"
+CHUNK_MAGIC = b"CHNK"
+VERSION = 1
+
+_FILE_HEADER = struct.Struct("<4sHI")
+_CHUNK_HEADER = struct.Struct("<4sIII")
+_TICK_HEADER = struct.Struct("<ddqBII")
+
+ACTIONS = ("snapshot", "update")
+
+
+class TickFileWriter:
+    """
+    Recorder that appends decoded L2 messages to a tick file
+
+    Intended to be passed to WebSocketClient as its recorder, which calls
+    write() with each decoded message and its receive time.
+    """
+    def __init__(self, path, metadata=None, chunk_ticks=100, compression_level=1):
+        """
+        Open a tick file for appending, creating it if needed
+
+        Args:
+            path (str): File path
+            metadata (dict): Free-form metadata stored in a new file's header
+            chunk_ticks (int): Ticks buffered per compressed chunk
+            compression_level (int): zlib level; low levels keep the feed thread fast
+        """
+        self.path = path
+        self.chunk_ticks = chunk_ticks
+        self.compression_level = compression_level
+        self.ticks_written = 0
+        self._buffer = []
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as tick_file:
+                read_header(tick_file)
+        self._file = open(path, "ab")
+        if not exists:
+            encoded = json.dumps(metadata or {}).encode()
+            self._file.write(_FILE_HEADER.pack(MAGIC, VERSION, len(encoded)) + encoded)
+            self._file.flush()
+
+    def write(self, message, receive_time):
+        """
+        Buffer one decoded L2 message
+
+        Args:
+            message (dict): Decoded message with 'asks' and 'bids' levels
+            receive_time (float): Local epoch time the message was received
+        """
+        asks = levels_array(message.get('asks'))
+        bids = levels_array(message.get('bids'))
+        exchange_time = parse_exchange_timestamp(message.get('timestamp'))
+        sequence = message.get('seqId')
+        action = 1 if message.get('action') == "update" else 0
+        header = _TICK_HEADER.pack(
+            np.nan if exchange_time is None else exchange_time,
+            receive_time,
+            -1 if sequence is None else sequence,
+            action, len(asks), len(bids),
+        )
+        self._buffer.append(header + asks.tobytes() + bids.tobytes())
+        if len(self._buffer) >= self.chunk_ticks:
+            self.flush()
+
+    def flush(self):
+        """Compress buffered ticks into a chunk and append it to the file"""
+        if not self._buffer:
+            return
+        raw = b"".join(self._buffer)
+        compressed = zlib.compress(raw, self.compression_level)
+        self._file.write(_CHUNK_HEADER.pack(CHUNK_MAGIC, len(self._buffer), len(raw), len(compressed)))
+        self._file.write(compressed)
+        self._file.flush()
+        self.ticks_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """Flush remaining ticks and close the file"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_header(tick_file):
+    """
+    Read and validate the file header
+
+    Args:
+        tick_file: Binary file object positioned at the start of the file
+
+    Returns:
+        dict: Metadata stored in the header
+    """
+    header = tick_file.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size:
+        raise ValueError("Truncated tick file header")
+    magic, version, metadata_length = _FILE_HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a tick file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported tick file version: {version}")
+    return json.loads(tick_file.read(metadata_length).decode())
+
+
+class TickFileReader:
+    """
+    Sequential reader for tick files
+
+    Iterating yields messages shaped like the typed decoder output: 'asks'
+    and 'bids' are (n, 2) float64 arrays, 'timestamp' is an ISO string and
+    'receive_time' holds the original receive time.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as tick_file:
+            self.metadata = read_header(tick_file)
+
+    def chunks(self):
+        """Yield the raw payload of each complete chunk"""
+        with open(self.path, "rb") as tick_file:
+            read_header(tick_file)
+            while True:
+                header = tick_file.read(_CHUNK_HEADER.size)
+                if len(header) < _CHUNK_HEADER.size:
+                    return
+                magic, count, raw_length, compressed_length = _CHUNK_HEADER.unpack(header)
+                if magic != CHUNK_MAGIC:
+                    raise ValueError("Corrupt tick file: bad chunk marker")
+                compressed = tick_file.read(compressed_length)
+                if len(compressed) < compressed_length:
+                    return  # Partially written final chunk
+                yield count, zlib.decompress(compressed)
+
+    def records(self):
+        """
+        Yield raw tick records
+
+        Yields:
+            tuple: (exchange_time, receive_time, sequence, action, asks, bids)
+        """
+        for count, payload in self.chunks():
+            offset = 0
+            for _ in range(count):
+                exchange_time, receive_time, sequence, action, n_asks, n_bids = \
+                    _TICK_HEADER.unpack_from(payload, offset)
+                offset += _TICK_HEADER.size
+                asks = np.frombuffer(payload, dtype=np.float64, count=n_asks * 2, offset=offset).reshape(-1, 2)
+                offset += n_asks * 16
+                bids = np.frombuffer(payload, dtype=np.float64, count=n_bids * 2, offset=offset).reshape(-1, 2)
+                offset += n_bids * 16
+                yield exchange_time, receive_time, sequence, action, asks, bids
+
+    def __iter__(self):
+        exchange = self.metadata.get('exchange')
+        symbol = self.metadata.get('symbol')
+        for exchange_time, receive_time, sequence, action, asks, bids in self.records():
+            message = {
+                'asks': asks,
+                'bids': bids,
+                'action': ACTIONS[action],
+                'receive_time': receive_time,
+            }
+            if not np.isnan(exchange_time):
+                message['timestamp'] = format_exchange_timestamp(exchange_time)
+            if sequence >= 0:
+                message['seqId'] = sequence
+            if exchange:
+                message['exchange'] = exchange
+            if symbol:
+                message['symbol'] = symbol
+            yield message
@@ -0,0 +1,202 @@
+# trade_simulator/storage/tick_store.py
+"""
+Columnar on-disk store of fixed-depth orderbook snapshots read via np.memmap
+
+A store is a directory holding:
+    meta.json        depth and free-form metadata
+    timestamps.f8    one float64 epoch time per snapshot, non-decreasing
+    ask_prices.f8    (n, depth) float64 matrix, best level first
+    ask_sizes.f8     (n, depth) float64 matrix
+    bid_prices.f8    (n, depth) float64 matrix, best level first
+    bid_sizes.f8     (n, depth) float64 matrix
+
+Books shallower than the store depth are padded with NaN prices and zero
+sizes. Readers map the files without loading them, so time-range queries
+return zero-copy views.
+"""
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from ..models.book_builder import OrderBookBuilder
+from ..utils.timestamps import parse_exchange_timestamp
+from .tick_file import TickFileReader
+
+COLUMNS = ("ask_prices", "ask_sizes", "bid_prices", "bid_sizes")
+
+# Zero-copy view over consecutive snapshots in a TickStore
+BookMatrix = namedtuple("BookMatrix", ("timestamps",) + COLUMNS)
+
+
+class TickStoreWriter:
+    """
+    Appends orderbook snapshots to a tick store directory
+    """
+    def __init__(self, directory, depth=400, metadata=None):
+        """
+        Open a store for appending, creating it if needed
+
+        Args:
+            directory (str): Store directory
+            depth (int): Levels per side kept for each snapshot (ignored for existing stores)
+            metadata (dict): Free-form metadata for a new store
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as meta_file:
+                self.meta = json.load(meta_file)
+        else:
+            self.meta = {"depth": depth, "metadata": metadata or {}}
+            with open(meta_path, "w") as meta_file:
+                json.dump(self.meta, meta_file)
+        self.depth = self.meta["depth"]
+
+        self._timestamps = open(os.path.join(directory, "timestamps.f8"), "ab")
+        self._columns = {name: open(os.path.join(directory, f"{name}.f8"), "ab") for name in COLUMNS}
+        self.count = self._timestamps.tell() // 8
+        self.last_timestamp = -np.inf
+        if self.count:
+            last = np.fromfile(os.path.join(directory, "timestamps.f8"), dtype=np.float64,
+                               count=1, offset=(self.count - 1) * 8)
+            self.last_timestamp = float(last[0])
+
+    def _row(self, values, fill):
+        """Pad or truncate one side to the store depth"""
+        row = np.full(self.depth, fill, dtype=np.float64)
+        n = min(len(values), self.depth)
+        row[:n] = values[:n]
+        return row
+
+    def append(self, orderbook, timestamp):
+        """
+        Append one snapshot
+
+        Args:
+            orderbook (OrderBook): Snapshot to store
+            timestamp (float): Epoch time of the snapshot; must not go backwards
+        """
+        if timestamp < self.last_timestamp:
+            raise ValueError(f"Timestamps must be non-decreasing: {timestamp} < {self.last_timestamp}")
+        self._timestamps.write(np.float64(timestamp).tobytes())
+        self._columns["ask_prices"].write(self._row(orderbook.ask_prices, np.nan).tobytes())
+        self._columns["ask_sizes"].write(self._row(orderbook.ask_sizes, 0.0).tobytes())
+        self._columns["bid_prices"].write(self._row(orderbook.bid_prices, np.nan).tobytes())
+        self._columns["bid_sizes"].write(self._row(orderbook.bid_sizes, 0.0).tobytes())
+        self.last_timestamp = timestamp
+        self.count += 1
+
+    def close(self):
+        """Flush and close the column files"""
+        for column_file in [self._timestamps] + list(self._columns.values()):
+            column_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def from_tick_file(cls, tick_path, directory, depth=400):
+        """
+        Convert a recorded tick file into a tick store
+
+        Deltas are applied through an OrderBookBuilder, so recordings of
+        incremental feeds produce full snapshots. Snapshots are indexed by
+        exchange time, falling back to the receive time.
+
+        Args:
+            tick_path (str): Tick file written by TickFileWriter
+            directory (str): Store directory to create or append to
+            depth (int): Levels per side to keep
+
+        Returns:
+            int: Number of snapshots stored
+        """
+        reader = TickFileReader(tick_path)
+        builder = OrderBookBuilder(max_depth=depth)
+        stored = 0
+        with cls(directory, depth, reader.metadata) as writer:
+            for message in reader:
+                if not builder.apply(message):
+                    continue
+                timestamp = parse_exchange_timestamp(message.get('timestamp'))
+                if timestamp is None:
+                    timestamp = message['receive_time']
+                # Exchange clocks can step back slightly between messages
+                writer.append(builder.orderbook, max(timestamp, writer.last_timestamp))
+                stored += 1
+        return stored
+
+
+class TickStore:
+    """
+    Read-only memory-mapped view of a tick store
+    """
+    def __init__(self, directory):
+        """
+        Map a tick store
+
+        Args:
+            directory (str): Store directory written by TickStoreWriter
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as meta_file:
+            meta = json.load(meta_file)
+        self.depth = meta["depth"]
+        self.metadata = meta.get("metadata", {})
+
+        columns = {name: self._map(name, (-1, self.depth)) for name in COLUMNS}
+        timestamps = self._map("timestamps", (-1,))
+        # A crash mid-append can leave columns one row apart; use complete rows only
+        count = min([len(timestamps)] + [len(column) for column in columns.values()])
+        self.timestamps = timestamps[:count]
+        for name, column in columns.items():
+            setattr(self, name, column[:count])
+
+    def _map(self, name, shape):
+        """Memory-map one column file (empty array for an empty file)"""
+        path = os.path.join(self.directory, f"{name}.f8")
+        size = os.path.getsize(path) // 8
+        if shape[-1] != -1:
+            size -= size % shape[-1]  # Ignore a partially written final row
+        if size == 0:
+            return np.empty((0,) + tuple(shape[1:]), dtype=np.float64)
+        array = np.memmap(path, dtype=np.float64, mode="r", shape=(size,))
+        return array.reshape(shape)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def index_range(self, start_time=None, end_time=None):
+        """
+        Row indices covering [start_time, end_time)
+
+        Returns:
+            tuple: (start, stop) row indices
+        """
+        start = 0 if start_time is None else int(np.searchsorted(self.timestamps, start_time, side="left"))
+        stop = len(self) if end_time is None else int(np.searchsorted(self.timestamps, end_time, side="left"))
+        return start, stop
+
+    def slice(self, start, stop):
+        """Zero-copy BookMatrix for rows [start, stop)"""
+        return BookMatrix(self.timestamps[start:stop],
+                          *(getattr(self, name)[start:stop] for name in COLUMNS))
+
+    def chunks(self, start_time=None, end_time=None, chunk_size=10000):
+        """
+        Yield zero-copy BookMatrix chunks covering a time range
+
+        Args:
+            start_time (float): Inclusive start epoch time (beginning of store if None)
+            end_time (float): Exclusive end epoch time (end of store if None)
+            chunk_size (int): Maximum snapshots per chunk
+        """
+        start, stop = self.index_range(start_time, end_time)
+        for chunk_start in range(start, stop, chunk_size):
+            yield self.slice(chunk_start, min(chunk_start + chunk_size, stop))
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from models.almgren_chriss import (ACParameters, calibrate, efficient_frontier, optimal_schedule,
+                                   trajectory, urgency)
+from models.orderbook import OrderBook
+from models.trading_models import TradingModels
+
+# Example of Almgren & Chriss (2000): 1M shares at $50 over 5 days in 5 slices
+PARAMS = ACParameters(sigma=0.95, eta=2.5e-6, gamma=2.5e-7, epsilon=0.0625)
+QUANTITY, HORIZON, SLICES = 1e6, 5.0, 5
+
+def closed_form(quantity, params, horizon, slices, kappa):
+    """Expected cost and variance in the closed form of the paper"""
+    tau = horizon / slices
+    eta = params.eta - 0.5 * params.gamma * tau
+    sinh_t = np.sinh(kappa * horizon)
+    expected = (0.5 * params.gamma * quantity ** 2 + params.epsilon * quantity
+                + eta * quantity ** 2 * np.tanh(0.5 * kappa * tau)
+                * (tau * np.sinh(2 * kappa * horizon) + 2 * horizon * np.sinh(kappa * tau))
+                / (2 * tau ** 2 * sinh_t ** 2))
+    variance = (0.5 * params.sigma ** 2 * quantity ** 2
+                * (tau * sinh_t * np.cosh(kappa * (horizon - tau)) - horizon * np.sinh(kappa * tau))
+                / (sinh_t ** 2 * np.sinh(kappa * tau)))
+    return expected, variance
+
+class TestAlmgrenChriss(unittest.TestCase):
+    def test_risk_neutral_schedule_is_twap(self):
+        schedule = optimal_schedule(QUANTITY, PARAMS, HORIZON, SLICES, 0.0)
+        self.assertEqual(schedule.kappa, 0.0)
+        np.testing.assert_allclose(schedule.trades, np.full(SLICES, QUANTITY / SLICES))
+        tau = HORIZON / SLICES
+        eta = PARAMS.eta - 0.5 * PARAMS.gamma * tau
+        self.assertAlmostEqual(schedule.expected_cost, 0.5 * PARAMS.gamma * QUANTITY ** 2
+                               + PARAMS.epsilon * QUANTITY + eta * QUANTITY ** 2 / HORIZON)
+
+    def test_matches_closed_form(self):
+        schedule = optimal_schedule(QUANTITY, PARAMS, HORIZON, SLICES, 1e-6)
+        self.assertAlmostEqual(schedule.holdings[0], QUANTITY)
+        self.assertAlmostEqual(schedule.holdings[-1], 0.0)
+        self.assertAlmostEqual(schedule.trades.sum(), QUANTITY)
+        expected, variance = closed_form(QUANTITY, PARAMS, HORIZON, SLICES, schedule.kappa)
+        self.assertAlmostEqual(schedule.expected_cost / expected, 1.0, places=9)
+        self.assertAlmostEqual(schedule.variance / variance, 1.0, places=9)
+        # Risk aversion front-loads the schedule
+        self.assertTrue(np.all(np.diff(schedule.trades) < 0))
+
+    def test_kappa_matches_cosh_equation(self):
+        tau = HORIZON / SLICES
+        kappa = urgency(PARAMS, HORIZON, SLICES, 1e-6)
+        eta = PARAMS.eta - 0.5 * PARAMS.gamma * tau
+        self.assertAlmostEqual(np.cosh(kappa * tau), 1 + 1e-6 * PARAMS.sigma ** 2 * tau ** 2 / (2 * eta))
+
+    def test_frontier_trades_cost_for_variance(self):
+        risk_aversions = np.logspace(-9, -3, 2000)
+        frontier = efficient_frontier(QUANTITY, PARAMS, HORIZON, SLICES, risk_aversions)
+        self.assertEqual(len(frontier), 2000)
+        self.assertTrue(np.all(np.diff(frontier["expected_cost"]) >= 0))
+        self.assertTrue(np.all(np.diff(frontier["variance"]) <= 0))
+        point = optimal_schedule(QUANTITY, PARAMS, HORIZON, SLICES, risk_aversions[1000])
+        self.assertAlmostEqual(frontier["expected_cost"][1000], point.expected_cost)
+        self.assertAlmostEqual(frontier["variance"][1000], point.variance)
+
+    def test_urgent_schedules_stay_finite(self):
+        holdings = trajectory(np.array([0.0, 1e-12, 500.0]), HORIZON, SLICES)
+        self.assertTrue(np.all(np.isfinite(holdings)))
+        np.testing.assert_allclose(holdings[1], holdings[0])
+        np.testing.assert_allclose(holdings[2], [1.0, 0.0, 0.0, 0.0, 0.0, 0.0], atol=1e-12)
+
+    def test_rejects_dominant_permanent_impact(self):
+        with self.assertRaises(ValueError):
+            optimal_schedule(QUANTITY, PARAMS._replace(gamma=1e-5), HORIZON, SLICES, 1e-6)
+
+class TestTradingModelsExecution(unittest.TestCase):
+    def setUp(self):
+        self.models = TradingModels()
+        self.book = OrderBook([100.5, 101.0], [10.0, 20.0], [99.5, 99.0], [10.0, 20.0])
+
+    def test_calibration_from_book(self):
+        params = self.models.execution_parameters(self.book, 0.02)
+        self.assertEqual(params, calibrate(100.0, 1.0, 0.02, 60.0))
+        self.assertAlmostEqual(params.epsilon, 0.5)
+        self.assertAlmostEqual(params.sigma, 2.0)
+
+    def test_schedule_and_frontier(self):
+        schedule = self.models.optimal_execution(self.book, 5.0, 0.02, risk_aversion=1e-3, slices=8)
+        self.assertEqual(len(schedule.trades), 8)
+        self.assertAlmostEqual(schedule.trades.sum(), 5.0)
+        frontier = self.models.efficient_frontier(self.book, 5.0, 0.02, [0.0, 1e-3], slices=8)
+        self.assertAlmostEqual(frontier["expected_cost"][1], schedule.expected_cost)
+
+if __name__ == '__main__':
+    unittest.main()
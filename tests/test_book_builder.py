@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+from models.book_builder import OrderBookBuilder, okx_checksum
+
+class TestOrderBookBuilder(unittest.TestCase):
+    def setUp(self):
+        self.resyncs = []
+        self.builder = OrderBookBuilder(on_resync=self.resyncs.append)
+        self.builder.apply({
+            "action": "snapshot", "seqId": 10,
+            "asks": [["100.0", "1.0"], ["101.0", "2.0"]],
+            "bids": [["99.0", "1.0"], ["98.0", "2.0"]]
+        })
+
+    def test_snapshot_without_action(self):
+        builder = OrderBookBuilder()
+        self.assertTrue(builder.apply({"asks": [["100.0", "1.0"]], "bids": [["99.0", "1.0"]]}))
+        self.assertEqual(builder.orderbook.mid_price, 99.5)
+
+    def test_snapshot_is_sorted_and_drops_empty_levels(self):
+        builder = OrderBookBuilder()
+        builder.apply({"asks": [["101.0", "2.0"], ["100.0", "1.0"], ["102.0", "0"]],
+                       "bids": [["98.0", "2.0"], ["99.0", "1.0"]]})
+        np.testing.assert_array_equal(builder.orderbook.ask_prices, [100.0, 101.0])
+        np.testing.assert_array_equal(builder.orderbook.bid_prices, [99.0, 98.0])
+
+    def test_deltas_insert_update_and_remove(self):
+        self.assertTrue(self.builder.apply({
+            "action": "update", "prevSeqId": 10, "seqId": 11,
+            "asks": [["100.0", "0"], ["100.5", "3.0"]],
+            "bids": [["98.0", "5.0"], ["99.5", "0.5"]]
+        }))
+        book = self.builder.orderbook
+        np.testing.assert_array_equal(book.ask_prices, [100.5, 101.0])
+        np.testing.assert_array_equal(book.ask_sizes, [3.0, 2.0])
+        np.testing.assert_array_equal(book.bid_prices, [99.5, 99.0, 98.0])
+        np.testing.assert_array_equal(book.bid_sizes, [0.5, 1.0, 5.0])
+
+    def test_deep_book_deltas_match_rebuilt_book(self):
+        rng = np.random.default_rng(3)
+        asks = {100.0 + i: 1.0 for i in range(40)}
+        builder = OrderBookBuilder(max_depth=25)
+        builder.apply({"asks": [[str(p), str(q)] for p, q in asks.items()], "bids": [["99.0", "1.0"]]})
+        for _ in range(200):
+            price = float(rng.integers(100, 180))
+            size = float(rng.integers(0, 3))
+            builder.apply({"action": "update", "asks": [[str(price), str(size)]]})
+            if size:
+                asks[price] = size
+            else:
+                asks.pop(price, None)
+        prices = sorted(asks)
+        np.testing.assert_array_equal(builder.orderbook.ask_prices, prices[:25])
+        np.testing.assert_array_equal(builder.orderbook.ask_sizes, [asks[p] for p in prices[:25]])
+        expected = okx_checksum([("99.0", "1.0")], [(str(p), str(asks[p])) for p in prices])
+        self.assertEqual(builder.checksum(), expected)
+
+    def test_orderbook_is_cached_until_next_change(self):
+        book = self.builder.orderbook
+        self.assertIs(self.builder.orderbook, book)
+        self.builder.apply({"action": "update", "asks": [["102.0", "1.0"]]})
+        self.assertIsNot(self.builder.orderbook, book)
+
+    def test_sequence_gap_triggers_resync(self):
+        self.assertFalse(self.builder.apply({
+            "action": "update", "prevSeqId": 12, "seqId": 13, "asks": [["100.0", "9.0"]]
+        }))
+        self.assertEqual(self.builder.gap_count, 1)
+        self.assertEqual(len(self.resyncs), 1)
+        self.assertIsNone(self.builder.orderbook)
+        # Updates are ignored until a new snapshot arrives
+        self.assertFalse(self.builder.apply({"action": "update", "asks": [["100.0", "9.0"]]}))
+        self.assertTrue(self.builder.apply({
+            "action": "snapshot", "seqId": 20,
+            "asks": [["100.0", "1.0"]], "bids": [["99.0", "1.0"]]
+        }))
+        self.assertEqual(self.builder.orderbook.best_ask, 100.0)
+
+    def test_checksum_validation(self):
+        bids = [("99.0", "1.0"), ("98.0", "2.0")]
+        asks = [("100.0", "1.0"), ("101.0", "2.0")]
+        self.assertEqual(self.builder.checksum(), okx_checksum(bids, asks))
+        good = okx_checksum([("99.0", "1.0"), ("98.0", "2.0")], [("101.0", "2.0")])
+        self.assertTrue(self.builder.apply({
+            "action": "update", "seqId": 11, "asks": [["100.0", "0"]], "checksum": good
+        }))
+        self.assertFalse(self.builder.apply({
+            "action": "update", "seqId": 12, "asks": [["101.0", "1.0"]], "checksum": good
+        }))
+        self.assertEqual(self.builder.checksum_failures, 1)
+        self.assertEqual(len(self.resyncs), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from cli import BatchSimulator, CsvResultWriter, COLUMNS, main
+from storage.tick_file import TickFileReader, TickFileWriter
+from storage.tick_store import TickStoreWriter
+from models.trading_models import TradingModels
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_message(i):
+    return {
+        "timestamp": f"2025-05-04T10:39:{i:02d}Z",
+        "exchange": "OKX",
+        "symbol": "BTC-USDT",
+        "asks": [[f"{100 + i}.5", "1.0"], [f"{101 + i}.0", "2.25"]],
+        "bids": [[f"{99 + i}.0", "3.0"]],
+    }
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.tick_path = os.path.join(self.directory, "ticks.bin")
+        self.output_path = os.path.join(self.directory, "costs.csv")
+        with TickFileWriter(self.tick_path, {"exchange": "OKX", "symbol": "BTC-USDT"}) as writer:
+            for i in range(3):
+                writer.write(make_message(i), 1000.0 + i)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read_rows(self):
+        with open(self.output_path, newline="") as output_file:
+            return list(csv.DictReader(output_file))
+
+    def test_simulator_writes_grid_rows(self):
+        writer = CsvResultWriter(self.output_path)
+        simulator = BatchSimulator(TradingModels(), writer, [0.5, 2.0], sides=("buy", "sell"),
+                                   fee_tiers=("VIP0", "VIP5"))
+        simulator.process_message(make_message(0))
+        writer.close()
+        rows = self.read_rows()
+        self.assertEqual(len(rows), 2 * 2 * 2)
+        self.assertEqual(tuple(rows[0].keys()), COLUMNS)
+        self.assertEqual({(row["side"], row["fee_tier"]) for row in rows},
+                         {("buy", "VIP0"), ("sell", "VIP0"), ("buy", "VIP5"), ("sell", "VIP5")})
+        vip5 = [row for row in rows if row["fee_tier"] == "VIP5" and row["side"] == "buy"]
+        vip0 = [row for row in rows if row["fee_tier"] == "VIP0" and row["side"] == "buy"]
+        self.assertLess(float(vip5[0]["fees"]), float(vip0[0]["fees"]))
+        self.assertEqual(rows[0]["symbol"], "BTC-USDT")
+
+    def test_replay_to_csv(self):
+        main(["--replay", self.tick_path, "--quantities", "1,2", "--output", self.output_path])
+        rows = self.read_rows()
+        self.assertEqual(len(rows), 3 * 2)
+        self.assertEqual(float(rows[0]["timestamp"]), 1746355140.0)
+
+    def test_replay_trains_online_checkpoint(self):
+        checkpoint = os.path.join(self.directory, "online.npz")
+        main(["--replay", self.tick_path, "--online-models", checkpoint, "--output", self.output_path])
+        main(["--replay", self.tick_path, "--online-models", checkpoint, "--output", self.output_path])
+        with np.load(checkpoint) as data:
+            self.assertIn("slippage.weights", data.files)
+            self.assertEqual(int(data["slippage.updates"]), 2 * 3 * 14)
+
+    def test_store_matches_replay(self):
+        store_path = os.path.join(self.directory, "store")
+        TickStoreWriter.from_tick_file(self.tick_path, store_path, depth=4)
+        main(["--replay", self.tick_path, "--quantities", "1,5", "--output", self.output_path])
+        replayed = self.read_rows()
+        main(["--store", store_path, "--quantities", "1,5", "--output", self.output_path])
+        stored = self.read_rows()
+        self.assertEqual(len(stored), len(replayed))
+        for replayed_row, stored_row in zip(replayed, stored):
+            for name in ("timestamp", "slippage", "fees", "net_cost"):
+                self.assertAlmostEqual(float(replayed_row[name]), float(stored_row[name]))
+
+    def test_store_range_bounds(self):
+        store_path = os.path.join(self.directory, "store")
+        TickStoreWriter.from_tick_file(self.tick_path, store_path, depth=4)
+        main(["--store", store_path, "--start", "1746355140.5", "--output", self.output_path])
+        self.assertEqual([float(row["timestamp"]) for row in self.read_rows()], [1746355141.0, 1746355142.0])
+        for bound in ("--start", "--end"):
+            with self.assertRaises(SystemExit):
+                main(["--store", store_path, bound, "2025-13-01", "--output", self.output_path])
+
+    def test_uri_feed_records_under_its_symbol(self):
+        # Nothing listens on port 1: the feed only retries until the duration elapses
+        record = os.path.join(self.directory, "{symbol}.ticks")
+        main(["--uri", "ws://127.0.0.1:1/ws/okx/BTC-USDT-SWAP", "--duration", "0.2",
+              "--record", record, "--output", self.output_path])
+        reader = TickFileReader(os.path.join(self.directory, "BTC-USDT-SWAP.ticks"))
+        self.assertEqual(reader.metadata["symbol"], "BTC-USDT-SWAP")
+
+    def test_record_needs_a_live_feed(self):
+        with self.assertRaises(SystemExit):
+            main(["--replay", self.tick_path, "--record", self.tick_path])
+        with self.assertRaises(SystemExit):
+            main(["--live", "BTC-USDT,ETH-USDT", "--record", "ticks.bin"])
+
+    def test_order_types_are_checked(self):
+        for argv in (["--replay", self.tick_path, "--order-types", "iceberg"],
+                     ["--store", self.directory, "--order-types", "limit"],
+                     ["--live", "BTC-USDT,ETH-USDT", "--order-types", "market,limit"]):
+            with self.assertRaises(SystemExit):
+                main(argv + ["--output", self.output_path])
+
+    def test_replay_costs_limit_and_stop_orders(self):
+        main(["--replay", self.tick_path, "--order-types", "market,limit,stop", "--output", self.output_path])
+        rows = self.read_rows()
+        self.assertEqual(len(rows), 3 * 3)
+        market, stop = (float(row["slippage"]) for row in rows[-3:] if row["order_type"] != "limit")
+        # Triggered at the second ask level, 0.5 above the touch
+        self.assertAlmostEqual(stop, market + 0.5 / 101.75)
+
+    @unittest.skipUnless(os.path.basename(PACKAGE_DIR) == "trade_simulator",
+                         "package directory must be named trade_simulator")
+    def test_does_not_import_gui_modules(self):
+        code = ("import sys, trade_simulator.cli; "
+                "print(any(m in sys.modules for m in ('tkinter', 'matplotlib')))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(PACKAGE_DIR),
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import time
+import unittest
+from models.compute_worker import ComputeWorker
+from models.orderbook import OrderBook
+from models.trading_models import TradingModels
+from utils.latency_trace import TickTrace
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+class TestComputeWorker(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook.from_snapshot({
+            "asks": [["100.0", "1.0"], ["101.0", "2.0"]],
+            "bids": [["99.0", "1.0"], ["98.0", "2.0"]]
+        })
+        self.params = {"exchange": "OKX", "order_type": "market", "quantity": 1.0,
+                       "volatility": 0.02, "fee_tier": "VIP0"}
+        self.worker = ComputeWorker(TradingModels(), max_queue=2)
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def test_publishes_snapshot(self):
+        self.worker.set_parameters(self.params)
+        self.worker.start()
+        self.worker.submit(self.book)
+        self.assertTrue(wait_for(lambda: self.worker.latest is not None))
+        snapshot = self.worker.latest
+        self.assertIs(snapshot.orderbook, self.book)
+        self.assertEqual(snapshot.price, 99.5)
+        with self.assertRaises(TypeError):
+            snapshot.params["quantity"] = 2.0
+
+    def test_parameter_change_recomputes_last_book(self):
+        self.worker.set_parameters(self.params)
+        self.worker.start()
+        self.worker.submit(self.book)
+        self.assertTrue(wait_for(lambda: self.worker.latest is not None))
+        self.worker.set_parameters(dict(self.params, quantity=2.0))
+        self.assertTrue(wait_for(lambda: self.worker.latest.params["quantity"] == 2.0))
+
+    def test_trace_is_stamped_and_not_reused(self):
+        trace = TickTrace(1)
+        self.worker.set_parameters(self.params)
+        self.worker.start()
+        self.worker.submit(self.book, 1, trace)
+        self.assertTrue(wait_for(lambda: self.worker.latest is not None))
+        self.assertIs(self.worker.latest.trace, trace)
+        self.assertLessEqual(trace.receive_ns, trace.compute_start_ns)
+        self.assertLessEqual(trace.compute_start_ns, trace.compute_done_ns)
+        # A re-evaluation on new parameters is not a tick
+        self.worker.set_parameters(dict(self.params, quantity=2.0))
+        self.assertTrue(wait_for(lambda: self.worker.latest.params["quantity"] == 2.0))
+        self.assertIsNone(self.worker.latest.trace)
+
+    def test_full_queue_drops_oldest(self):
+        for _ in range(5):
+            self.worker.submit(self.book)
+        self.assertEqual(self.worker.queue_depth, 2)
+        self.assertEqual(self.worker.dropped_books, 3)
+
+    def test_dropped_books_are_still_observed(self):
+        observed = []
+        self.worker.models.observe = observed.append
+        books = [OrderBook([100.0 + i], [1.0], [99.0], [1.0]) for i in range(5)]
+        for book in books:
+            self.worker.submit(book)
+        self.worker.start()
+        self.assertTrue(wait_for(lambda: len(observed) == 5))
+        self.assertEqual(observed, books)
+
+    def test_dropped_recompute_is_not_counted(self):
+        self.worker.set_parameters(self.params)
+        self.worker.submit(self.book)
+        self.worker.start()
+        self.assertTrue(wait_for(lambda: self.worker.latest is not None))
+        self.worker.stop()
+        self.worker.set_parameters(dict(self.params, quantity=2.0))
+        self.worker.submit(self.book)
+        self.worker.submit(self.book)
+        self.assertEqual(self.worker.dropped_books, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import websockets
+from network.connection_supervisor import ConnectionSupervisor
+from network.decoders import JsonDecoder
+from network.websocket_client import WebSocketClient
+from storage.tick_file import TickFileReader, TickFileWriter
+
+SNAPSHOT = json.dumps({"asks": [["101.0", "1"]], "bids": [["99.0", "2"]]})
+
+class LocalServer:
+    """Sends a few snapshots per connection, then hangs up or goes silent"""
+    def __init__(self, messages=2, hang_up=True):
+        self.messages = messages
+        self.hang_up = hang_up
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(ready,), daemon=True)
+        self.thread.start()
+        ready.wait(5)
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        async def serve():
+            return await websockets.serve(self._handler, "127.0.0.1", 0)
+        self.server = self.loop.run_until_complete(serve())
+        self.uri = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        ready.set()
+        self.loop.run_forever()
+
+    async def _handler(self, websocket, path=None):
+        self.connections += 1
+        for _ in range(self.messages):
+            await websocket.send(SNAPSHOT)
+        if not self.hang_up:
+            await websocket.wait_closed()
+
+    def close(self):
+        async def shutdown():
+            self.server.close()
+            await self.server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+class TestConnectionSupervisor(unittest.TestCase):
+    def test_backoff_grows_with_jitter_and_cap(self):
+        supervisor = ConnectionSupervisor("ws://unused", None, initial_delay=1.0, max_delay=8.0, jitter=0.5)
+        for failures, ceiling in ((0, 1.0), (1, 2.0), (2, 4.0), (3, 8.0), (10, 8.0)):
+            supervisor.failures = failures
+            delays = [supervisor.next_delay() for _ in range(200)]
+            self.assertTrue(all(ceiling / 2 <= delay <= ceiling for delay in delays))
+            self.assertGreater(max(delays) - min(delays), 0)
+
+    def test_reconnects_and_measures_downtime(self):
+        server = LocalServer(messages=2, hang_up=True)
+        client = WebSocketClient(server.uri, lambda data: None, decoder=JsonDecoder(),
+                                 initial_delay=0.05, jitter=0.0)
+        client.start()
+        try:
+            self.assertTrue(wait_for(lambda: client.connection_stats["reconnects"] >= 2
+                                     and client.connection_stats["last_recovery_time"] is not None))
+            stats = client.connection_stats
+            self.assertGreaterEqual(stats["last_recovery_time"], 0.05)
+            self.assertGreaterEqual(stats["total_downtime"], stats["last_recovery_time"])
+            self.assertGreaterEqual(stats["messages"], 4)
+        finally:
+            client.stop()
+            server.close()
+
+    def test_stale_feed_is_dropped(self):
+        server = LocalServer(messages=1, hang_up=False)
+        client = WebSocketClient(server.uri, lambda data: None, decoder=JsonDecoder(),
+                                 stale_timeout=0.1, initial_delay=0.01)
+        client.start()
+        try:
+            self.assertTrue(wait_for(lambda: client.connection_stats["stale_disconnects"] >= 1
+                                     and server.connections >= 2))
+        finally:
+            client.stop()
+            server.close()
+
+    def test_forced_reconnect_skips_backoff(self):
+        server = LocalServer(messages=1, hang_up=False)
+        client = WebSocketClient(server.uri, lambda data: None, decoder=JsonDecoder(), initial_delay=60.0)
+        client.start()
+        try:
+            self.assertTrue(wait_for(lambda: client.connected and client.connection_stats["messages"] == 1))
+            client.request_resync("test")
+            self.assertTrue(wait_for(lambda: client.connection_stats["messages"] == 2))
+            self.assertEqual(client.connection_stats["forced_reconnects"], 1)
+        finally:
+            client.stop()
+            server.close()
+
+    def test_stop_from_another_thread_while_connected(self):
+        server = LocalServer(messages=3, hang_up=False)
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "ticks.bin")
+        received = []
+        client = WebSocketClient(server.uri, received.append, decoder=JsonDecoder(),
+                                 recorder=TickFileWriter(path))
+        client.start()
+        try:
+            self.assertTrue(wait_for(lambda: len(received) == 3))
+            started = time.monotonic()
+            client.stop()
+            self.assertLess(time.monotonic() - started, 1.0)
+            self.assertFalse(client.connection_thread.is_alive())
+            self.assertFalse(client.connected)
+            self.assertEqual(len(list(TickFileReader(path))), 3)
+        finally:
+            server.close()
+            shutil.rmtree(directory)
+
+    def test_stop_during_backoff(self):
+        client = WebSocketClient("ws://127.0.0.1:9", lambda data: None, decoder=JsonDecoder(),
+                                 initial_delay=30.0)
+        client.start()
+        self.assertTrue(wait_for(lambda: client.connection_stats["failures"] >= 1))
+        started = time.monotonic()
+        client.stop()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertFalse(client.connection_thread.is_alive())
+        self.assertIsNotNone(client.connection_stats["last_error"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from models.cost_cache import CostCache
+from models.orderbook import OrderBook
+from models.trading_models import TradingModels
+from utils.performance_monitor import PerformanceMonitor
+
+PARAMS = {"exchange": "OKX", "order_type": "market", "quantity": 1.5,
+          "volatility": 0.02, "fee_tier": "VIP0"}
+
+def make_book(shift=0.0):
+    return OrderBook([101.0 + shift, 102.0 + shift], [1.0, 1.0], [99.0 + shift, 98.0 + shift], [1.0, 1.0])
+
+class TestCostCache(unittest.TestCase):
+    def test_hit_after_put(self):
+        cache = CostCache()
+        book = make_book()
+        self.assertIsNone(cache.get(book, 1, PARAMS))
+        cache.put(book, 1, PARAMS, {"net_cost": 1.0})
+        self.assertEqual(cache.get(book, 1, PARAMS), {"net_cost": 1.0})
+        self.assertIsNone(cache.get(book, 1, dict(PARAMS, side="sell")))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 1 / 3)
+
+    def test_returns_copies(self):
+        cache = CostCache()
+        book = make_book()
+        cache.put(book, 1, PARAMS, {"net_cost": 1.0})
+        cache.get(book, 1, PARAMS)["net_cost"] = 2.0
+        self.assertEqual(cache.get(book, 1, PARAMS), {"net_cost": 1.0})
+
+    def test_new_version_invalidates(self):
+        cache = CostCache()
+        book = make_book()
+        cache.put(book, 1, PARAMS, {"net_cost": 1.0})
+        self.assertIsNone(cache.get(book, 2, PARAMS))
+        self.assertEqual(cache.invalidations, 1)
+        self.assertEqual(cache.stats["size"], 0)
+        # A different book under the same sequence (e.g. another symbol) never hits
+        cache.put(book, 2, PARAMS, {"net_cost": 1.0})
+        self.assertIsNone(cache.get(make_book(), 2, PARAMS))
+
+    def test_lru_eviction(self):
+        cache = CostCache(max_size=2)
+        book = make_book()
+        for quantity in (1.0, 2.0):
+            cache.put(book, 1, dict(PARAMS, quantity=quantity), {"quantity": quantity})
+        cache.get(book, 1, dict(PARAMS, quantity=1.0))
+        cache.put(book, 1, dict(PARAMS, quantity=3.0), {"quantity": 3.0})
+        self.assertIsNone(cache.get(book, 1, dict(PARAMS, quantity=2.0)))
+        self.assertIsNotNone(cache.get(book, 1, dict(PARAMS, quantity=1.0)))
+        self.assertEqual(cache.evictions, 1)
+
+class TestTradingModelsCache(unittest.TestCase):
+    def test_versioned_calls_are_memoized(self):
+        monitor = PerformanceMonitor()
+        models = TradingModels(monitor=monitor)
+        book = make_book()
+        first = models.estimate_costs(book, PARAMS, version=1)
+        self.assertEqual(models.estimate_costs(book, PARAMS, version=1), first)
+        self.assertEqual(first, models.estimate_costs(book, PARAMS))
+        self.assertEqual(monitor.stage_stats("model.slippage")["count"], 2)
+        moved = models.estimate_costs(make_book(1.0), PARAMS, version=2)
+        self.assertNotEqual(moved["price"], first["price"])
+        counters = monitor.get_metrics()["counters"]["cost_cache"]
+        self.assertEqual((counters["hits"], counters["misses"]), (1, 2))
+        self.assertIn("cost_cache: hits=1", monitor.format_report())
+
+    def test_cache_can_be_disabled(self):
+        models = TradingModels(cache_size=0)
+        self.assertIsNone(models.cache)
+        models.estimate_costs(make_book(), PARAMS, version=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import unittest
+import numpy as np
+from network import decoders
+from network.decoders import get_decoder, available_decoders
+from models.book_builder import OrderBookBuilder
+
+FRAME = json.dumps({
+    "timestamp": "2025-05-04T10:39:13Z",
+    "exchange": "OKX",
+    "symbol": "BTC-USDT-SWAP",
+    "asks": [["95445.5", "9.06"], ["95448", "2.05"]],
+    "bids": [["95445.4", "1104.23"], ["95445.3", "0.02"]]
+})
+
+class TestDecoders(unittest.TestCase):
+    def check_frame(self, decoded):
+        self.assertEqual(decoded["symbol"], "BTC-USDT-SWAP")
+        np.testing.assert_array_equal(np.asarray(decoded["asks"], dtype=np.float64),
+                                      [[95445.5, 9.06], [95448.0, 2.05]])
+
+    def test_json_decoder(self):
+        decoded = get_decoder("json").decode(FRAME)
+        self.check_frame(decoded)
+        self.assertEqual(decoded["bids"][0][0], "95445.4")
+
+    def test_auto_decoder_is_available(self):
+        self.assertIn("json", available_decoders())
+        self.check_frame(get_decoder("auto").decode(FRAME))
+
+    def test_unknown_decoder(self):
+        with self.assertRaises(ValueError):
+            get_decoder("yaml")
+
+    def test_malformed_frame_raises_value_error(self):
+        for name in available_decoders():
+            with self.assertRaises(ValueError):
+                get_decoder(name).decode("{not json")
+
+    @unittest.skipIf(decoders.orjson is None, "orjson not installed")
+    def test_orjson_decoder(self):
+        self.check_frame(get_decoder("orjson").decode(FRAME.encode()))
+
+    @unittest.skipIf(decoders.msgspec is None, "msgspec not installed")
+    def test_msgspec_decoder_produces_float_arrays(self):
+        decoded = get_decoder("msgspec").decode(FRAME)
+        self.check_frame(decoded)
+        self.assertIsInstance(decoded["bids"], np.ndarray)
+        self.assertEqual(decoded["bids"].dtype, np.float64)
+        self.assertNotIn("seqId", decoded)
+
+    @unittest.skipIf(decoders.msgspec is None, "msgspec not installed")
+    def test_typed_frames_build_books(self):
+        builder = OrderBookBuilder()
+        self.assertTrue(builder.apply(get_decoder("msgspec").decode(FRAME)))
+        self.assertEqual(builder.orderbook.best_bid, 95445.4)
+        np.testing.assert_array_equal(builder.orderbook.ask_sizes, [9.06, 2.05])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from models.orderbook import OrderBook
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from ui.depth_chart import DepthChart
+except ImportError:
+    matplotlib = None
+
+def make_book(shift=0.0, ask_sizes=(1.0, 2.0, 3.0), bid_sizes=(1.5, 2.5, 3.5)):
+    return OrderBook(np.array([101.0, 102.0, 103.0]) + shift, ask_sizes,
+                     np.array([99.0, 98.0, 97.0]) + shift, bid_sizes)
+
+@unittest.skipIf(matplotlib is None, "matplotlib is not installed")
+class TestDepthChart(unittest.TestCase):
+    def setUp(self):
+        fig = Figure(figsize=(5, 3), dpi=80)
+        FigureCanvasAgg(fig)
+        self.ax = fig.add_subplot()
+        self.chart = DepthChart(self.ax, levels=3)
+        fig.canvas.draw()
+
+    def test_unchanged_book_is_skipped(self):
+        self.assertTrue(self.chart.update(make_book()))
+        self.assertFalse(self.chart.update(make_book()))
+        self.assertTrue(self.chart.update(make_book(ask_sizes=(1.0, 2.0, 4.0))))
+        self.assertEqual(self.chart.frames, 2)
+        self.assertEqual(self.chart.skipped_frames, 1)
+
+    def test_full_draw_only_when_limits_change(self):
+        self.chart.update(make_book())
+        self.assertEqual(self.chart.full_draws, 1)
+        self.chart.update(make_book(ask_sizes=(1.1, 2.0, 3.0)))
+        self.assertEqual(self.chart.full_draws, 1)
+        self.chart.update(make_book(shift=50.0))
+        self.assertEqual(self.chart.full_draws, 2)
+
+    def test_bars_move_in_place(self):
+        bars = list(self.chart.ask_bars)
+        self.chart.update(make_book())
+        self.assertEqual(list(self.chart.ask_bars), bars)
+        self.assertEqual([rect.get_height() for rect in bars], [1.0, 2.0, 3.0])
+        centers = [rect.get_x() + rect.get_width() / 2 for rect in bars]
+        np.testing.assert_allclose(centers, [101.0, 102.0, 103.0])
+
+    def test_depth_mode_plots_cumulative_sizes(self):
+        self.chart.update(make_book())
+        self.chart.set_mode("depth")
+        np.testing.assert_allclose(self.chart.bid_line.get_ydata(), [1.5, 4.0, 7.5])
+        np.testing.assert_allclose(self.chart.ask_line.get_xdata(), [101.0, 102.0, 103.0])
+        self.assertFalse(self.chart.ask_bars[0].get_visible())
+        with self.assertRaises(ValueError):
+            self.chart.set_mode("heatmap")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from models.execution_simulator import ExecutionSimulator, BookSeries, book_series
+from models.orderbook import OrderBook
+
+def flat_books(count, step=1.0, levels=5):
+    """Identical books one second apart: asks 101, 102, ... and bids 99, 98, ... with size 1"""
+    book = OrderBook(101.0 + np.arange(levels), np.ones(levels), 99.0 - np.arange(levels), np.ones(levels))
+    return book_series([book] * count, 1000.0 + np.arange(count) * step)
+
+class TestExecutionSimulator(unittest.TestCase):
+    def test_twap_with_instant_refill(self):
+        simulator = ExecutionSimulator(refill_time=0)
+        result = simulator.run(flat_books(60), 5.0, policy="twap", horizon=50.0, slices=5)
+        np.testing.assert_allclose(result.slices["target"], 1.0)
+        np.testing.assert_allclose(result.slices["vwap"], 101.0)
+        np.testing.assert_allclose(result.slices["impact"], 0.0)
+        self.assertEqual(result.filled, 5.0)
+        self.assertAlmostEqual(result.shortfall, 5.0)
+        self.assertAlmostEqual(result.slices["slippage"][0], 0.01)
+        np.testing.assert_array_equal(result.slices["row"], [0, 10, 20, 30, 40])
+
+    def test_depletion_without_refill(self):
+        simulator = ExecutionSimulator(refill_time=None)
+        result = simulator.run(flat_books(60), 3.0, policy="twap", horizon=30.0, slices=3)
+        # Each child starts where the previous one left the book
+        np.testing.assert_allclose(result.slices["depletion"], [0.0, 1.0, 2.0])
+        np.testing.assert_allclose(result.slices["vwap"], [101.0, 102.0, 103.0])
+        np.testing.assert_allclose(result.slices["impact"], [0.0, 1.0, 2.0])
+        self.assertAlmostEqual(result.average_price, 102.0)
+
+    def test_partial_refill(self):
+        simulator = ExecutionSimulator(refill_time=10.0)
+        result = simulator.run(flat_books(60), 2.0, side="sell", horizon=20.0, slices=2)
+        self.assertAlmostEqual(result.slices["depletion"][1], np.exp(-1.0))
+        self.assertGreater(result.slices["impact"][1], 0.0)
+        self.assertLess(result.slices["vwap"][1], 99.0)
+
+    def test_unfilled_size_carries_over(self):
+        simulator = ExecutionSimulator(refill_time=0)
+        result = simulator.run(flat_books(10, levels=2), 6.0, horizon=4.0, slices=2)
+        np.testing.assert_allclose(result.slices["filled"], [2.0, 2.0])
+        self.assertEqual(result.filled, 4.0)
+
+    def test_vwap_follows_volume_profile(self):
+        count = 40
+        ask_sizes = np.ones((count, 3))
+        # Size is taken from the best ask only in the second half
+        ask_sizes[20::2, 0] = 0.5
+        books = BookSeries(np.arange(count, dtype=np.float64),
+                           np.tile([101.0, 102.0, 103.0], (count, 1)), ask_sizes,
+                           np.tile([99.0, 98.0, 97.0], (count, 1)), np.ones((count, 3)))
+        times, sizes = ExecutionSimulator().schedule(books, 10.0, "vwap", horizon=40.0, slices=2)
+        np.testing.assert_allclose(times, [0.0, 20.0])
+        np.testing.assert_allclose(sizes, [0.0, 10.0])
+
+    def test_ac_front_loads(self):
+        simulator = ExecutionSimulator(refill_time=0)
+        result = simulator.run(flat_books(100), 3.0, policy="ac", horizon=90.0, slices=6, risk_aversion=1.0)
+        targets = result.slices["target"]
+        self.assertAlmostEqual(targets.sum(), 3.0)
+        self.assertTrue(np.all(np.diff(targets) < 0))
+
+    def test_custom_weights(self):
+        times, sizes = ExecutionSimulator().schedule(flat_books(10), 4.0, [1, 0, 3], horizon=9.0, slices=3)
+        np.testing.assert_allclose(sizes, [1.0, 0.0, 3.0])
+        with self.assertRaises(ValueError):
+            ExecutionSimulator().schedule(flat_books(10), 4.0, [1, 3], slices=3)
+
+if __name__ == '__main__':
+    unittest.main()
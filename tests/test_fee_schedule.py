@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from models.fee_schedule import DEFAULT_FEE_RATES, FeeSchedule, default_fee_schedule
+
+class TestFeeSchedule(unittest.TestCase):
+    def setUp(self):
+        self.schedule = FeeSchedule({"OKX": {"VIP0": (0.0008, 0.001), "VIP1": (0.0007, 0.0009)},
+                                     "Binance": {"VIP0": (0.001, 0.001)}})
+
+    def test_bundled_config_has_several_exchanges(self):
+        schedule = default_fee_schedule()
+        self.assertIs(schedule, default_fee_schedule())
+        self.assertTrue({"okx", "binance", "bybit"} <= set(schedule.exchanges))
+        self.assertEqual(schedule.rates("OKX", "VIP0"), (0.0008, 0.001))
+        self.assertIn("VIP5", schedule.tiers("okx"))
+
+    def test_resolution_is_case_insensitive_and_cached(self):
+        row = self.schedule.resolve("OKX", "VIP1")
+        self.assertEqual(self.schedule.resolve("okx", "VIP1"), row)
+        self.assertEqual(self.schedule.rates("Okx", "VIP1"), (0.0007, 0.0009))
+        self.assertIn(("OKX", "VIP1"), self.schedule._resolved)
+
+    def test_unknown_pairs_use_default_rates(self):
+        self.assertEqual(self.schedule.rates("Kraken", "VIP0"), DEFAULT_FEE_RATES)
+        self.assertEqual(self.schedule.rates("OKX", "VIP9"), DEFAULT_FEE_RATES)
+
+    def test_vectorized_fees_match_scalar(self):
+        notional = np.array([100.0, 2500.0, 1e6])
+        proportion = np.array([0.0, 0.4, 1.0])
+        fees = self.schedule.fees("OKX", "VIP1", notional, proportion)
+        expected = [n * (0.0007 * p + 0.0009 * (1 - p)) for n, p in zip(notional, proportion)]
+        np.testing.assert_allclose(fees, expected)
+        self.assertAlmostEqual(self.schedule.fees("OKX", "VIP1", 100.0, 0.4), 100.0 * 0.00082)
+
+    def test_fees_by_tier(self):
+        notional = np.linspace(100.0, 1000.0, 4)
+        fees = self.schedule.fees_by_tier("OKX", ["VIP0", "VIP1", "VIP9"], notional, 0.25)
+        self.assertEqual(fees.shape, (3, 4))
+        for row, tier in zip(fees, ["VIP0", "VIP1", "VIP9"]):
+            np.testing.assert_allclose(row, self.schedule.fees("OKX", tier, notional, 0.25))
+
+    def test_load_config_file(self):
+        config = {"default_rates": [0.002, 0.003], "exchanges": {"Kraken": {"Tier1": [0.0016, 0.0026]}}}
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(config, f)
+        try:
+            schedule = FeeSchedule.load(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(schedule.rates("kraken", "Tier1"), (0.0016, 0.0026))
+        self.assertEqual(schedule.rates("OKX", "VIP0"), (0.002, 0.003))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import websockets
+from network.decoders import JsonDecoder
+from network.feed_manager import FeedManager
+from storage.tick_file import TickFileReader, TickFileWriter
+
+PRICES = {"BTC-USDT": 100.0, "ETH-USDT": 10.0}
+
+class LocalFeedServer:
+    """Serves snapshots for the symbol in the request path, then optionally hangs up"""
+    def __init__(self, messages=3, close_after=False):
+        self.messages = messages
+        self.close_after = close_after
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ready.wait(5)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        async def serve():
+            return await websockets.serve(self._handler, "127.0.0.1", 0)
+        self.server = self.loop.run_until_complete(serve())
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def _handler(self, websocket, path=None):
+        self.connections += 1
+        symbol = (path or websocket.request.path).strip("/")
+        price = PRICES[symbol]
+        for i in range(self.messages):
+            await websocket.send(json.dumps({
+                "symbol": symbol,
+                "asks": [[str(price + 1 + i), "1"]],
+                "bids": [[str(price - 1), "2"]],
+            }))
+        if not self.close_after:
+            await websocket.wait_closed()
+
+    def close(self):
+        async def shutdown():
+            self.server.close()
+            await self.server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+class TestFeedManager(unittest.TestCase):
+    def make_manager(self, server, **kwargs):
+        return FeedManager(f"ws://127.0.0.1:{server.port}/{{symbol}}", decoder=JsonDecoder(), **kwargs)
+
+    def test_symbols_share_one_loop_thread(self):
+        server = LocalFeedServer()
+        received = []
+        manager = self.make_manager(server, on_book=lambda symbol, book, seq: received.append(
+            (symbol, threading.current_thread().name)))
+        manager.add_symbol("BTC-USDT")
+        manager.add_symbol("ETH-USDT")
+        threads_before = threading.active_count()
+        manager.start()
+        try:
+            self.assertTrue(wait_for(lambda: len(received) == 6))
+            self.assertEqual(threading.active_count(), threads_before + 1)
+            self.assertEqual({name for _, name in received}, {"FeedManager"})
+            updates = manager.take()
+            self.assertEqual(set(updates), {"BTC-USDT", "ETH-USDT"})
+            self.assertEqual(updates["BTC-USDT"].value.best_ask, 103.0)
+            self.assertEqual(updates["ETH-USDT"].value.best_ask, 13.0)
+            self.assertEqual(updates["ETH-USDT"].conflated, 2)
+            self.assertEqual(manager.take(), {})
+            self.assertEqual(manager.latest("BTC-USDT").best_bid, 99.0)
+        finally:
+            manager.stop()
+            server.close()
+        self.assertFalse(manager.thread.is_alive())
+        self.assertFalse(manager.stats()["BTC-USDT"]["connected"])
+
+    def test_symbol_added_while_running(self):
+        server = LocalFeedServer()
+        manager = self.make_manager(server)
+        manager.start()
+        try:
+            manager.add_symbol("ETH-USDT")
+            self.assertTrue(wait_for(lambda: manager.latest("ETH-USDT") is not None))
+            manager.remove_symbol("ETH-USDT")
+            self.assertEqual(manager.symbols, [])
+        finally:
+            manager.stop()
+            server.close()
+
+    def test_restart_after_stop(self):
+        server = LocalFeedServer()
+        manager = self.make_manager(server)
+        feed = manager.add_symbol("BTC-USDT")
+        try:
+            manager.start()
+            self.assertTrue(wait_for(lambda: feed.messages >= 3))
+            manager.stop()
+            manager.start()
+            self.assertTrue(wait_for(lambda: feed.messages >= 6))
+            self.assertEqual(server.connections, 2)
+        finally:
+            manager.stop()
+            server.close()
+
+    def test_records_decoded_messages(self):
+        server = LocalFeedServer()
+        manager = self.make_manager(server)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "btc.ticks")
+            recorder = TickFileWriter(path, {"symbol": "BTC-USDT"})
+            feed = manager.add_symbol("BTC-USDT", recorder=recorder)
+            manager.start()
+            try:
+                self.assertTrue(wait_for(lambda: feed.messages >= 3))
+            finally:
+                manager.stop()
+                server.close()
+            # Stopping flushes the recording
+            messages = list(TickFileReader(path))
+            recorder.close()
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(messages[-1]["asks"][0, 0], 103.0)
+
+    def test_reconnects_after_disconnect(self):
+        server = LocalFeedServer(messages=1, close_after=True)
+        manager = self.make_manager(server, initial_delay=0.01)
+        feed = manager.add_symbol("BTC-USDT")
+        manager.start()
+        try:
+            self.assertTrue(wait_for(lambda: feed.reconnects >= 2 and feed.messages >= 3))
+            self.assertGreaterEqual(server.connections, 3)
+        finally:
+            manager.stop()
+            server.close()
+
+if __name__ == '__main__':
+    unittest.main()
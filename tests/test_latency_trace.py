@@ -0,0 +1,77 @@
+import csv
+import os
+import tempfile
+import unittest
+from utils.latency_trace import LatencyTracer, TickTrace, TRACE_COLUMNS
+from utils.performance_monitor import PerformanceMonitor
+
+class TestTickTrace(unittest.TestCase):
+    def test_latencies_add_up(self):
+        trace = TickTrace(7, exchange_time=1000.0, receive_time=1000.050, receive_ns=0)
+        trace.compute_start_ns = 2_000_000
+        trace.compute_done_ns = 3_000_000
+        trace.render_ns = 10_000_000
+        latencies = trace.latencies()
+        self.assertAlmostEqual(latencies["network"], 0.050)
+        self.assertAlmostEqual(latencies["queue"], 0.002)
+        self.assertAlmostEqual(latencies["compute"], 0.001)
+        self.assertAlmostEqual(latencies["render"], 0.007)
+        self.assertAlmostEqual(latencies["internal"], 0.010)
+        self.assertAlmostEqual(latencies["total"], latencies["network"] + latencies["queue"]
+                               + latencies["compute"] + latencies["render"])
+        self.assertTrue(trace.is_complete)
+
+    def test_missing_stamps(self):
+        trace = TickTrace(receive_ns=0)
+        latencies = trace.latencies()
+        self.assertIsNone(latencies["network"])
+        self.assertIsNone(latencies["compute"])
+        self.assertIsNone(latencies["total"])
+        self.assertFalse(trace.is_complete)
+
+class TestLatencyTracer(unittest.TestCase):
+    def setUp(self):
+        self.monitor = PerformanceMonitor()
+        self.tracer = LatencyTracer(self.monitor)
+
+    def complete_trace(self, sequence):
+        trace = self.tracer.begin(sequence, "2025-05-04T10:39:13Z", receive_time=1746355153.025,
+                                  receive_ns=0)
+        trace.compute_start_ns = 1_000_000
+        trace.compute_done_ns = 1_500_000
+        self.tracer.complete(trace, render_ns=5_000_000)
+        return trace
+
+    def test_begin_parses_exchange_timestamp(self):
+        trace = self.tracer.begin(1, "2025-05-04T10:39:13Z", receive_time=1746355153.025)
+        self.assertEqual(trace.exchange_time, 1746355153.0)
+        self.assertAlmostEqual(self.monitor.network_latencies[-1], 0.025, places=6)
+        self.assertIsNone(self.tracer.begin(2, None).exchange_time)
+
+    def test_complete_records_latency_spans(self):
+        for sequence in range(3):
+            self.complete_trace(sequence)
+        summary = self.tracer.summary()
+        self.assertEqual(set(summary), {"network", "queue", "compute", "render", "internal", "total"})
+        self.assertEqual(summary["compute"]["count"], 3)
+        self.assertAlmostEqual(summary["render"]["p50_us"], 3500.0)
+        self.assertAlmostEqual(summary["network"]["p50_us"], 25000.0, places=0)
+        self.assertEqual(self.tracer.completed, 3)
+
+    def test_export_csv(self):
+        for sequence in range(4):
+            self.complete_trace(sequence)
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            self.assertEqual(self.tracer.export_csv(path), 4)
+            with open(path, newline="") as f:
+                rows = list(csv.reader(f))
+        finally:
+            os.remove(path)
+        self.assertEqual(tuple(rows[0]), TRACE_COLUMNS)
+        self.assertEqual([row[0] for row in rows[1:]], ["0", "1", "2", "3"])
+        self.assertAlmostEqual(float(rows[1][TRACE_COLUMNS.index("internal_ms")]), 5.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import numpy as np
+from models.limit_orders import LevelDepletionTracker, LimitOrderModel
+from models.orderbook import OrderBook
+from models.scenario_runner import _BookRows, pack_books
+from models.trading_models import TradingModels
+
+PARAMS = {"exchange": "OKX", "quantity": 1.0, "volatility": 0.02, "fee_tier": "VIP0"}
+
+def make_book(bid_size=4.0):
+    return OrderBook([101.0, 102.0, 103.0], [4.0, 4.0, 4.0], [99.0, 98.0, 97.0], [bid_size, 4.0, 4.0])
+
+def feed(model, books=40, taken=1.0):
+    """Books one second apart in which `taken` is removed from the best bid every other second"""
+    for i in range(books):
+        model.observe(make_book(4.0 - taken * (i % 2)), timestamp=1000.0 + i)
+
+class TestLevelDepletionTracker(unittest.TestCase):
+    def test_depletion_per_level(self):
+        tracker = LevelDepletionTracker(levels=3, halflife=1e9)
+        tracker.update(make_book(), 0.0)
+        tracker.update(make_book(3.0), 1.0)
+        rate, variance = tracker.rates("bids")
+        np.testing.assert_allclose(rate, [1.0, 0.0, 0.0])
+        np.testing.assert_allclose(variance, [1.0, 0.0, 0.0])
+        np.testing.assert_allclose(tracker.rates("asks")[0], 0.0)
+
+    def test_traded_through_level_is_fully_depleted(self):
+        tracker = LevelDepletionTracker(levels=3)
+        tracker.update(make_book(), 0.0)
+        tracker.update(OrderBook([101.0], [4.0], [98.0, 97.0], [4.0, 4.0]), 2.0)
+        rate, _ = tracker.rates("bids")
+        np.testing.assert_allclose(rate, [2.0, 0.0, 0.0])
+        # Ask levels beyond the new book's depth count as removed
+        np.testing.assert_allclose(tracker.rates("asks")[0], [0.0, 2.0, 2.0])
+
+class TestLimitOrderModel(unittest.TestCase):
+    def setUp(self):
+        self.model = LimitOrderModel(halflife=5, horizon=60.0)
+        feed(self.model, books=201)
+
+    def test_queue_at_touch(self):
+        estimate = self.model.queue_estimate(make_book(), 2.0, side="buy")
+        self.assertEqual((estimate.price, estimate.level, estimate.volume_ahead), (99.0, 0, 4.0))
+        # 0.5 per second depleted from the best bid: 6 units take 12 seconds
+        self.assertAlmostEqual(estimate.expected_time, 12.0, delta=1.5)
+        self.assertGreater(estimate.fill_probability, 0.99)
+        short = self.model.queue_estimate(make_book(), 2.0, side="buy", horizon=6.0)
+        self.assertLess(short.fill_probability, 0.5)
+
+    def test_deeper_and_improving_prices(self):
+        deep = self.model.queue_estimate(make_book(), 1.0, 98.0, "buy")
+        self.assertEqual((deep.level, deep.volume_ahead), (1, 8.0))
+        inside = self.model.queue_estimate(make_book(), 1.0, 99.5, "buy")
+        self.assertEqual((inside.level, inside.volume_ahead), (0, 0.0))
+        self.assertLess(inside.expected_time, deep.expected_time)
+
+    def test_marketable_and_unfilled(self):
+        self.assertEqual(self.model.queue_estimate(make_book(), 1.0, 101.0, "buy").fill_probability, 1.0)
+        # No ask depletion observed: a resting sell never fills
+        estimate = self.model.queue_estimate(make_book(), 1.0, side="sell")
+        self.assertEqual(estimate.fill_probability, 0.0)
+        self.assertEqual(estimate.expected_time, float("inf"))
+
+class TestTradingModelsLimitOrders(unittest.TestCase):
+    def setUp(self):
+        self.limit_orders = LimitOrderModel()
+        self.models = TradingModels(limit_orders=self.limit_orders)
+        self.book = make_book()
+
+    def test_limit_costs_before_and_after_warmup(self):
+        params = dict(PARAMS, order_type="limit")
+        self.assertEqual(self.models.estimate_costs(self.book, params)["slippage"], 0.0)
+        feed(self.models.limit_orders)
+        costs = self.models.estimate_costs(self.book, params)
+        estimate = self.limit_orders.queue_estimate(self.book, 1.0)
+        self.assertAlmostEqual(costs["maker_proportion"], estimate.fill_probability)
+        market = self.models.calculate_slippage(self.book, 1.0)
+        expected = estimate.fill_probability * -0.01 + (1 - estimate.fill_probability) * market
+        self.assertAlmostEqual(costs["slippage"], expected)
+        self.assertLess(costs["slippage"], 0.0)
+
+    def test_marketable_limit_walks_the_book(self):
+        slippage = self.models.calculate_slippage(self.book, 6.0, "limit", "buy", 102.0)
+        self.assertAlmostEqual(slippage, self.models.calculate_slippage(self.book, 6.0))
+
+    def test_stop_costs(self):
+        costs = self.models.estimate_costs(self.book, dict(PARAMS, order_type="stop"))
+        # Triggered at the 102 ask level, then walks the book as a market order
+        self.assertAlmostEqual(costs["slippage"], 0.01 + 1.0 / 100.0)
+        self.assertEqual(costs["maker_proportion"], 0.0)
+        stop = self.models.estimate_costs(self.book, dict(PARAMS, order_type="stop", limit_price=103.0))
+        self.assertAlmostEqual(stop["slippage"], 0.01 + 2.0 / 100.0)
+
+    def test_batch_matches_single_orders(self):
+        feed(self.models.limit_orders)
+        quantities = [1.0, 6.0]
+        for order_type, price in (("limit", None), ("limit", 98.0), ("limit", 102.0), ("stop", None)):
+            batch = self.models.evaluate_batch(self.book, quantities, order_type, price=price)
+            for side in ("buy", "sell"):
+                for row, quantity in zip(batch[side], quantities):
+                    params = dict(PARAMS, order_type=order_type, side=side, quantity=quantity, limit_price=price)
+                    costs = self.models.estimate_costs(self.book, params)
+                    for name in ("slippage", "fees", "maker_proportion", "net_cost"):
+                        self.assertAlmostEqual(row[name], costs[name], msg=(order_type, price, side, name))
+        # Larger resting orders are less likely to fill
+        limit = self.models.evaluate_batch(self.book, quantities, "limit", sides=("buy",))["buy"]
+        self.assertGreater(limit["maker_proportion"][0], limit["maker_proportion"][1])
+
+    def test_matrix_stops_and_limits(self):
+        books = pack_books([self.book, make_book(2.0)])
+        rows = TradingModels().evaluate_matrix(_BookRows(*books), [1.0, 6.0], "sell", "stop")
+        for row, book in zip(rows, (self.book, make_book(2.0))):
+            expected = self.models.evaluate_batch(book, [1.0, 6.0], "stop", sides=("sell",))["sell"]
+            np.testing.assert_allclose(row["slippage"], expected["slippage"])
+            np.testing.assert_array_equal(row["maker_proportion"], 0.0)
+        with self.assertRaises(ValueError):
+            self.models.evaluate_matrix(_BookRows(*books), [1.0], "buy", "limit")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import threading
+import unittest
+from utils.mailbox import ConflatingMailbox
+
+class TestConflatingMailbox(unittest.TestCase):
+    def test_take_returns_newest_once(self):
+        mailbox = ConflatingMailbox()
+        self.assertIsNone(mailbox.take())
+        self.assertEqual(mailbox.put("a"), 1)
+        item = mailbox.take()
+        self.assertEqual((item.sequence, item.value, item.conflated), (1, "a", 0))
+        self.assertIsNone(mailbox.take())
+
+    def test_counts_conflated_values(self):
+        mailbox = ConflatingMailbox()
+        for value in range(5):
+            mailbox.put(value)
+        item = mailbox.take()
+        self.assertEqual(item.value, 4)
+        self.assertEqual(item.conflated, 4)
+        mailbox.put(5)
+        mailbox.put(6)
+        self.assertEqual(mailbox.take().conflated, 1)
+        self.assertEqual(mailbox.total_conflated, 5)
+
+    def test_peek_does_not_consume(self):
+        mailbox = ConflatingMailbox()
+        mailbox.put("a")
+        self.assertEqual(mailbox.peek().value, "a")
+        self.assertEqual(mailbox.take().value, "a")
+
+    def test_concurrent_producer_accounting(self):
+        mailbox = ConflatingMailbox()
+        puts = 20000
+        producer = threading.Thread(target=lambda: [mailbox.put((i, i)) for i in range(puts)])
+        producer.start()
+        taken = 0
+        while producer.is_alive() or mailbox.sequence != taken + mailbox.total_conflated:
+            item = mailbox.take()
+            if item is not None:
+                # Values are published whole, never torn between fields
+                self.assertEqual(item.value[0], item.value[1])
+                taken += 1
+        producer.join()
+        self.assertEqual(taken + mailbox.total_conflated, puts)
+
+if __name__ == '__main__':
+    unittest.main()
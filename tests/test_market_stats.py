@@ -0,0 +1,139 @@
+import unittest
+import numpy as np
+from models.market_stats import SECONDS_PER_DAY, MarketStatistics, RingBuffer, traded_volume_proxy
+from models.execution_simulator import book_series
+from models.limit_orders import LimitOrderModel
+from models.online_models import OnlineCostModels
+from models.orderbook import OrderBook
+from models.trading_models import TradingModels
+
+def make_book(mid, bid_size=1.0, ask_size=1.0, half_spread=0.5):
+    return OrderBook([mid + half_spread], [ask_size], [mid - half_spread], [bid_size])
+
+def feed(stats, daily_volatility, count, step=1.0, seed=0):
+    """Books with a geometric random walk mid price, one every step seconds"""
+    rng = np.random.default_rng(seed)
+    sigma = daily_volatility * np.sqrt(step / SECONDS_PER_DAY)
+    mid = 100.0
+    for i in range(count):
+        stats.update(make_book(mid), timestamp=1000.0 + i * step)
+        mid *= np.exp(rng.normal(0.0, sigma))
+
+class TestRingBuffer(unittest.TestCase):
+    def test_running_sum_over_window(self):
+        buffer = RingBuffer(3)
+        for value in (1.0, 2.0, 3.0, 4.0, 5.0):
+            buffer.push(value)
+        self.assertEqual(len(buffer), 3)
+        self.assertAlmostEqual(buffer.total, 12.0)
+        np.testing.assert_array_equal(buffer.to_array(), [3.0, 4.0, 5.0])
+
+    def test_partial_buffer(self):
+        buffer = RingBuffer(4)
+        buffer.push(2.0)
+        np.testing.assert_array_equal(buffer.to_array(), [2.0])
+        self.assertEqual(buffer.total, 2.0)
+
+class TestMarketStatistics(unittest.TestCase):
+    def test_not_ready_before_min_books(self):
+        stats = MarketStatistics(min_books=20)
+        feed(stats, 0.02, 10)
+        self.assertFalse(stats.ready)
+        self.assertIsNone(stats.volatility)
+        self.assertIsNone(stats.daily_volume)
+
+    def test_volatility_estimates(self):
+        stats = MarketStatistics(window=2000, halflife=500)
+        feed(stats, 0.03, 5000)
+        self.assertAlmostEqual(stats.realized_volatility, 0.03, delta=0.003)
+        self.assertAlmostEqual(stats.ewma_volatility, 0.03, delta=0.005)
+
+    def test_shared_timestamps_add_no_time(self):
+        # Whole-second timestamps: four books per second, same daily volatility
+        stats = MarketStatistics(window=4000, halflife=1000)
+        rng = np.random.default_rng(1)
+        sigma = 0.03 * np.sqrt(0.25 / SECONDS_PER_DAY)
+        mid = 100.0
+        for i in range(8000):
+            stats.update(make_book(mid), timestamp=float(1000 + i // 4))
+            mid *= np.exp(rng.normal(0.0, sigma))
+        self.assertAlmostEqual(stats.realized_volatility, 0.03, delta=0.003)
+
+    def test_daily_volume(self):
+        stats = MarketStatistics(window=10, min_books=2)
+        for i in range(20):
+            # 0.5 taken from the best bid every second
+            stats.update(make_book(100.0, bid_size=10.0 - 0.5 * (i % 2)), timestamp=float(i))
+        self.assertAlmostEqual(stats.daily_volume, 0.25 * SECONDS_PER_DAY)
+
+class TestTradedVolumeProxy(unittest.TestCase):
+    def test_depletion_at_same_price(self):
+        self.assertEqual(traded_volume_proxy(make_book(100.0, 2.0, 3.0), make_book(100.0, 1.5, 1.0)), 2.5)
+
+    def test_traded_through(self):
+        # Mid moved down by a full spread: the previous bid level was taken
+        self.assertEqual(traded_volume_proxy(make_book(100.0, 2.0, 3.0), make_book(99.0, 1.0, 1.0)), 2.0)
+
+    def test_replenished_levels(self):
+        self.assertEqual(traded_volume_proxy(make_book(100.0), make_book(100.0, 5.0, 5.0)), 0.0)
+
+class TestTradingModelsLiveInputs(unittest.TestCase):
+    def setUp(self):
+        self.stats = MarketStatistics()
+        self.models = TradingModels(market_stats=self.stats)
+        self.params = {"exchange": "OKX", "order_type": "market", "quantity": 1.0,
+                       "volatility": 0.02, "fee_tier": "VIP0"}
+
+    def test_falls_back_to_inputs_until_ready(self):
+        book = make_book(100.0)
+        self.models.observe(book)
+        static = TradingModels().estimate_costs(book, dict(self.params, live_volatility=True))
+        live = self.models.estimate_costs(book, dict(self.params, live_volatility=True))
+        self.assertEqual(live["market_impact"], static["market_impact"])
+
+    def test_uses_live_volatility_and_volume(self):
+        feed(self.stats, 0.05, 500)
+        for i in range(10):
+            self.models.observe(make_book(100.0, bid_size=2.0 - i % 2))
+        self.assertEqual(self.models.resolve_volatility(0.02, live=True), self.stats.volatility)
+        self.assertEqual(self.models.resolve_volatility(0.02), 0.02)
+        book = make_book(100.0)
+        manual = self.models.estimate_costs(book, self.params)["market_impact"]
+        self.assertEqual(manual, TradingModels().estimate_costs(book, self.params)["market_impact"])
+        live = self.models.estimate_costs(book, dict(self.params, live_volatility=True))["market_impact"]
+        self.assertAlmostEqual(live / manual, self.stats.volatility / 0.02)
+        live_volume = self.models.estimate_costs(book, dict(self.params, live_volume=True))["market_impact"]
+        expected = self.models._market_impact(self.stats.daily_volume, 1.0, 0.02, 100.0)
+        self.assertAlmostEqual(live_volume, expected)
+
+    def test_batch_and_matrix_use_the_same_opt_in(self):
+        feed(self.stats, 0.05, 500)
+        book = make_book(100.0)
+        params = dict(self.params, live_volatility=True, live_volume=True)
+        single = self.models.estimate_costs(book, params)["market_impact"]
+        batch = self.models.evaluate_batch(book, [1.0], sides=("buy",), live_volatility=True,
+                                           live_volume=True)["buy"]
+        books = book_series([book], [0.0])
+        matrix = self.models.evaluate_matrix(books, [1.0], live_volatility=True, live_volume=True)
+        self.assertAlmostEqual(batch["market_impact"][0], single)
+        self.assertAlmostEqual(matrix["market_impact"][0, 0], single)
+        static = self.models.evaluate_batch(book, [1.0], sides=("buy",))["buy"]["market_impact"][0]
+        self.assertEqual(static, self.models.estimate_costs(book, self.params)["market_impact"])
+
+    def test_reset_market_state(self):
+        models = TradingModels(market_stats=self.stats, online_models=OnlineCostModels(warmup=5),
+                               limit_orders=LimitOrderModel(min_books=5))
+        for i in range(30):
+            models.observe(make_book(100.0 + i % 3, bid_size=2.0 - i % 2))
+        models.reset_market_state()
+        self.assertFalse(self.stats.ready)
+        self.assertEqual(len(self.stats.intervals), 0)
+        self.assertFalse(models.online_models.ready)
+        self.assertEqual(models.online_models.maker.updates, 0)
+        self.assertFalse(models.limit_orders.ready)
+        # The first book after a reset has nothing to be compared with
+        models.observe(make_book(200.0))
+        self.assertEqual(len(self.stats.squared_returns), 0)
+
+if __name__ == '__main__':
+    unittest.main()
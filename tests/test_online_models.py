@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from models.online_models import (OnlineCostModels, OnlineLogisticRegression, QuantileSGD,
+                                  RecursiveLeastSquares, traded_through, walk_slippage)
+from models.orderbook import OrderBook
+from models.trading_models import TradingModels
+
+def make_books(count, seed=0):
+    """Books with random spreads and sizes around a random-walk mid"""
+    rng = np.random.default_rng(seed)
+    books = []
+    mid = 100.0
+    for _ in range(count):
+        mid += rng.normal(0.0, 0.05)
+        half_spread = rng.uniform(0.005, 0.05)
+        steps = np.arange(10) * 0.01
+        books.append(OrderBook(mid + half_spread + steps, rng.uniform(0.5, 5.0, 10),
+                               mid - half_spread - steps, rng.uniform(0.5, 5.0, 10)))
+    return books
+
+class TestOnlineEstimators(unittest.TestCase):
+    def test_rls_recovers_linear_weights(self):
+        rng = np.random.default_rng(1)
+        X = np.column_stack([np.ones(500), rng.normal(size=(500, 2))])
+        y = X @ np.array([0.5, 2.0, -1.0]) + rng.normal(0.0, 0.01, 500)
+        model = RecursiveLeastSquares(3, forgetting=1.0)
+        model.update_batch(X, y)
+        np.testing.assert_allclose(model.weights, [0.5, 2.0, -1.0], atol=0.01)
+        self.assertEqual(model.updates, 500)
+
+    def test_quantile_sgd_coverage(self):
+        rng = np.random.default_rng(2)
+        model = QuantileSGD(1, quantile=0.9, learning_rate=0.05)
+        for _ in range(3000):
+            model.update_batch(np.ones((8, 1)), rng.normal(0.0, 1.0, 8))
+        # 90th percentile of a standard normal
+        self.assertAlmostEqual(model.weights[0], 1.2816, delta=0.15)
+
+    def test_logistic_learns_probability(self):
+        rng = np.random.default_rng(3)
+        model = OnlineLogisticRegression(2, learning_rate=0.5, l2=0.0)
+        for _ in range(2000):
+            x = rng.normal(size=16)
+            X = np.column_stack([np.ones(16), x])
+            model.update_batch(X, rng.random(16) < 1 / (1 + np.exp(-2 * x)))
+        self.assertGreater(model.predict(np.array([1.0, 2.0])), 0.9)
+        self.assertLess(model.predict(np.array([1.0, -2.0])), 0.1)
+
+class TestOnlineCostModels(unittest.TestCase):
+    def setUp(self):
+        self.books = make_books(400)
+
+    def test_slippage_tracks_book_walk(self):
+        models = OnlineCostModels(warmup=10)
+        for book in self.books[:-1]:
+            models.observe(book)
+        self.assertTrue(models.ready)
+        book = self.books[-1]
+        quantities = np.array([0.5, 2.0, 10.0])
+        exact = walk_slippage(book, quantities)
+        predicted = models.predict_slippage(book, quantities)
+        np.testing.assert_allclose(predicted, exact, atol=2e-4)
+        upper = models.predict_slippage(book, quantities, upper=True)
+        self.assertTrue(np.all(upper >= predicted - 1e-5))
+        self.assertIsInstance(models.predict_slippage(book, 1.0, side="sell"), float)
+
+    def test_traded_through(self):
+        before = OrderBook([101.0], [1.0], [99.0], [1.0])
+        self.assertTrue(traded_through(before, OrderBook([100.0], [1.0], [98.0], [1.0]), "buy"))
+        self.assertFalse(traded_through(before, OrderBook([100.0], [1.0], [99.0], [1.0]), "buy"))
+        self.assertTrue(traded_through(before, OrderBook([102.0], [1.0], [100.0], [1.0]), "sell"))
+        self.assertFalse(traded_through(before, before, "sell"))
+
+    def test_maker_probability_in_range(self):
+        models = OnlineCostModels()
+        for book in self.books:
+            models.observe(book)
+        self.assertEqual(models.maker.updates, len(self.books) - 1)
+        probability = models.predict_maker_proportion(self.books[-1], "sell")
+        self.assertTrue(0.0 < probability < 1.0)
+
+    def test_checkpoint_roundtrip(self):
+        models = OnlineCostModels()
+        for book in self.books[:100]:
+            models.observe(book)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "online.npz")
+            models.save(path)
+            restored = OnlineCostModels()
+            restored.load(path)
+        self.assertEqual(restored.books_observed, 100)
+        np.testing.assert_array_equal(restored.slippage.P, models.slippage.P)
+        np.testing.assert_array_equal(restored.maker.weights, models.maker.weights)
+        book = self.books[-1]
+        self.assertEqual(restored.predict_slippage(book, 2.0), models.predict_slippage(book, 2.0))
+
+    def test_maker_labels_are_kept_per_symbol(self):
+        models = OnlineCostModels()
+        btc = OrderBook([100.01], [1.0], [99.99], [1.0], symbol="BTC")
+        eth = OrderBook([10.001], [1.0], [9.999], [1.0], symbol="ETH")
+        for book in (btc, eth, btc, eth):
+            models.observe(book)
+        # Only consecutive books of the same symbol are compared
+        self.assertEqual(models.maker.updates, 2)
+        models.observe(btc, symbol="other")
+        self.assertEqual(models.maker.updates, 2)
+
+    def test_trading_models_use_online_maker_after_warmup(self):
+        online = OnlineCostModels(warmup=5)
+        models = TradingModels(online_models=online, max_maker_proportion=0.8)
+        book = self.books[0]
+        static = models.predict_maker_taker(book, 1.0)
+        for book in self.books[:5]:
+            models.observe(book)
+        learned = models.predict_maker_taker(book, 1.0, "buy")
+        self.assertAlmostEqual(learned, min(online.predict_maker_proportion(book, "buy"), 0.8))
+        self.assertNotAlmostEqual(static, learned)
+
+    def test_batch_maker_proportion_per_side(self):
+        online = OnlineCostModels(warmup=0)
+        online.maker.weights = np.array([0.0, 0.0, 4.0])
+        models = TradingModels(online_models=online, max_maker_proportion=1.0)
+        book = OrderBook([101.0], [1.0], [99.0], [3.0])
+        results = models.evaluate_batch(book, [1.0])
+        for side in ("buy", "sell"):
+            self.assertAlmostEqual(results[side]["maker_proportion"][0],
+                                   models.predict_maker_taker(book, 1.0, side))
+        self.assertNotAlmostEqual(results["buy"]["maker_proportion"][0],
+                                  results["sell"]["maker_proportion"][0])
+
+    def test_learned_slippage_beyond_visible_depth(self):
+        online = OnlineCostModels(warmup=10)
+        models = TradingModels(online_models=online)
+        for book in self.books[:-1]:
+            models.observe(book)
+        book = self.books[-1]
+        depth = book.depth("asks", 10)
+        inside = models.calculate_slippage(book, 0.5 * depth)
+        self.assertEqual(inside, walk_slippage(book, 0.5 * depth))
+        beyond = models.calculate_slippage(book, 3.0 * depth)
+        self.assertAlmostEqual(beyond, online.predict_slippage(book, 3.0 * depth))
+        self.assertGreater(beyond, walk_slippage(book, 3.0 * depth))
+        batch = models.evaluate_batch(book, [0.5 * depth, 3.0 * depth], sides=("buy",))["buy"]
+        np.testing.assert_allclose(batch["slippage"], [inside, beyond])
+
+if __name__ == '__main__':
+    unittest.main()
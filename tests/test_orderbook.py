@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+from models.orderbook import OrderBook
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = {
+            "timestamp": "2025-05-04T10:39:13Z",
+            "exchange": "OKX",
+            "symbol": "BTC-USDT-SWAP",
+            "asks": [["101.0", "2.0"], ["100.0", "1.0"]],
+            "bids": [["99.0", "1.0"], ["98.0", "2.0"]]
+        }
+
+    def test_parses_and_sorts_levels(self):
+        book = OrderBook.from_snapshot(self.snapshot)
+        np.testing.assert_array_equal(book.ask_prices, [100.0, 101.0])
+        np.testing.assert_array_equal(book.ask_sizes, [1.0, 2.0])
+        np.testing.assert_array_equal(book.bid_prices, [99.0, 98.0])
+        self.assertEqual(book.ask_prices.dtype, np.float64)
+        self.assertEqual(book.symbol, "BTC-USDT-SWAP")
+
+    def test_cumulative_arrays(self):
+        book = OrderBook.from_snapshot(self.snapshot)
+        np.testing.assert_array_equal(book.ask_cum_sizes, [1.0, 3.0])
+        np.testing.assert_array_equal(book.ask_cum_notional, [100.0, 302.0])
+        np.testing.assert_array_equal(book.bid_cum_notional, [99.0, 295.0])
+
+    def test_top_of_book(self):
+        book = OrderBook.from_snapshot(self.snapshot)
+        self.assertEqual(book.mid_price, 99.5)
+        self.assertEqual(book.spread, 1.0)
+        self.assertEqual(book.depth("asks", 1), 1.0)
+        self.assertEqual(book.depth("bids"), 3.0)
+
+    def test_arrays_are_read_only(self):
+        book = OrderBook.from_snapshot(self.snapshot)
+        with self.assertRaises(ValueError):
+            book.ask_prices[0] = 0.0
+
+    def test_fill_matches_level_walk(self):
+        rng = np.random.default_rng(7)
+        prices = 100.0 + np.cumsum(rng.uniform(0.01, 0.5, 400))
+        sizes = rng.uniform(0.1, 5.0, 400)
+        book = OrderBook(prices, sizes, [99.0], [1.0])
+        quantities = rng.uniform(0.0, sizes.sum(), 50)
+        fills = book.fill(quantities, "buy")
+        for i, quantity in enumerate(quantities):
+            remaining, cost = quantity, 0.0
+            for price, size in zip(prices, sizes):
+                take = min(size, remaining)
+                cost += take * price
+                remaining -= take
+                if remaining <= 0:
+                    break
+            self.assertAlmostEqual(fills.notional[i], cost, places=6)
+            self.assertAlmostEqual(fills.vwap[i], cost / quantity, places=9)
+
+    def test_partial_fill_ratio(self):
+        book = OrderBook.from_snapshot(self.snapshot)
+        fill = book.fill(6.0, "buy")
+        self.assertEqual(fill.filled, 3.0)
+        self.assertEqual(fill.fill_ratio, 0.5)
+        self.assertEqual(fill.levels, 2)
+        self.assertAlmostEqual(fill.vwap, 302.0 / 3.0)
+
+    def test_sell_fill_walks_bids(self):
+        book = OrderBook.from_snapshot(self.snapshot)
+        fill = book.fill(np.array([0.5, 2.0]), "sell")
+        np.testing.assert_allclose(fill.vwap, [99.0, 98.5])
+        np.testing.assert_array_equal(fill.fill_ratio, [1.0, 1.0])
+
+    def test_ragged_levels(self):
+        snapshot = {"asks": [["100.0", "1.0", "0", "2"], ["101.0", "2.0"]], "bids": []}
+        book = OrderBook.from_snapshot(snapshot)
+        np.testing.assert_array_equal(book.ask_sizes, [1.0, 2.0])
+        self.assertFalse(book.is_valid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+import numpy as np
+from utils import performance_monitor
+from utils.performance_monitor import PerformanceMonitor
+from models.orderbook import OrderBook
+from models.trading_models import TradingModels
+
+class FakeClock:
+    def __init__(self):
+        self.now_ns = 1_000_000_000
+
+    def __call__(self):
+        return self.now_ns
+
+    def advance(self, seconds):
+        self.now_ns += int(seconds * 1e9)
+
+class TestPerformanceMonitor(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(performance_monitor.time, "perf_counter_ns", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_percentiles_and_counters(self):
+        monitor = PerformanceMonitor(window_size=1000)
+        for duration_us in range(1, 1001):
+            monitor.record_span("decode", duration_us * 1000)
+        stats = monitor.stage_stats("decode")
+        self.assertEqual(stats["count"], 1000)
+        self.assertAlmostEqual(stats["mean_us"], 500.5)
+        self.assertAlmostEqual(stats["p50_us"], 500.5)
+        self.assertAlmostEqual(stats["p99_us"], 990.01)
+        self.assertAlmostEqual(stats["p99.9_us"], 999.001)
+        self.assertEqual(stats["max_us"], 1000.0)
+        self.assertIsNone(monitor.stage_stats("redraw"))
+
+    def test_window_keeps_recent_spans_and_all_time_counts(self):
+        monitor = PerformanceMonitor(window_size=10)
+        for duration_ns in [1_000_000] + [1000] * 20:
+            monitor.record_span("compute", duration_ns)
+        stats = monitor.stage_stats("compute")
+        self.assertEqual(stats["count"], 21)
+        self.assertEqual(stats["max_us"], 1000.0)
+        self.assertEqual(stats["p99.9_us"], 1.0)
+        self.assertEqual(len(monitor.durations("compute")), 10)
+
+    def test_chained_stops_time_consecutive_stages(self):
+        monitor = PerformanceMonitor()
+        start = monitor.now()
+        self.clock.advance(0.002)
+        start = monitor.stop("decode", start)
+        self.clock.advance(0.003)
+        monitor.stop("book_build", start)
+        with monitor.span("redraw"):
+            self.clock.advance(0.001)
+        self.assertEqual(monitor.durations("decode").tolist(), [2_000_000])
+        self.assertEqual(monitor.durations("book_build").tolist(), [3_000_000])
+        self.assertEqual(monitor.durations("redraw").tolist(), [1_000_000])
+        self.assertEqual(monitor.stages, ["decode", "book_build", "redraw"])
+
+    def test_message_rate(self):
+        monitor = PerformanceMonitor(rate_window=5.0)
+        self.assertEqual(monitor.messages_per_second, 0.0)
+        for _ in range(100):
+            monitor.record_message()
+            self.clock.advance(0.01)
+        self.assertAlmostEqual(monitor.messages_per_second, 100.0)
+        # Only the last five seconds count once the window is full
+        for _ in range(100):
+            monitor.record_message()
+            self.clock.advance(0.1)
+        self.assertAlmostEqual(monitor.messages_per_second, 10.0)
+        self.clock.advance(10)
+        self.assertEqual(monitor.messages_per_second, 0.0)
+        self.assertEqual(monitor.messages, 200)
+
+    def test_histogram_covers_all_spans(self):
+        monitor = PerformanceMonitor()
+        for duration_ns in np.geomspace(1000, 1_000_000, 50).astype(int):
+            monitor.record_span("receive", int(duration_ns))
+        counts, edges = monitor.histogram("receive", bins=10)
+        self.assertEqual(counts.sum(), 50)
+        self.assertAlmostEqual(edges[0], 1.0)
+        self.assertAlmostEqual(edges[-1], 1000.0)
+
+    def test_models_record_a_span_per_model(self):
+        monitor = PerformanceMonitor()
+        models = TradingModels(monitor=monitor)
+        orderbook = OrderBook([101.0, 102.0], [1.0, 1.0], [99.0, 98.0], [1.0, 1.0])
+        params = {"quantity": 1.5, "order_type": "market", "volatility": 0.02,
+                  "exchange": "OKX", "fee_tier": "VIP0"}
+        models.estimate_costs(orderbook, params)
+        self.assertEqual(monitor.stages, ["model.maker_taker", "model.slippage", "model.fees", "model.impact"])
+        self.assertIn("model.impact", monitor.format_report())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from ui.refresh_scheduler import RefreshScheduler
+
+class FakeRoot:
+    """Tk after/after_cancel on a manual clock"""
+    def __init__(self):
+        self.now = 0.0
+        self.callbacks = {}
+        self.next_id = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = (self.now + delay_ms / 1000, callback)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_until(self, end):
+        """Run due callbacks in order until the clock reaches end"""
+        while self.callbacks:
+            after_id, (due, callback) = min(self.callbacks.items(), key=lambda item: item[1][0])
+            if due > end:
+                break
+            del self.callbacks[after_id]
+            self.now = max(self.now, due)
+            callback()
+        self.now = end
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.frames = []
+        self.frame_cost = 0.0
+        self.version = 0
+        self.scheduler = RefreshScheduler(self.root, self.refresh, min_interval=0.02, max_interval=0.4,
+                                          heartbeat=1.0, frame_budget=0.01, smoothing=1.0,
+                                          clock=self.root.clock)
+        self.scheduler.watch("book", lambda: self.version)
+
+    def refresh(self, reasons):
+        self.frames.append((self.root.now, frozenset(reasons)))
+        self.root.now += self.frame_cost
+
+    def test_idle_polls_back_off_to_heartbeat(self):
+        self.scheduler.start()
+        self.root.run_until(3.0)
+        # First frame, then heartbeats only, with polls backing off to max_interval
+        self.assertEqual([reasons for _, reasons in self.frames][:2],
+                         [frozenset({"book", "heartbeat"}), frozenset({"heartbeat"})])
+        self.assertLessEqual(len(self.frames), 4)
+        self.assertLess(self.scheduler.idle_polls, 3.0 / 0.4 + 5)
+
+    def test_new_version_triggers_frame(self):
+        self.scheduler.start()
+        self.root.run_until(0.5)
+        count = len(self.frames)
+        self.version += 1
+        self.root.run_until(0.5 + 0.4)
+        self.assertEqual(len(self.frames), count + 1)
+        self.assertEqual(self.frames[-1][1], frozenset({"book"}))
+
+    def test_busy_feed_runs_at_min_interval(self):
+        self.scheduler.start()
+        # Books every 5 ms are conflated into one frame per 20 ms
+        for step in range(1, 201):
+            self.version += 1
+            self.root.run_until(step * 0.005)
+        self.assertGreaterEqual(len(self.frames), 48)
+        self.assertLessEqual(len(self.frames), 52)
+
+    def test_mark_dirty_runs_next_frame_early(self):
+        self.scheduler.start()
+        self.root.run_until(0.5)
+        count = len(self.frames)
+        self.scheduler.mark_dirty("inputs")
+        self.root.run_until(0.5)
+        self.assertEqual(len(self.frames), count + 1)
+        self.assertEqual(self.frames[-1], (0.5, frozenset({"inputs"})))
+
+    def test_slow_frames_are_throttled(self):
+        self.frame_cost = 0.05
+        self.scheduler.start()
+        for step in range(1, 101):
+            self.version += 1
+            self.root.run_until(step * 0.02)
+        # 50 ms frames against a 10 ms budget stretch the 20 ms interval five times
+        self.assertAlmostEqual(self.scheduler.interval, 0.1)
+        starts = [start for start, _ in self.frames]
+        self.assertGreaterEqual(min(b - a for a, b in zip(starts[1:], starts[2:])), 0.1 - 1e-9)
+
+    def test_stop_cancels_pending_frame(self):
+        self.scheduler.start()
+        self.scheduler.stop()
+        self.root.run_until(2.0)
+        self.assertEqual(self.frames, [])
+        self.assertEqual(self.root.callbacks, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import pickle
+import unittest
+import numpy as np
+from models.orderbook import OrderBook
+from models.scenario_runner import ScenarioRunner, _worker_copy, pack_books
+from models.trading_models import TradingModels
+from utils.performance_monitor import PerformanceMonitor
+
+def make_book(seed, levels):
+    rng = np.random.default_rng(seed)
+    mid = 100.0 * (seed + 1)
+    return OrderBook(mid + 0.05 + np.cumsum(rng.uniform(0.01, 0.5, levels)), rng.uniform(0.1, 2.0, levels),
+                     mid - 0.05 - np.cumsum(rng.uniform(0.01, 0.5, levels)), rng.uniform(0.1, 2.0, levels),
+                     symbol=f"SYM{seed}")
+
+class TestScenarioRunner(unittest.TestCase):
+    def setUp(self):
+        self.books = [make_book(seed, levels) for seed, levels in enumerate((3, 8, 20, 5, 12))]
+        self.quantities = [0.1, 1.0, 4.0, 40.0]
+        self.grid = dict(sides=("buy", "sell"), volatilities=(0.01, 0.05), fee_tiers=("VIP0", "VIP5"))
+
+    def check_against_batch(self, output):
+        models = TradingModels()
+        self.assertEqual(output.results.shape, (8, 5, 4))
+        self.assertEqual(output.symbols, ["SYM0", "SYM1", "SYM2", "SYM3", "SYM4"])
+        for index, scenario in enumerate(output.scenarios):
+            for row, book in enumerate(self.books):
+                expected = models.evaluate_batch(book, self.quantities, scenario.order_type,
+                                                 scenario.volatility, "OKX", scenario.fee_tier,
+                                                 (scenario.side,))[scenario.side]
+                for field in expected.dtype.names:
+                    np.testing.assert_allclose(output.results[index, row][field], expected[field],
+                                               rtol=1e-12, err_msg=field)
+
+    def test_pack_books_pads_to_deepest_book(self):
+        packed = pack_books(self.books)
+        self.assertEqual(packed.shape, (4, 5, 20))
+        self.assertTrue(np.isnan(packed[0, 0, 3]))
+        self.assertEqual(packed[1, 0, 3], 0.0)
+
+    def test_in_process_matches_batch(self):
+        self.check_against_batch(ScenarioRunner(max_workers=1).run(self.books, self.quantities, **self.grid))
+
+    def test_process_pool_matches_batch(self):
+        with ScenarioRunner(max_workers=2) as runner:
+            self.check_against_batch(runner.run(self.books, self.quantities, **self.grid))
+            # The pool and its mappings are reused across runs
+            second = runner.run(self.books[:2], self.quantities, sides=("sell",))
+        self.assertEqual(second.results.shape, (1, 2, 4))
+
+    def test_models_with_a_monitor_run_on_the_pool(self):
+        models = TradingModels(monitor=PerformanceMonitor())
+        # Spawned workers unpickle the models; forked ones would hide a failure
+        pickle.loads(pickle.dumps(_worker_copy(models)))
+        with ScenarioRunner(models, max_workers=2) as runner:
+            output = runner.run(self.books, self.quantities)
+        self.assertIsNotNone(models.monitor)
+        expected = models.evaluate_batch(self.books[0], self.quantities, sides=("buy",))["buy"]
+        np.testing.assert_allclose(output.results[0, 0]["net_cost"], expected["net_cost"], rtol=1e-12)
+
+    def test_stop_orders_match_batch_and_limit_orders_are_rejected(self):
+        models = TradingModels()
+        output = ScenarioRunner(max_workers=1).run(self.books, self.quantities, sides=("buy", "sell"),
+                                                   order_types=("stop",))
+        for index, scenario in enumerate(output.scenarios):
+            for row, book in enumerate(self.books):
+                expected = models.evaluate_batch(book, self.quantities, "stop",
+                                                 sides=(scenario.side,))[scenario.side]
+                for field in expected.dtype.names:
+                    np.testing.assert_allclose(output.results[index, row][field], expected[field],
+                                               rtol=1e-12, err_msg=field)
+        with self.assertRaises(ValueError):
+            ScenarioRunner(max_workers=1).run(self.books, self.quantities, order_types=("limit",))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+from storage.tick_file import TickFileReader, TickFileWriter
+from network.replay_client import ReplayClient
+from models.book_builder import OrderBookBuilder
+
+def make_message(i):
+    return {
+        "timestamp": f"2025-05-04T10:39:{i:02d}Z",
+        "asks": [[f"{100 + i}.5", "1.0"], [f"{101 + i}.0", "2.25"]],
+        "bids": [[f"{99 + i}.0", "3.0"]],
+    }
+
+class TestTickFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "ticks.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def record(self, count, start=0, chunk_ticks=3):
+        with TickFileWriter(self.path, {"symbol": "BTC-USDT"}, chunk_ticks=chunk_ticks) as writer:
+            for i in range(start, start + count):
+                writer.write(make_message(i), 1000.0 + i * 0.01)
+
+    def test_round_trip(self):
+        self.record(7)
+        reader = TickFileReader(self.path)
+        self.assertEqual(reader.metadata, {"symbol": "BTC-USDT"})
+        messages = list(reader)
+        self.assertEqual(len(messages), 7)
+        np.testing.assert_array_equal(messages[2]["asks"], [[102.5, 1.0], [103.0, 2.25]])
+        np.testing.assert_array_equal(messages[2]["bids"], [[101.0, 3.0]])
+        self.assertEqual(messages[2]["timestamp"], "2025-05-04T10:39:02.000000Z")
+        self.assertEqual(messages[2]["symbol"], "BTC-USDT")
+        self.assertAlmostEqual(messages[6]["receive_time"], 1000.06)
+
+    def test_append_to_existing_file(self):
+        self.record(2)
+        self.record(2, start=2)
+        self.assertEqual(len(list(TickFileReader(self.path))), 4)
+
+    def test_truncated_final_chunk_is_ignored(self):
+        self.record(6)
+        with open(self.path, "r+b") as tick_file:
+            tick_file.truncate(os.path.getsize(self.path) - 5)
+        self.assertEqual(len(list(TickFileReader(self.path))), 3)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as tick_file:
+            tick_file.write(b"not a tick file")
+        with self.assertRaises(ValueError):
+            TickFileReader(self.path)
+
+    def test_max_speed_replay_feeds_builder(self):
+        self.record(5)
+        builder = OrderBookBuilder()
+        books = []
+        client = ReplayClient(self.path, lambda message: builder.apply(message) and books.append(builder.orderbook),
+                              speed="max")
+        client.run()
+        self.assertEqual(client.messages_replayed, 5)
+        self.assertEqual(books[-1].best_ask, 104.5)
+        self.assertGreater(client.messages_per_second, 0)
+
+    def test_accelerated_replay_is_paced(self):
+        self.record(5)
+        client = ReplayClient(self.path, lambda message: None, speed=2.0)
+        start = time.perf_counter()
+        client.run()
+        # 40 ms of recorded time at 2x speed
+        self.assertGreaterEqual(time.perf_counter() - start, 0.018)
+
+if __name__ == '__main__':
+    unittest.main()
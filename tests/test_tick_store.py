@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from storage.tick_file import TickFileWriter
+from storage.tick_store import TickStore, TickStoreWriter
+from models.orderbook import OrderBook
+from models.trading_models import TradingModels
+
+def make_book(i):
+    mid = 100.0 + i
+    asks = mid + 0.5 + np.arange(5)
+    bids = mid - 0.5 - np.arange(4)
+    return OrderBook(asks, np.full(5, 1.0 + i % 3), bids, np.full(4, 2.0))
+
+class TestTickStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.directory, "store")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, count, start=0, depth=6):
+        with TickStoreWriter(self.store_path, depth=depth) as writer:
+            for i in range(start, start + count):
+                writer.append(make_book(i), 1000.0 + i)
+
+    def test_round_trip_pads_shallow_books(self):
+        self.write(3)
+        store = TickStore(self.store_path)
+        self.assertEqual(len(store), 3)
+        np.testing.assert_array_equal(store.ask_prices[1, :5], make_book(1).ask_prices)
+        self.assertTrue(np.isnan(store.ask_prices[1, 5]))
+        np.testing.assert_array_equal(store.bid_sizes[2], [2.0, 2.0, 2.0, 2.0, 0.0, 0.0])
+
+    def test_append_to_existing_store(self):
+        self.write(2)
+        self.write(3, start=2, depth=99)
+        store = TickStore(self.store_path)
+        self.assertEqual(len(store), 5)
+        self.assertEqual(store.depth, 6)
+
+    def test_rejects_timestamps_going_backwards(self):
+        self.write(2)
+        with TickStoreWriter(self.store_path) as writer:
+            with self.assertRaises(ValueError):
+                writer.append(make_book(0), 999.0)
+
+    def test_time_range_chunks_are_views(self):
+        self.write(10)
+        store = TickStore(self.store_path)
+        chunks = list(store.chunks(1002.0, 1009.0, chunk_size=3))
+        self.assertEqual([len(chunk.timestamps) for chunk in chunks], [3, 3, 1])
+        self.assertEqual(chunks[0].timestamps[0], 1002.0)
+        self.assertIsInstance(chunks[0].ask_prices.base, np.memmap)
+
+    def test_from_tick_file(self):
+        tick_path = os.path.join(self.directory, "ticks.bin")
+        with TickFileWriter(tick_path, {"symbol": "BTC-USDT"}) as writer:
+            for i in range(4):
+                writer.write({
+                    "timestamp": f"2025-05-04T10:39:{i:02d}Z",
+                    "asks": [[f"{100 + i}.5", "1.0"]],
+                    "bids": [[f"{99 + i}.0", "3.0"]],
+                }, 1000.0 + i)
+        self.assertEqual(TickStoreWriter.from_tick_file(tick_path, self.store_path, depth=2), 4)
+        store = TickStore(self.store_path)
+        self.assertEqual(store.metadata, {"symbol": "BTC-USDT"})
+        np.testing.assert_array_equal(store.ask_prices[:, 0], [100.5, 101.5, 102.5, 103.5])
+        self.assertEqual(np.diff(store.timestamps).tolist(), [1.0, 1.0, 1.0])
+
+    def test_evaluate_range_matches_batch(self):
+        self.write(7)
+        store = TickStore(self.store_path)
+        models = TradingModels()
+        quantities = np.array([0.5, 2.0, 7.0, 50.0])
+        for side in ("buy", "sell"):
+            rows = []
+            for timestamps, results in models.evaluate_range(store, quantities, side=side, chunk_size=3):
+                self.assertEqual(results.shape, (len(timestamps), len(quantities)))
+                rows.extend(results)
+            self.assertEqual(len(rows), 7)
+            for i, row in enumerate(rows):
+                expected = models.evaluate_batch(make_book(i), quantities, sides=(side,))[side]
+                for field in expected.dtype.names:
+                    np.testing.assert_allclose(row[field], expected[field], rtol=1e-12, err_msg=field)
+
+if __name__ == '__main__':
+    unittest.main()
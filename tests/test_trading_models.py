@@ -15,6 +15,17 @@ class TestTradingModels(unittest.TestCase):
         self.assertGreaterEqual(slippage, 0)
         self.assertLessEqual(slippage, 0.1)
 
+    def test_slippage_exact_vwap(self):
+        # 1.5 units: 1.0 @ 100 + 0.5 @ 101 against a 99.0/100.0 mid of 99.5
+        slippage = self.model.calculate_slippage(self.sample_orderbook, 1.5)
+        self.assertAlmostEqual(slippage, (150.5 / 1.5 - 99.5) / 99.5)
+
+    def test_thin_book_reports_fill_ratio(self):
+        fill = self.model.estimate_fill(self.sample_orderbook, 6.0, side="sell")
+        self.assertEqual(fill["fill_ratio"], 0.5)
+        self.assertGreater(fill["slippage"], 0)
+        self.assertNotEqual(self.model.calculate_slippage(self.sample_orderbook, 6.0), 0.02)
+
     def test_market_impact(self):
         impact = self.model.calculate_market_impact(
             self.sample_orderbook, 
@@ -39,5 +50,44 @@ class TestTradingModels(unittest.TestCase):
         )
         self.assertGreaterEqual(fees, 0)
 
+    def test_estimate_costs_combines_models(self):
+        params = {"exchange": "OKX", "order_type": "market", "quantity": 1.0,
+                  "volatility": 0.02, "fee_tier": "VIP0"}
+        metrics = self.model.estimate_costs(self.sample_orderbook, params)
+        self.assertEqual(metrics["price"], 99.5)
+        expected = 99.5 * (1 + metrics["slippage"]) + metrics["fees"] + metrics["market_impact"]
+        self.assertAlmostEqual(metrics["net_cost"], expected)
+
+    def test_custom_fee_tables(self):
+        model = TradingModels(fee_tables={"Binance": {"VIP0": (0.001, 0.001)}})
+        fees = model.calculate_fees("binance", "VIP0", 1.0, 100.0, 0.5)
+        self.assertAlmostEqual(fees, 0.1)
+        # Unknown exchanges fall back to the default rates
+        fees = model.calculate_fees("OKX", "VIP0", 1.0, 100.0, 0.0)
+        self.assertAlmostEqual(fees, 0.1)
+
+    def test_evaluate_batch_matches_scalar_models(self):
+        quantities = np.array([0.5, 1.0, 2.5, 10.0])
+        batch = self.model.evaluate_batch(self.sample_orderbook, quantities, volatility=0.02,
+                                          exchange="OKX", fee_tier="VIP1")
+        self.assertEqual(set(batch), {"buy", "sell"})
+        buy = batch["buy"]
+        mid = 99.5
+        maker = self.model.predict_maker_taker(self.sample_orderbook, 1.0)
+        for row, quantity in zip(buy, quantities):
+            slippage = self.model.calculate_slippage(self.sample_orderbook, quantity)
+            fees = self.model.calculate_fees("OKX", "VIP1", quantity, mid, maker)
+            impact = self.model.calculate_market_impact(self.sample_orderbook, quantity, 0.02, mid)
+            self.assertAlmostEqual(row["slippage"], slippage)
+            self.assertAlmostEqual(row["fees"], fees)
+            self.assertAlmostEqual(row["market_impact"], impact)
+            self.assertAlmostEqual(row["net_cost"], quantity * mid * (1 + slippage) + fees + impact)
+        np.testing.assert_allclose(buy["fill_ratio"], [1.0, 1.0, 1.0, 0.3])
+
+    def test_evaluate_batch_non_market_has_no_slippage(self):
+        batch = self.model.evaluate_batch(self.sample_orderbook, [1.0, 2.0], order_type="limit",
+                                          sides=("sell",))
+        np.testing.assert_array_equal(batch["sell"]["slippage"], [0.0, 0.0])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,201 @@
+# trade_simulator/ui/depth_chart.py
+import time
+
+import numpy as np
+
+# 'bars' plots the size of each level, 'depth' the cumulative size from the top of the book
+MODES = ("bars", "depth")
+
+
+class DepthChart:
+    """
+    Orderbook chart on a matplotlib Axes that redraws incrementally
+
+    The bar and depth-curve artists are created once as animated artists and
+    updated in place. A full canvas draw happens only when the axis limits
+    have to change; it renders the static parts (axes, ticks, labels,
+    legend) and caches them as a background. Every other frame restores that
+    background, draws the animated artists on top and blits the axes area.
+    Books whose top levels are unchanged are not drawn at all.
+
+    The chart only needs a canvas that supports copy_from_bbox and
+    restore_region (Agg-based canvases such as TkAgg), so it can be driven
+    without a window.
+    """
+    def __init__(self, ax, levels=10, mode="bars", headroom=0.25):
+        """
+        Initialize the chart
+
+        Args:
+            ax: matplotlib Axes whose figure is already attached to its final canvas
+            levels (int): Levels per side to display
+            mode (str): 'bars' or 'depth'
+            headroom (float): Fraction added around the data when the limits are reset,
+                so small moves do not force a full redraw
+        """
+        self.ax = ax
+        self.fig = ax.figure
+        self.levels = levels
+        self.headroom = headroom
+        self.mode = None
+        self.background = None
+        self.orderbook = None
+        self._signature = None
+        self._layout_stale = True
+
+        self.frames = 0
+        self.skipped_frames = 0
+        self.full_draws = 0
+        self.last_frame_time = 0.0
+
+        ax.set_title("Order Book Depth")
+        ax.set_xlabel("Price")
+        ax.tick_params(axis='x', rotation=45)
+
+        zeros = np.zeros(levels)
+        self.bid_bars = ax.bar(zeros, zeros, color='green', alpha=0.5, label='Bids', animated=True)
+        self.ask_bars = ax.bar(zeros, zeros, color='red', alpha=0.5, label='Asks', animated=True)
+        self.bid_line, = ax.plot([], [], color='green', drawstyle='steps-post', label='Bids', animated=True)
+        self.ask_line, = ax.plot([], [], color='red', drawstyle='steps-post', label='Asks', animated=True)
+
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+        self.set_mode(mode)
+
+    @property
+    def artists(self):
+        """Animated artists of the current mode"""
+        if self.mode == "depth":
+            return [self.bid_line, self.ask_line]
+        return list(self.bid_bars) + list(self.ask_bars)
+
+    def set_mode(self, mode):
+        """
+        Switch between level bars and cumulative depth curves
+
+        Args:
+            mode (str): 'bars' or 'depth'
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown chart mode: {mode}")
+        if mode == self.mode:
+            return
+        self.mode = mode
+        depth = mode == "depth"
+        for rect in list(self.bid_bars) + list(self.ask_bars):
+            rect.set_visible(not depth)
+        self.bid_line.set_visible(depth)
+        self.ask_line.set_visible(depth)
+        self.ax.set_ylabel("Cumulative Quantity" if depth else "Quantity")
+        if depth:
+            self.ax.legend(handles=[self.bid_line, self.ask_line])
+        else:
+            self.ax.legend(handles=[self.bid_bars, self.ask_bars])
+
+        self._signature = None
+        self._layout_stale = True
+        if self.orderbook is not None:
+            self.update(self.orderbook)
+
+    def update(self, orderbook):
+        """
+        Show an orderbook, drawing only what changed
+
+        Args:
+            orderbook (OrderBook): Book to display
+
+        Returns:
+            bool: True if the chart was redrawn, False if the top levels were unchanged
+        """
+        start = time.perf_counter()
+        self.orderbook = orderbook
+        n = self.levels
+        ask_prices, ask_sizes = orderbook.ask_prices[:n], orderbook.ask_sizes[:n]
+        bid_prices, bid_sizes = orderbook.bid_prices[:n], orderbook.bid_sizes[:n]
+
+        signature = np.concatenate((ask_prices, ask_sizes, bid_prices, bid_sizes))
+        if (not self._layout_stale and self._signature is not None
+                and np.array_equal(signature, self._signature)):
+            self.skipped_frames += 1
+            return False
+        self._signature = signature
+
+        if self.mode == "depth":
+            bid_values = orderbook.bid_cum_sizes[:n]
+            ask_values = orderbook.ask_cum_sizes[:n]
+            self.bid_line.set_data(bid_prices, bid_values)
+            self.ask_line.set_data(ask_prices, ask_values)
+        else:
+            bid_values, ask_values = bid_sizes, ask_sizes
+            width = self._bar_width(bid_prices, ask_prices)
+            self._set_bars(self.bid_bars, bid_prices, bid_sizes, width)
+            self._set_bars(self.ask_bars, ask_prices, ask_sizes, width)
+
+        prices = np.concatenate((bid_prices, ask_prices))
+        values = np.concatenate((bid_values, ask_values))
+        if len(prices) and self._needs_layout(prices.min(), prices.max(), values.max()):
+            self._relayout(prices.min(), prices.max(), values.max())
+        else:
+            self._blit()
+
+        self.frames += 1
+        self.last_frame_time = time.perf_counter() - start
+        return True
+
+    @staticmethod
+    def _bar_width(bid_prices, ask_prices):
+        """Bar width from the smallest gap between displayed levels"""
+        prices = np.sort(np.concatenate((bid_prices, ask_prices)))
+        gaps = np.diff(prices)
+        gaps = gaps[gaps > 0]
+        if len(gaps):
+            return 0.8 * gaps.min()
+        return max(abs(prices[0]) * 1e-4, 1e-8) if len(prices) else 1.0
+
+    @staticmethod
+    def _set_bars(bars, prices, sizes, width):
+        """Move the rectangles of a bar series onto the given levels; unused ones get zero height"""
+        count = len(prices)
+        for i, rect in enumerate(bars):
+            if i < count:
+                rect.set_x(prices[i] - width / 2)
+                rect.set_width(width)
+                rect.set_height(sizes[i])
+            else:
+                rect.set_height(0.0)
+
+    def _needs_layout(self, low, high, top):
+        """True if the data left the current limits or shrank below a quarter of the y range"""
+        if self._layout_stale or self.background is None:
+            return True
+        x_low, x_high = self.ax.get_xlim()
+        _, y_high = self.ax.get_ylim()
+        return low < x_low or high > x_high or top > y_high or top < y_high * 0.25
+
+    def _relayout(self, low, high, top):
+        """Reset the limits around the data and redraw the whole figure"""
+        span = max(high - low, abs(high) * 1e-6, 1e-8)
+        self.ax.set_xlim(low - span * self.headroom, high + span * self.headroom)
+        self.ax.set_ylim(0.0, max(top, 1e-12) * (1 + self.headroom))
+        self._layout_stale = False
+        self.full_draws += 1
+        # Rendering fires draw_event, which caches the background and draws the artists
+        self.fig.canvas.draw()
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw, including resizes"""
+        canvas = self.fig.canvas
+        self.background = canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+    def _blit(self):
+        """Redraw the animated artists over the cached background"""
+        if self.background is None:
+            return  # Nothing rendered yet; the first full draw will show the artists
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        self._draw_artists()
+        canvas.blit(self.ax.bbox)
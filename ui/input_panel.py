@@ -24,8 +24,11 @@ class InputPanel:
         self.exchange_var = tk.StringVar(value="OKX")
         self.spot_asset_var = tk.StringVar(value="BTC-USDT")
         self.order_type_var = tk.StringVar(value="market")
+        self.order_price_var = tk.StringVar(value="")
         self.quantity_var = tk.DoubleVar(value=100.0)
         self.volatility_var = tk.DoubleVar(value=2.0)
+        self.live_volatility_var = tk.BooleanVar(value=False)
+        self.live_volume_var = tk.BooleanVar(value=False)
         self.fee_tier_var = tk.StringVar(value="VIP0")
         
         # Set up UI
@@ -60,21 +63,34 @@ class InputPanel:
         order_type_combo['values'] = ('market', 'limit', 'stop')
         order_type_combo.grid(row=2, column=1, sticky=tk.EW, padx=10, pady=5)
         
+        # Limit/stop price; left blank, limits rest at the touch and stops sit one level out
+        ttk.Label(input_params_frame, text="Limit/Stop Price:", style="Title.TLabel").grid(row=3, column=0, sticky=tk.W, pady=5)
+        order_price_entry = ttk.Entry(input_params_frame, textvariable=self.order_price_var)
+        order_price_entry.grid(row=3, column=1, sticky=tk.EW, padx=10, pady=5)
+        
         # Quantity
-        ttk.Label(input_params_frame, text="Quantity (USD):", style="Title.TLabel").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Label(input_params_frame, text="Quantity (USD):", style="Title.TLabel").grid(row=4, column=0, sticky=tk.W, pady=5)
         quantity_entry = ttk.Entry(input_params_frame, textvariable=self.quantity_var)
-        quantity_entry.grid(row=3, column=1, sticky=tk.EW, padx=10, pady=5)
+        quantity_entry.grid(row=4, column=1, sticky=tk.EW, padx=10, pady=5)
         
         # Volatility
-        ttk.Label(input_params_frame, text="Volatility (%):", style="Title.TLabel").grid(row=4, column=0, sticky=tk.W, pady=5)
+        ttk.Label(input_params_frame, text="Volatility (%):", style="Title.TLabel").grid(row=5, column=0, sticky=tk.W, pady=5)
         volatility_entry = ttk.Entry(input_params_frame, textvariable=self.volatility_var)
-        volatility_entry.grid(row=4, column=1, sticky=tk.EW, padx=10, pady=5)
+        volatility_entry.grid(row=5, column=1, sticky=tk.EW, padx=10, pady=5)
+        
+        # Live volatility from the feed; the entry above is used until enough books arrived
+        ttk.Checkbutton(input_params_frame, text="Use live volatility",
+                        variable=self.live_volatility_var).grid(row=6, column=1, sticky=tk.W, padx=10, pady=5)
+        
+        # Live traded-volume proxy in the impact model instead of the visible book depth
+        ttk.Checkbutton(input_params_frame, text="Use live volume",
+                        variable=self.live_volume_var).grid(row=7, column=1, sticky=tk.W, padx=10, pady=5)
         
         # Fee Tier
-        ttk.Label(input_params_frame, text="Fee Tier:", style="Title.TLabel").grid(row=5, column=0, sticky=tk.W, pady=5)
+        ttk.Label(input_params_frame, text="Fee Tier:", style="Title.TLabel").grid(row=8, column=0, sticky=tk.W, pady=5)
         fee_tier_combo = ttk.Combobox(input_params_frame, textvariable=self.fee_tier_var)
         fee_tier_combo['values'] = ('VIP0', 'VIP1', 'VIP2', 'VIP3', 'VIP4', 'VIP5')
-        fee_tier_combo.grid(row=5, column=1, sticky=tk.EW, padx=10, pady=5)
+        fee_tier_combo.grid(row=8, column=1, sticky=tk.EW, padx=10, pady=5)
         
         # Configure grid weights
         input_params_frame.columnconfigure(1, weight=1)
@@ -90,12 +106,27 @@ class InputPanel:
             "exchange": self.exchange_var.get(),
             "spot_asset": self.spot_asset_var.get(),
             "order_type": self.order_type_var.get(),
+            "limit_price": self.get_order_price(),
             "quantity": self.quantity_var.get(),
             "volatility": self.volatility_var.get() / 100.0,  # Convert to decimal
+            "live_volatility": self.live_volatility_var.get(),
+            "live_volume": self.live_volume_var.get(),
             "fee_tier": self.fee_tier_var.get()
         }
         
     
+    def get_order_price(self):
+        """
+        Get the limit/stop price
+        
+        Returns:
+            float or None: The entered price, or None if blank or not a number
+        """
+        try:
+            return float(self.order_price_var.get())
+        except ValueError:
+            return None
+    
     def get_spot_asset(self):
         """
         Get the selected spot asset value
@@ -106,6 +137,18 @@ class InputPanel:
         return self.spot_asset_var.get()
     
     
+    def on_change(self, callback):
+        """
+        Call callback whenever any input variable is written
+        
+        Args:
+            callback (callable): Called without arguments on the Tk thread
+        """
+        for var in (self.exchange_var, self.spot_asset_var, self.order_type_var, self.order_price_var,
+                    self.quantity_var, self.volatility_var, self.live_volatility_var,
+                    self.live_volume_var, self.fee_tier_var):
+            var.trace_add("write", lambda *args: callback())
+    
     def get_all_parameters(self):
         """
         Get all input parameters in a structured format
@@ -117,7 +160,10 @@ class InputPanel:
             "exchange": self.exchange_var.get(),
             "spot_asset": self.spot_asset_var.get(),
             "order_type": self.order_type_var.get(),
+            "limit_price": self.get_order_price(),
             "quantity": self.quantity_var.get(),
             "volatility": self.volatility_var.get() / 100.0,  # Convert percentage to decimal
+            "live_volatility": self.live_volatility_var.get(),
+            "live_volume": self.live_volume_var.get(),
             "fee_tier": self.fee_tier_var.get()
         }
\ No newline at end of file
@@ -4,13 +4,23 @@
 Trade Simulator - Main Window UI Component
 """
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import logging
 from trade_simulator.ui.input_panel import InputPanel
 from trade_simulator.ui.output_panel import OutputPanel
 from trade_simulator.ui.visualization import OrderbookVisualization
+from trade_simulator.ui.refresh_scheduler import RefreshScheduler
 from trade_simulator.ui.styles import configure_styles
 from trade_simulator.network.websocket_client import WebSocketClient
+from trade_simulator.models.book_builder import OrderBookBuilder
+from trade_simulator.models.limit_orders import LimitOrderModel
+from trade_simulator.models.market_stats import MarketStatistics
+from trade_simulator.models.online_models import OnlineCostModels
+from trade_simulator.models.trading_models import TradingModels
+from trade_simulator.models.compute_worker import ComputeWorker
+from trade_simulator.utils.mailbox import ConflatingMailbox
+from trade_simulator.utils.performance_monitor import PerformanceMonitor
+from trade_simulator.utils.latency_trace import LatencyTracer
 
 # Remove duplicate import
 # from .input_panel import InputPanel
@@ -31,13 +41,37 @@ class TradeSimulatorWindow:
         
         # Initialize data structures
         self.websocket_client = None
-        self.orderbook = None
+        
+        # Latest parsed book handed from the WebSocket thread to the Tk thread
+        self.book_mailbox = ConflatingMailbox()
+        self.book_builder = None
+        self.connected = False
+        
+        # Hot-path spans from the network, model and UI layers
+        self.monitor = PerformanceMonitor()
+        
+        # Tick-to-display traces of the books that reached the screen
+        self.tracer = LatencyTracer(self.monitor)
+        
+        # Long-lived calculation engine, run by the compute worker off the Tk thread;
+        # its online models, market statistics and queue model are updated from every book the worker sees
+        self.models = TradingModels(monitor=self.monitor, online_models=OnlineCostModels(),
+                                    market_stats=MarketStatistics(), limit_orders=LimitOrderModel())
+        # Asset the streamed model state belongs to
+        self.model_asset = None
+        self.compute_worker = None
         
         # Configure styles
         configure_styles()
         
         # Create UI components
         self.setup_ui()
+        
+        # Frames run when a new book, result or input arrives instead of on a fixed timer
+        self.scheduler = RefreshScheduler(self.root, self.update_frame)
+        self.scheduler.watch("book", lambda: self.book_mailbox.sequence)
+        self.scheduler.watch("result", lambda: self.compute_worker.results.sequence if self.compute_worker else 0)
+        self.input_panel.on_change(lambda: self.scheduler.mark_dirty("inputs"))
     
     def setup_ui(self):
         """Set up the user interface"""
@@ -92,6 +126,11 @@ class TradeSimulatorWindow:
                                      command=self.stop_simulation, style="Stop.TButton")
         self.stop_button.pack(side=tk.LEFT, padx=10)
         self.stop_button.configure(state=tk.DISABLED)
+        
+        # Export button
+        self.export_button = ttk.Button(button_frame, text="Export Latency Trace",
+                                       command=self.export_latency_trace)
+        self.export_button.pack(side=tk.LEFT, padx=10)
     
     def start_simulation(self):
         """Start the trade simulation"""
@@ -107,12 +146,26 @@ class TradeSimulatorWindow:
             # Create WebSocket URI
             uri = f"wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/{asset}"
             
+            # Streamed statistics of another asset would mix two price series
+            if asset != self.model_asset:
+                self.models.reset_market_state()
+                self.model_asset = asset
+            
+            # Start the compute stage before the feed so no book is missed
+            self.compute_worker = ComputeWorker(self.models, monitor=self.monitor)
+            self.compute_worker.set_parameters(self.input_panel.get_all_parameters())
+            self.compute_worker.start()
+            
+            # Fresh book state for this session; a book that falls out of
+            # sync reconnects the feed to receive a new snapshot
+            self.book_builder = OrderBookBuilder(on_resync=self.request_resync)
+            
             # Initialize WebSocket client
-            self.websocket_client = WebSocketClient(uri, self.process_orderbook_data)
+            self.websocket_client = WebSocketClient(uri, self.process_orderbook_data, monitor=self.monitor)
             self.websocket_client.start()
             
-            # Start update loop
-            self.update_loop()
+            # Start refreshing the display
+            self.scheduler.start()
             
             logger.info(f"Simulation started for {asset}")
         except Exception as e:
@@ -123,60 +176,137 @@ class TradeSimulatorWindow:
     def stop_simulation(self):
         """Stop the trade simulation"""
         try:
+            self.scheduler.stop()
+            
             # Stop WebSocket client
             if self.websocket_client:
                 self.websocket_client.stop()
                 self.websocket_client = None
             
+            # Stop compute worker
+            if self.compute_worker:
+                self.compute_worker.stop()
+                self.compute_worker = None
+            
             # Update UI state
             self.start_button.configure(state=tk.NORMAL)
             self.stop_button.configure(state=tk.DISABLED)
             self.output_panel.update_status("Disconnected")
+            self.connected = False
             
             logger.info("Simulation stopped")
         except Exception as e:
             logger.error(f"Error stopping simulation: {e}")
     
+    def export_latency_trace(self):
+        """Save the tick-to-display traces collected so far as CSV"""
+        try:
+            path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                                filetypes=[("CSV files", "*.csv")],
+                                                initialfile="latency_trace.csv")
+            if not path:
+                return
+            rows = self.tracer.export_csv(path)
+            logger.info(f"Exported {rows} latency traces to {path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export latency trace: {e}")
+            logger.error(f"Failed to export latency trace: {e}")
+    
+    def request_resync(self, reason):
+        """Ask the feed for a fresh snapshot after the book went out of sync"""
+        if self.websocket_client:
+            self.websocket_client.request_resync(reason)
+    
     def process_orderbook_data(self, data):
         """Process orderbook data received from WebSocket"""
         try:
-            self.orderbook = data
-            
-            # Update status
-            self.output_panel.update_status("Connected")
+            # Apply the snapshot or delta; every consumer reads the resulting arrays
+            start_ns = self.monitor.now()
+            if not self.book_builder.apply(data):
+                return
+            orderbook = self.book_builder.orderbook
+            if not orderbook.is_valid:
+                return
+            self.monitor.stop("book_build", start_ns)
+            sequence = self.book_mailbox.put(orderbook)
+            if self.compute_worker:
+                # Trace the book from the arrival of its frame on the feed thread
+                client = self.websocket_client
+                trace = self.tracer.begin(sequence, data.get('timestamp'),
+                                          client.receive_time if client else None,
+                                          client.receive_ns if client else None)
+                self.compute_worker.submit(orderbook, sequence, trace)
         except Exception as e:
             logger.error(f"Error processing orderbook data: {e}")
     
-    def update_loop(self):
-        """Update UI with latest calculations"""
+    def internal_latency(self):
+        """Median receive-to-display latency in seconds (tick handling time before any tick was displayed)"""
+        stats = self.tracer.stats("internal")
+        if stats is None:
+            return self.websocket_client.average_processing_time
+        return stats["p50_us"] / 1e6
+    
+    def update_frame(self, reasons):
+        """
+        Update UI with latest calculations
+        
+        Args:
+            reasons (set): Dirty flags from the scheduler: 'book', 'result', 'inputs' and/or 'heartbeat'
+        """
         if not self.websocket_client or not self.websocket_client.running:
             return
         
         try:
-            # Check if we've received orderbook data
-            if self.orderbook:
-                # Get input values from input panel
-                params = self.input_panel.get_all_parameters()
-                
-                # Calculate mid price
-                mid_price = (float(self.orderbook['asks'][0][0]) + float(self.orderbook['bids'][0][0])) / 2
-                
+            # Publish the current inputs; the worker re-evaluates when they change
+            if "inputs" in reasons:
+                try:
+                    self.compute_worker.set_parameters(self.input_panel.get_all_parameters())
+                except tk.TclError:
+                    pass  # Numeric field is incomplete while the user is typing
+            
+            # Report outages while the supervisor reconnects
+            if self.connected and not self.websocket_client.connected:
+                stats = self.websocket_client.connection_stats
+                self.output_panel.update_status(f"Reconnecting (attempt {stats['failures'] + 1})...")
+                self.connected = False
+            
+            # Count feed ticks that arrived and were superseded since the last frame
+            book_update = self.book_mailbox.take()
+            if book_update is not None:
+                if not self.connected:
+                    self.output_panel.update_status("Connected")
+                    self.connected = True
+                self.output_panel.update_conflation(book_update.conflated,
+                                                    self.book_mailbox.total_conflated)
+            
+            # Display the newest result published by the compute worker, if any
+            result = self.compute_worker.results.take()
+            if result is not None:
+                snapshot = result.value
                 # Update current price in output panel
-                self.output_panel.update_price(mid_price)
+                self.output_panel.update_price(snapshot.price)
                 
                 # Update output panel with calculated metrics
+                start_ns = self.monitor.now()
                 self.output_panel.update_metrics(
-                    self.orderbook, 
-                    params, 
-                    mid_price,
-                    self.websocket_client.average_processing_time
+                    snapshot,
+                    self.internal_latency(),
+                    self.compute_worker.queue_depth
                 )
+                start_ns = self.monitor.stop("ui_format", start_ns)
                 
                 # Update visualization
-                self.visualization.update_visualization(self.orderbook)
+                self.visualization.update_visualization(snapshot.orderbook)
+                render_ns = self.monitor.stop("redraw", start_ns)
+                
+                # Close the trace of the displayed book; re-evaluations carry none
+                if snapshot.trace is not None:
+                    self.tracer.complete(snapshot.trace, render_ns)
+                    self.output_panel.update_latency(self.tracer.summary())
             
-            # Schedule next update
-            self.root.after(100, self.update_loop)
+            # Rates and percentiles change with time, not only with new results
+            if result is not None or "heartbeat" in reasons:
+                self.output_panel.update_performance(self.monitor.messages_per_second,
+                                                     self.monitor.stage_stats("receive"))
         except Exception as e:
-            logger.error(f"Error in update loop: {e}")
-            self.root.after(100, self.update_loop)
\ No newline at end of file
+            logger.error(f"Error in update frame: {e}")
\ No newline at end of file
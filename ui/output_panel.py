@@ -19,12 +19,20 @@ class OutputPanel:
         
         # Initialize variables
         self.slippage_var = tk.StringVar(value="0.00%")
+        self.fill_ratio_var = tk.StringVar(value="100.00%")
         self.fees_var = tk.StringVar(value="$0.00")
         self.market_impact_var = tk.StringVar(value="$0.00")
         self.net_cost_var = tk.StringVar(value="$0.00")
         self.maker_taker_var = tk.StringVar(value="0%/100%")
         self.latency_var = tk.StringVar(value="0.00 ms")
         self.current_price_var = tk.StringVar(value="$0.00")
+        self.queue_depth_var = tk.StringVar(value="0")
+        self.conflated_var = tk.StringVar(value="0 (total 0)")
+        self.throughput_var = tk.StringVar(value="0.0 msg/s")
+        self.tick_percentiles_var = tk.StringVar(value="- / - µs")
+        self.network_latency_var = tk.StringVar(value="- / - ms")
+        self.queue_compute_var = tk.StringVar(value="- / - ms")
+        self.render_latency_var = tk.StringVar(value="- / - ms")
         self.status_var = tk.StringVar(value="Disconnected")
         
         # Set up UI
@@ -46,34 +54,66 @@ class OutputPanel:
         ttk.Label(output_params_frame, text="Expected Slippage:", style="Title.TLabel").grid(row=0, column=0, sticky=tk.W, pady=5)
         ttk.Label(output_params_frame, textvariable=self.slippage_var, style="Output.TLabel").grid(row=0, column=1, sticky=tk.E, padx=10, pady=5)
         
+        # Fill ratio (below 100% when the book is too thin for the order)
+        ttk.Label(output_params_frame, text="Fill Ratio:", style="Title.TLabel").grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.fill_ratio_var, style="Output.TLabel").grid(row=1, column=1, sticky=tk.E, padx=10, pady=5)
+        
         # Expected Fees
-        ttk.Label(output_params_frame, text="Expected Fees:", style="Title.TLabel").grid(row=1, column=0, sticky=tk.W, pady=5)
-        ttk.Label(output_params_frame, textvariable=self.fees_var, style="Output.TLabel").grid(row=1, column=1, sticky=tk.E, padx=10, pady=5)
+        ttk.Label(output_params_frame, text="Expected Fees:", style="Title.TLabel").grid(row=2, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.fees_var, style="Output.TLabel").grid(row=2, column=1, sticky=tk.E, padx=10, pady=5)
         
         # Expected Market Impact
-        ttk.Label(output_params_frame, text="Expected Market Impact:", style="Title.TLabel").grid(row=2, column=0, sticky=tk.W, pady=5)
-        ttk.Label(output_params_frame, textvariable=self.market_impact_var, style="Output.TLabel").grid(row=2, column=1, sticky=tk.E, padx=10, pady=5)
+        ttk.Label(output_params_frame, text="Expected Market Impact:", style="Title.TLabel").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.market_impact_var, style="Output.TLabel").grid(row=3, column=1, sticky=tk.E, padx=10, pady=5)
         
         # Net Cost
-        ttk.Label(output_params_frame, text="Net Cost:", style="Title.TLabel").grid(row=3, column=0, sticky=tk.W, pady=5)
-        ttk.Label(output_params_frame, textvariable=self.net_cost_var, style="Output.TLabel").grid(row=3, column=1, sticky=tk.E, padx=10, pady=5)
+        ttk.Label(output_params_frame, text="Net Cost:", style="Title.TLabel").grid(row=4, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.net_cost_var, style="Output.TLabel").grid(row=4, column=1, sticky=tk.E, padx=10, pady=5)
         
         # Maker/Taker proportion
-        ttk.Label(output_params_frame, text="Maker/Taker proportion:", style="Title.TLabel").grid(row=4, column=0, sticky=tk.W, pady=5)
-        ttk.Label(output_params_frame, textvariable=self.maker_taker_var, style="Output.TLabel").grid(row=4, column=1, sticky=tk.E, padx=10, pady=5)
+        ttk.Label(output_params_frame, text="Maker/Taker proportion:", style="Title.TLabel").grid(row=5, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.maker_taker_var, style="Output.TLabel").grid(row=5, column=1, sticky=tk.E, padx=10, pady=5)
         
         # Internal Latency
-        ttk.Label(output_params_frame, text="Internal Latency:", style="Title.TLabel").grid(row=5, column=0, sticky=tk.W, pady=5)
-        ttk.Label(output_params_frame, textvariable=self.latency_var, style="Output.TLabel").grid(row=5, column=1, sticky=tk.E, padx=10, pady=5)
+        ttk.Label(output_params_frame, text="Internal Latency:", style="Title.TLabel").grid(row=6, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.latency_var, style="Output.TLabel").grid(row=6, column=1, sticky=tk.E, padx=10, pady=5)
         
         # Current Price
-        ttk.Label(output_params_frame, text="Current Price:", style="Title.TLabel").grid(row=6, column=0, sticky=tk.W, pady=5)
-        ttk.Label(output_params_frame, textvariable=self.current_price_var, style="Output.TLabel").grid(row=6, column=1, sticky=tk.E, padx=10, pady=5)
+        ttk.Label(output_params_frame, text="Current Price:", style="Title.TLabel").grid(row=7, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.current_price_var, style="Output.TLabel").grid(row=7, column=1, sticky=tk.E, padx=10, pady=5)
+        
+        # Compute queue depth (books waiting for the compute worker)
+        ttk.Label(output_params_frame, text="Compute Queue:", style="Title.TLabel").grid(row=8, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.queue_depth_var, style="Output.TLabel").grid(row=8, column=1, sticky=tk.E, padx=10, pady=5)
+        
+        # Feed ticks conflated between UI frames
+        ttk.Label(output_params_frame, text="Conflated Ticks:", style="Title.TLabel").grid(row=9, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.conflated_var, style="Output.TLabel").grid(row=9, column=1, sticky=tk.E, padx=10, pady=5)
+        
+        # Feed message rate
+        ttk.Label(output_params_frame, text="Throughput:", style="Title.TLabel").grid(row=10, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.throughput_var, style="Output.TLabel").grid(row=10, column=1, sticky=tk.E, padx=10, pady=5)
+        
+        # Per-tick processing time percentiles on the feed thread
+        ttk.Label(output_params_frame, text="Tick Time p50/p99:", style="Title.TLabel").grid(row=11, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.tick_percentiles_var, style="Output.TLabel").grid(row=11, column=1, sticky=tk.E, padx=10, pady=5)
+        
+        # Exchange timestamp to receipt, p50/p99
+        ttk.Label(output_params_frame, text="Network Latency p50/p99:", style="Title.TLabel").grid(row=12, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.network_latency_var, style="Output.TLabel").grid(row=12, column=1, sticky=tk.E, padx=10, pady=5)
+        
+        # Median time waiting for the compute worker and computing
+        ttk.Label(output_params_frame, text="Queue / Compute p50:", style="Title.TLabel").grid(row=13, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.queue_compute_var, style="Output.TLabel").grid(row=13, column=1, sticky=tk.E, padx=10, pady=5)
+        
+        # Computed result to display, p50/p99
+        ttk.Label(output_params_frame, text="Render Latency p50/p99:", style="Title.TLabel").grid(row=14, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, textvariable=self.render_latency_var, style="Output.TLabel").grid(row=14, column=1, sticky=tk.E, padx=10, pady=5)
         
         # Status
-        ttk.Label(output_params_frame, text="Connection Status:", style="Title.TLabel").grid(row=7, column=0, sticky=tk.W, pady=5)
+        ttk.Label(output_params_frame, text="Connection Status:", style="Title.TLabel").grid(row=15, column=0, sticky=tk.W, pady=5)
         self.status_label = ttk.Label(output_params_frame, textvariable=self.status_var, style="Output.TLabel")
-        self.status_label.grid(row=7, column=1, sticky=tk.E, padx=10, pady=5)
+        self.status_label.grid(row=15, column=1, sticky=tk.E, padx=10, pady=5)
         
         # Configure grid weights
         output_params_frame.columnconfigure(1, weight=1)
@@ -88,6 +128,8 @@ class OutputPanel:
         try:
             if 'slippage' in values:
                 self.slippage_var.set(f"{values['slippage']*100:.4f}%")
+            if 'fill_ratio' in values:
+                self.fill_ratio_var.set(f"{values['fill_ratio']*100:.2f}%")
             if 'fees' in values:
                 self.fees_var.set(f"${values['fees']:.4f}")
             if 'market_impact' in values:
@@ -139,39 +181,72 @@ class OutputPanel:
         except Exception as e:
             self.logger.error(f"Error updating price: {e}")
 
-    def update_metrics(self, orderbook, params, mid_price, latency):
+    def update_conflation(self, conflated, total_conflated):
         """
-        Update all output metrics
+        Update the conflated tick counter
         
         Args:
-            orderbook (dict): Current orderbook data
-            params (dict): Input parameters
-            mid_price (float): Current mid price
+            conflated (int): Feed ticks superseded since the previous UI frame
+            total_conflated (int): Feed ticks superseded since the simulation started
+        """
+        try:
+            self.conflated_var.set(f"{conflated} (total {total_conflated})")
+        except Exception as e:
+            self.logger.error(f"Error updating conflation: {e}")
+    
+    def update_metrics(self, snapshot, latency, queue_depth):
+        """
+        Update all output metrics from a computed cost snapshot
+        
+        Args:
+            snapshot (CostSnapshot): Latest result published by the compute worker
             latency (float): Current processing latency
+            queue_depth (int): Books waiting for the compute worker
         """
         try:
-            from trade_simulator.models.trading_models import TradingModels
-            
-            models = TradingModels()
-            
-            # Calculate all metrics
-            maker_proportion = models.predict_maker_taker(orderbook, params['quantity'])
-            slippage = models.calculate_slippage(orderbook, params['quantity'], params['order_type'])
-            fees = models.calculate_fees(params['exchange'], params['fee_tier'], 
-                                    params['quantity'], mid_price, maker_proportion)
-            market_impact = models.calculate_market_impact(orderbook, params['quantity'], 
-                                                        params['volatility'], mid_price)
-            
-            # Calculate net cost
-            net_cost = (params['quantity'] * mid_price) * (1 + slippage) + fees + market_impact
-            
             # Update display values
-            self.slippage_var.set(f"{slippage*100:.4f}%")
-            self.fees_var.set(f"${fees:.2f}")
-            self.market_impact_var.set(f"${market_impact:.2f}")
-            self.net_cost_var.set(f"${net_cost:.2f}")
+            self.slippage_var.set(f"{snapshot.slippage*100:.4f}%")
+            self.fill_ratio_var.set(f"{snapshot.fill_ratio*100:.2f}%")
+            self.fees_var.set(f"${snapshot.fees:.2f}")
+            self.market_impact_var.set(f"${snapshot.market_impact:.2f}")
+            self.net_cost_var.set(f"${snapshot.net_cost:.2f}")
+            maker_proportion = snapshot.maker_proportion
             self.maker_taker_var.set(f"{maker_proportion*100:.1f}%/{(1-maker_proportion)*100:.1f}%")
             self.latency_var.set(f"{latency*1000:.2f} ms")
+            self.queue_depth_var.set(str(queue_depth))
+            
+        except Exception as e:
+            self.logger.error(f"Error updating metrics: {e}")
+    
+    def update_performance(self, messages_per_second, tick_stats):
+        """
+        Update the throughput and tick processing percentiles
+        
+        Args:
+            messages_per_second (float): Feed message rate
+            tick_stats (dict): PerformanceMonitor stage stats of the 'receive' stage, or None
+        """
+        try:
+            self.throughput_var.set(f"{messages_per_second:.1f} msg/s")
+            if tick_stats:
+                self.tick_percentiles_var.set(f"{tick_stats['p50_us']:.0f} / {tick_stats['p99_us']:.0f} µs")
+        except Exception as e:
+            self.logger.error(f"Error updating performance: {e}")
+    
+    def update_latency(self, summary):
+        """
+        Update the tick-to-display latency breakdown
+        
+        Args:
+            summary (dict): LatencyTracer.summary() stage stats keyed by latency stage
+        """
+        try:
+            def ms(stage, key):
+                stats = summary.get(stage)
+                return "-" if stats is None else f"{stats[key]/1000:.2f}"
             
+            self.network_latency_var.set(f"{ms('network', 'p50_us')} / {ms('network', 'p99_us')} ms")
+            self.queue_compute_var.set(f"{ms('queue', 'p50_us')} / {ms('compute', 'p50_us')} ms")
+            self.render_latency_var.set(f"{ms('render', 'p50_us')} / {ms('render', 'p99_us')} ms")
         except Exception as e:
-            self.logger.error(f"Error updating metrics: {e}")
\ No newline at end of file
+            self.logger.error(f"Error updating latency: {e}")
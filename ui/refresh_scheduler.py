@@ -0,0 +1,163 @@
+# trade_simulator/ui/refresh_scheduler.py
+import time
+
+
+class RefreshScheduler:
+    """
+    Runs the UI refresh only when something changed, at an adaptive rate
+
+    Changes are detected through dirty flags:
+    - Watched versions: counters such as a mailbox sequence number, which
+      other threads bump. They are polled on the Tk thread, since Tk may
+      not be called from other threads.
+    - mark_dirty(): called from the Tk thread, e.g. by an input variable
+      trace. It schedules the next frame as early as the rate allows.
+    - A heartbeat: refreshes time-based displays such as connection status
+      even when nothing else changes.
+
+    When nothing changed, the poll delay doubles up to max_interval, so a
+    quiet feed costs a few cheap checks per second. While changes keep
+    arriving, frames run every min_interval. When the measured frame time
+    exceeds frame_budget, the interval stretches in proportion, so slow
+    frames cannot saturate the Tk thread.
+
+    Only root.after and root.after_cancel are used, so any object with
+    that interface can drive the scheduler.
+    """
+    def __init__(self, root, refresh, min_interval=0.016, max_interval=0.25, heartbeat=1.0,
+                 frame_budget=0.008, smoothing=0.2, clock=time.perf_counter):
+        """
+        Initialize the scheduler
+
+        Args:
+            root: Tk root (or any object with after/after_cancel)
+            refresh (callable): Called on the Tk thread with the set of dirty reasons
+            min_interval (float): Shortest time between frame starts in seconds
+            max_interval (float): Longest poll delay while idle in seconds
+            heartbeat (float): Seconds after which a frame runs even if nothing changed
+            frame_budget (float): Frame time in seconds above which the frame rate is throttled
+            smoothing (float): Weight of the newest frame time in its moving average
+            clock (callable): Monotonic clock in seconds
+        """
+        self.root = root
+        self.refresh = refresh
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.heartbeat = heartbeat
+        self.frame_budget = frame_budget
+        self.smoothing = smoothing
+        self.clock = clock
+
+        self.running = False
+        self.frame_time = 0.0
+        self.interval = min_interval
+        self.frames = 0
+        self.idle_polls = 0
+
+        self._sources = {}
+        self._versions = {}
+        self._dirty = set()
+        self._poll_delay = min_interval
+        self._last_frame = None
+        self._pending = None
+        self._due = None
+
+    def watch(self, name, version):
+        """
+        Mark name dirty whenever version() returns a new value
+
+        Args:
+            name (str): Dirty reason passed to refresh
+            version (callable): Returns a counter that changes with the data, e.g. a
+                mailbox sequence; must be cheap and safe to call from the Tk thread
+        """
+        self._sources[name] = version
+        self._versions[name] = None
+
+    def mark_dirty(self, reason):
+        """
+        Request a frame for reason as soon as the frame rate allows (Tk thread only)
+
+        Args:
+            reason (str): Dirty reason passed to refresh
+        """
+        self._dirty.add(reason)
+        if self.running:
+            self._schedule(self._earliest_delay())
+
+    def start(self):
+        """Start polling; the first frame runs immediately"""
+        if self.running:
+            return
+        self.running = True
+        self._last_frame = None
+        self._poll_delay = self.min_interval
+        self._schedule(0.0)
+
+    def stop(self):
+        """Stop polling and cancel the pending frame"""
+        self.running = False
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+        self._pending = None
+        self._due = None
+
+    def _earliest_delay(self):
+        """Seconds until the next frame may start under the current interval"""
+        if self._last_frame is None:
+            return 0.0
+        return max(0.0, self._last_frame + self.interval - self.clock())
+
+    def _schedule(self, delay):
+        """Schedule the next tick after delay seconds unless one is already due sooner"""
+        due = self.clock() + delay
+        if self._pending is not None:
+            if self._due <= due:
+                return
+            self.root.after_cancel(self._pending)
+        self._due = due
+        self._pending = self.root.after(round(delay * 1000), self._tick)
+
+    def _tick(self):
+        """Run a frame if anything is dirty, then schedule the next check"""
+        self._pending = None
+        self._due = None
+        if not self.running:
+            return
+
+        reasons = self._dirty
+        self._dirty = set()
+        for name, version in self._sources.items():
+            value = version()
+            if value != self._versions[name]:
+                self._versions[name] = value
+                reasons.add(name)
+        now = self.clock()
+        if self._last_frame is None or now - self._last_frame >= self.heartbeat:
+            reasons.add("heartbeat")
+
+        if not reasons:
+            # Nothing changed: back off towards max_interval
+            self.idle_polls += 1
+            self._poll_delay = min(self._poll_delay * 2, self.max_interval)
+            self._schedule(self._poll_delay)
+            return
+
+        self._last_frame = now
+        try:
+            self.refresh(reasons)
+        finally:
+            frame_time = self.clock() - now
+            self.frames += 1
+            self.frame_time += self.smoothing * (frame_time - self.frame_time)
+            # Frames over budget stretch the interval in proportion
+            throttle = max(1.0, self.frame_time / self.frame_budget)
+            self.interval = self.min_interval * throttle
+            delay = self._earliest_delay()
+            if reasons == {"heartbeat"}:
+                # Still idle; keep polling at the backed-off rate
+                delay = max(delay, self._poll_delay)
+            else:
+                self._poll_delay = self.min_interval
+            if self.running:
+                self._schedule(delay)
@@ -8,6 +8,7 @@ from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import logging
+from trade_simulator.ui.depth_chart import DepthChart
 
 logger = logging.getLogger("TradeSimulator")
 
@@ -15,8 +16,10 @@ class OrderbookVisualization:
     """
     Orderbook visualization component for the Trade Simulator
     """
-    def __init__(self, parent):
+    def __init__(self, parent, levels=10):
         self.parent = parent
+        self.levels = levels
+        self.mode_var = tk.StringVar(value="bars")
         self.setup_visualization()
     
     def setup_visualization(self):
@@ -27,6 +30,14 @@ class OrderbookVisualization:
         ttk.Label(viz_header, text="Orderbook Visualization", 
                  style="Header.TLabel").pack(pady=10)
         
+        # Chart mode selector
+        mode_frame = ttk.Frame(self.parent)
+        mode_frame.pack(fill=tk.X, padx=20, pady=(10, 0))
+        ttk.Radiobutton(mode_frame, text="Levels", value="bars", variable=self.mode_var,
+                        command=self.on_mode_change).pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(mode_frame, text="Cumulative Depth", value="depth", variable=self.mode_var,
+                        command=self.on_mode_change).pack(side=tk.LEFT, padx=5)
+        
         # Create a frame for the visualization
         self.viz_frame = ttk.Frame(self.parent)
         self.viz_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -41,47 +52,29 @@ class OrderbookVisualization:
     
     def initialize_plot(self):
         """Initialize the orderbook plot"""
-        self.ax.set_title("Order Book Depth")
-        self.ax.set_xlabel("Price")
-        self.ax.set_ylabel("Quantity")
-        
-        # Initialize plot data
-        self.bid_bars = self.ax.bar([], [], color='green', alpha=0.5, label='Bids')
-        self.ask_bars = self.ax.bar([], [], color='red', alpha=0.5, label='Asks')
-        self.ax.legend()
-        
+        # Persistent artists on the Tk canvas, redrawn by blitting
+        self.chart = DepthChart(self.ax, levels=self.levels, mode=self.mode_var.get())
+        self.fig.tight_layout()
         self.canvas.draw()
     
+    def on_mode_change(self):
+        """Switch between level bars and the cumulative depth curve"""
+        try:
+            self.chart.set_mode(self.mode_var.get())
+        except Exception as e:
+            logger.error(f"Error changing visualization mode: {e}")
+    
     def update_visualization(self, orderbook):
-        """Update the orderbook visualization with new data"""
+        """
+        Update the orderbook visualization with a parsed OrderBook
+        
+        Returns:
+            bool: True if the chart was redrawn, False if the top levels were unchanged
+        """
         try:
             if not orderbook:
-                return
-                
-            # Clear previous plot
-            self.ax.clear()
-            
-            # Extract price and quantity for asks and bids
-            ask_prices = [float(level[0]) for level in orderbook['asks'][:10]]
-            ask_quantities = [float(level[1]) for level in orderbook['asks'][:10]]
-            
-            bid_prices = [float(level[0]) for level in orderbook['bids'][:10]]
-            bid_quantities = [float(level[1]) for level in orderbook['bids'][:10]]
-            
-            # Create the plot
-            self.ax.bar(ask_prices, ask_quantities, color='red', alpha=0.5, label='Asks')
-            self.ax.bar(bid_prices, bid_quantities, color='green', alpha=0.5, label='Bids')
-            
-            # Set labels and title
-            self.ax.set_title("Order Book Depth")
-            self.ax.set_xlabel("Price")
-            self.ax.set_ylabel("Quantity")
-            self.ax.legend()
-            
-            # Format x-axis to show fewer price labels and with proper formatting
-            self.ax.tick_params(axis='x', rotation=45)
-            
-            # Refresh canvas
-            self.canvas.draw()
+                return False
+            return self.chart.update(orderbook)
         except Exception as e:
-            logger.error(f"Error updating orderbook visualization: {e}")
\ No newline at end of file
+            logger.error(f"Error updating orderbook visualization: {e}")
+            return False
@@ -0,0 +1,167 @@
+# trade_simulator/utils/latency_trace.py
+import csv
+import threading
+import time
+from collections import deque
+
+from .timestamps import parse_exchange_timestamp
+
+# Latency components of one tick; network + queue + compute + render = total
+LATENCY_STAGES = ("network", "queue", "compute", "render", "internal", "total")
+
+TRACE_COLUMNS = ("sequence", "exchange_time", "receive_time") + tuple(f"{stage}_ms" for stage in LATENCY_STAGES)
+
+
+class TickTrace:
+    """
+    Timestamps of one book on its way from the exchange to the screen
+
+    The exchange and receive times are epoch seconds so they can be compared
+    with each other; the pipeline stamps are time.perf_counter_ns values.
+    Each stage stamps the trace as the book passes through it:
+
+        receive_ns        frame arrived on the feed thread
+        compute_start_ns  compute worker took the book off its queue
+        compute_done_ns   cost models finished
+        render_ns         UI finished displaying the result
+    """
+    __slots__ = ("sequence", "exchange_time", "receive_time", "receive_ns",
+                 "compute_start_ns", "compute_done_ns", "render_ns")
+
+    def __init__(self, sequence=0, exchange_time=None, receive_time=None, receive_ns=None):
+        self.sequence = sequence
+        self.exchange_time = exchange_time
+        self.receive_time = time.time() if receive_time is None else receive_time
+        self.receive_ns = time.perf_counter_ns() if receive_ns is None else receive_ns
+        self.compute_start_ns = None
+        self.compute_done_ns = None
+        self.render_ns = None
+
+    @property
+    def is_complete(self):
+        """True once every pipeline stage has stamped the trace"""
+        return None not in (self.compute_start_ns, self.compute_done_ns, self.render_ns)
+
+    def latencies(self):
+        """
+        Latency of each stage in seconds
+
+        Queueing runs from frame arrival to the start of compute, so it also
+        covers decoding and building the book. Network latency (and with it
+        the total) is None when the message had no exchange timestamp.
+
+        Returns:
+            dict: Seconds keyed by LATENCY_STAGES; None for stages not reached yet
+        """
+        network = None if self.exchange_time is None else self.receive_time - self.exchange_time
+        queue = compute = render = internal = None
+        if self.compute_start_ns is not None:
+            queue = (self.compute_start_ns - self.receive_ns) / 1e9
+        if self.compute_done_ns is not None and self.compute_start_ns is not None:
+            compute = (self.compute_done_ns - self.compute_start_ns) / 1e9
+        if self.render_ns is not None:
+            internal = (self.render_ns - self.receive_ns) / 1e9
+            if self.compute_done_ns is not None:
+                render = (self.render_ns - self.compute_done_ns) / 1e9
+        total = None if network is None or internal is None else network + internal
+        return {"network": network, "queue": queue, "compute": compute, "render": render,
+                "internal": internal, "total": total}
+
+
+class LatencyTracer:
+    """
+    Collects completed tick traces and their latency distributions
+
+    Every stage latency of a completed trace is recorded in the
+    PerformanceMonitor as a 'latency.<stage>' span, so the monitor's
+    percentiles and reports cover them. The completed traces themselves are
+    kept in a bounded buffer and can be exported as CSV.
+    """
+    def __init__(self, monitor, max_traces=10000):
+        """
+        Initialize the tracer
+
+        Args:
+            monitor (PerformanceMonitor): Receives the latency spans and network latencies
+            max_traces (int): Completed traces kept for export
+        """
+        self.monitor = monitor
+        self.lock = threading.Lock()
+        self.traces = deque(maxlen=max_traces)
+        self.completed = 0
+
+    def begin(self, sequence, exchange_timestamp, receive_time=None, receive_ns=None):
+        """
+        Start the trace of a book received from the feed
+
+        Args:
+            sequence (int): Feed sequence number of the book
+            exchange_timestamp: Timestamp field of the L2 message (ISO string or epoch)
+            receive_time (float): Epoch seconds when the frame arrived (now if None)
+            receive_ns (int): perf_counter_ns when the frame arrived (now if None)
+
+        Returns:
+            TickTrace: Trace to hand along with the book
+        """
+        trace = TickTrace(sequence, parse_exchange_timestamp(exchange_timestamp), receive_time, receive_ns)
+        if trace.exchange_time is not None:
+            self.monitor.record_network_latency(trace.exchange_time, trace.receive_time)
+        return trace
+
+    def complete(self, trace, render_ns=None):
+        """
+        Stamp the render time of a trace and record its latencies
+
+        Args:
+            trace (TickTrace): Trace of the book that was just displayed
+            render_ns (int): perf_counter_ns when rendering finished (now if None)
+        """
+        trace.render_ns = time.perf_counter_ns() if render_ns is None else render_ns
+        for stage, seconds in trace.latencies().items():
+            if seconds is not None:
+                self.monitor.record_span(f"latency.{stage}", int(seconds * 1e9))
+        with self.lock:
+            self.traces.append(trace)
+            self.completed += 1
+
+    def stats(self, stage):
+        """PerformanceMonitor stage stats of one latency stage, or None if never recorded"""
+        return self.monitor.stage_stats(f"latency.{stage}")
+
+    def summary(self):
+        """Stage stats keyed by latency stage, for stages recorded so far"""
+        summary = {}
+        for stage in LATENCY_STAGES:
+            stats = self.stats(stage)
+            if stats is not None:
+                summary[stage] = stats
+        return summary
+
+    def rows(self):
+        """Completed traces as tuples ordered like TRACE_COLUMNS"""
+        with self.lock:
+            traces = list(self.traces)
+        rows = []
+        for trace in traces:
+            latencies = trace.latencies()
+            rows.append((trace.sequence, trace.exchange_time, trace.receive_time) +
+                        tuple(None if latencies[stage] is None else latencies[stage] * 1e3
+                              for stage in LATENCY_STAGES))
+        return rows
+
+    def export_csv(self, path):
+        """
+        Write the completed traces to a CSV file, one row per displayed tick
+
+        Args:
+            path (str): Output file path
+
+        Returns:
+            int: Number of rows written
+        """
+        rows = self.rows()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(TRACE_COLUMNS)
+            writer.writerows(rows)
+        return len(rows)
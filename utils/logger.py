@@ -4,9 +4,10 @@ import logging
 def setup_logger(name="TradeSimulator"):
     """Configure and return a logger with the specified name"""
     logger = logging.getLogger(name)
-    
-    # Only set up handlers if they don't exist to prevent duplicate logs
-    if not logger.handlers:
+
+    # Only set up handlers once to prevent duplicate logs; basicConfig ignores
+    # repeat calls, so creating the (file-opening) handlers again would leak them
+    if not logging.getLogger().handlers:
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -15,5 +16,5 @@ def setup_logger(name="TradeSimulator"):
                 logging.StreamHandler()
             ]
         )
-    
-    return logger
\ No newline at end of file
+
+    return logger
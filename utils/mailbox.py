@@ -0,0 +1,69 @@
+# trade_simulator/utils/mailbox.py
+import threading
+from collections import namedtuple
+
+# Result of ConflatingMailbox.take: the newest value, its sequence number and
+# how many earlier values were overwritten since the previous take
+MailboxItem = namedtuple("MailboxItem", ["sequence", "value", "conflated"])
+
+
+class ConflatingMailbox:
+    """
+    Latest-value mailbox for handing data from a producer thread to a consumer
+
+    The producer overwrites the slot on every put and the consumer only ever
+    sees the newest value together with its sequence number, so a reader can
+    never observe a half-replaced value. Values overwritten before the
+    consumer took them are counted as conflated.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._value = None
+        self._taken_sequence = 0
+        self.total_conflated = 0
+
+    def put(self, value):
+        """
+        Publish a new value
+
+        Args:
+            value: Value to publish; should be immutable once published
+
+        Returns:
+            int: Sequence number assigned to the value
+        """
+        with self._lock:
+            self._sequence += 1
+            self._value = value
+            return self._sequence
+
+    def take(self):
+        """
+        Take the newest value if it has not been taken yet
+
+        Returns:
+            MailboxItem or None: The newest value, or None if nothing new was put
+        """
+        with self._lock:
+            if self._sequence == self._taken_sequence:
+                return None
+            conflated = self._sequence - self._taken_sequence - 1
+            self._taken_sequence = self._sequence
+            self.total_conflated += conflated
+            return MailboxItem(self._sequence, self._value, conflated)
+
+    def peek(self):
+        """
+        Read the newest value without marking it as taken
+
+        Returns:
+            MailboxItem: The newest value (None before the first put), with conflated set to 0
+        """
+        with self._lock:
+            return MailboxItem(self._sequence, self._value, 0)
+
+    @property
+    def sequence(self):
+        """Sequence number of the newest value (0 before the first put)"""
+        return self._sequence
@@ -1,34 +1,261 @@
+# trade_simulator/utils/performance_monitor.py
 import time
 import threading
 from collections import deque
+from contextlib import contextmanager
 import numpy as np
 
+# Hot-path stages in pipeline order; any other stage name may be recorded too
+STAGES = (
+    "receive",             # Whole handling of one feed frame on the feed thread
+    "decode",              # Frame to dict/arrays
+    "book_build",          # Applying the message and building the OrderBook
+    "model.maker_taker",
+    "model.slippage",
+    "model.fees",
+    "model.impact",
+    "compute",             # All models for one book on the compute worker
+    "ui_format",           # Formatting results into the output panel
+    "redraw",              # Orderbook chart update
+)
+
+PERCENTILES = (50, 99, 99.9)
+
+
+class _SpanWindow:
+    """Recent durations of one stage plus all-time count, total and maximum"""
+    __slots__ = ("durations", "count", "total_ns", "max_ns")
+
+    def __init__(self, window_size):
+        self.durations = deque(maxlen=window_size)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns):
+        self.durations.append(duration_ns)
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+
 class PerformanceMonitor:
-    def __init__(self, window_size=1000):
-        self.processing_times = deque(maxlen=window_size)
-        self.ui_update_times = deque(maxlen=window_size)
-        self.network_latencies = deque(maxlen=window_size)
+    """
+    Instrumentation shared by the network, model and UI layers
+
+    Stages are timed with time.perf_counter_ns and recorded as spans. Each
+    stage keeps a window of recent durations for percentiles plus all-time
+    counters; recording is an O(1) append, and percentiles are only computed
+    when metrics are read. Message arrivals are timestamped separately, so
+    the message rate is measured over real elapsed time.
+    """
+    def __init__(self, window_size=1000, rate_window=5.0):
+        """
+        Initialize the monitor
+
+        Args:
+            window_size (int): Recent spans kept per stage for percentiles
+            rate_window (float): Seconds of message arrivals used for the message rate
+        """
+        self.window_size = window_size
+        self.rate_window_ns = int(rate_window * 1e9)
         self.lock = threading.Lock()
-        
-    def record_processing_time(self, start_time):
+        self._spans = {}
+        self._message_times = deque()
+        self._first_message_ns = None
+        self.messages = 0
+        self.network_latencies = deque(maxlen=window_size)
+        self._stats_sources = {}
+
+    @staticmethod
+    def now():
+        """Monotonic timestamp in nanoseconds for starting a span"""
+        return time.perf_counter_ns()
+
+    def record_span(self, stage, duration_ns):
+        """
+        Record the duration of one stage
+
+        Args:
+            stage (str): Stage name, e.g. 'decode' or 'model.slippage'
+            duration_ns (int): Duration in nanoseconds
+        """
         with self.lock:
-            self.processing_times.append(time.time() - start_time)
-    
-    def record_ui_update(self, duration):
+            window = self._spans.get(stage)
+            if window is None:
+                window = self._spans[stage] = _SpanWindow(self.window_size)
+            window.add(duration_ns)
+
+    def stop(self, stage, start_ns):
+        """
+        Record a span that started at start_ns and return the current time
+
+        The return value can start the next span, so consecutive stages are
+        timed with one clock read each:
+
+            t = monitor.now()
+            decode(...)
+            t = monitor.stop("decode", t)
+            build(...)
+            monitor.stop("book_build", t)
+
+        Args:
+            stage (str): Stage name
+            start_ns (int): Value from now() when the stage started
+
+        Returns:
+            int: Current perf_counter_ns
+        """
+        end_ns = time.perf_counter_ns()
+        self.record_span(stage, end_ns - start_ns)
+        return end_ns
+
+    @contextmanager
+    def span(self, stage):
+        """Context manager timing the enclosed block as one span of a stage"""
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_span(stage, time.perf_counter_ns() - start_ns)
+
+    def record_message(self):
+        """Count one received message for the message rate"""
+        now_ns = time.perf_counter_ns()
         with self.lock:
-            self.ui_update_times.append(duration)
-    
-    def record_network_latency(self, server_time):
+            if self._first_message_ns is None:
+                self._first_message_ns = now_ns
+            self.messages += 1
+            self._message_times.append(now_ns)
+            horizon = now_ns - self.rate_window_ns
+            while self._message_times[0] < horizon:
+                self._message_times.popleft()
+
+    @property
+    def messages_per_second(self):
+        """Message rate over the rate window (or since the first message, if sooner)"""
+        now_ns = time.perf_counter_ns()
         with self.lock:
-            self.network_latencies.append(time.time() - server_time)
-    
+            horizon = now_ns - self.rate_window_ns
+            while self._message_times and self._message_times[0] < horizon:
+                self._message_times.popleft()
+            if not self._message_times:
+                return 0.0
+            elapsed_ns = min(now_ns - self._first_message_ns, self.rate_window_ns)
+            return len(self._message_times) / (max(elapsed_ns, 1) / 1e9)
+
+    def durations(self, stage):
+        """Recent durations of a stage in nanoseconds as an int64 array"""
+        with self.lock:
+            window = self._spans.get(stage)
+            if window is None:
+                return np.empty(0, dtype=np.int64)
+            return np.fromiter(window.durations, dtype=np.int64, count=len(window.durations))
+
+    def stage_stats(self, stage):
+        """
+        Summary of one stage in microseconds
+
+        Returns:
+            dict: count, mean_us, p50_us, p99_us, p99.9_us and max_us (None if never recorded)
+        """
+        durations = self.durations(stage)
+        with self.lock:
+            window = self._spans.get(stage)
+            if window is None:
+                return None
+            count, total_ns, max_ns = window.count, window.total_ns, window.max_ns
+        stats = {"count": count, "mean_us": total_ns / count / 1e3, "max_us": max_ns / 1e3}
+        for percentile, value in zip(PERCENTILES, np.percentile(durations, PERCENTILES)):
+            stats[f"p{percentile:g}_us"] = value / 1e3
+        return stats
+
+    def histogram(self, stage, bins=20):
+        """
+        Log-spaced histogram of a stage's recent durations
+
+        Returns:
+            tuple: (counts, bin_edges_us) as returned by numpy.histogram
+        """
+        durations = self.durations(stage)
+        if len(durations) == 0:
+            return np.zeros(bins, dtype=np.int64), np.zeros(bins + 1)
+        low = max(durations.min(), 1)
+        high = max(durations.max(), low + 1)
+        counts, edges = np.histogram(durations, bins=np.geomspace(low, high, bins + 1))
+        return counts, edges / 1e3
+
+    @property
+    def stages(self):
+        """Recorded stage names, known stages first in pipeline order"""
+        with self.lock:
+            names = list(self._spans)
+        return sorted(names, key=lambda name: (STAGES.index(name) if name in STAGES else len(STAGES), name))
+
+    def register_stats(self, name, stats):
+        """
+        Include another component's counters in get_metrics and format_report
+
+        The callable is only invoked when metrics are read, so components
+        keep counting on their own without touching the monitor per event.
+
+        Args:
+            name (str): Key of the counters in get_metrics, e.g. 'cost_cache'
+            stats (callable): Returns a dict of counters
+        """
+        with self.lock:
+            self._stats_sources[name] = stats
+
+    def record_network_latency(self, server_time, receive_time=None):
+        """
+        Record the delay between an exchange timestamp and its arrival
+
+        Args:
+            server_time (float): Exchange timestamp in epoch seconds
+            receive_time (float): Arrival time in epoch seconds (now if None)
+        """
+        receive_time = time.time() if receive_time is None else receive_time
+        with self.lock:
+            self.network_latencies.append(receive_time - server_time)
+
+    def mean(self, stage):
+        """Mean duration of a stage in seconds (0 if never recorded)"""
+        with self.lock:
+            window = self._spans.get(stage)
+            if window is None:
+                return 0.0
+            return window.total_ns / window.count / 1e9
+
     def get_metrics(self):
+        """
+        Snapshot of every metric
+
+        Returns:
+            dict: messages_per_second, messages, per-stage stats under 'stages',
+            the mean network latency in seconds and registered counters under 'counters'
+        """
         with self.lock:
-            metrics = {
-                "avg_processing_time": np.mean(self.processing_times) if self.processing_times else 0,
-                "max_processing_time": np.max(self.processing_times) if self.processing_times else 0,
-                "avg_ui_latency": np.mean(self.ui_update_times) if self.ui_update_times else 0,
-                "avg_network_latency": np.mean(self.network_latencies) if self.network_latencies else 0,
-                "messages_per_second": len(self.processing_times) / (time.time() - time.time())
-            }
-        return metrics
\ No newline at end of file
+            latencies = list(self.network_latencies)
+            sources = dict(self._stats_sources)
+        return {
+            "messages_per_second": self.messages_per_second,
+            "messages": self.messages,
+            "stages": {stage: self.stage_stats(stage) for stage in self.stages},
+            "avg_network_latency": float(np.mean(latencies)) if latencies else 0.0,
+            "counters": {name: stats() for name, stats in sources.items()},
+        }
+
+    def format_report(self):
+        """Human-readable table of the per-stage percentiles"""
+        metrics = self.get_metrics()
+        lines = [f"{'stage':<20}{'count':>10}{'p50 us':>10}{'p99 us':>10}{'p99.9 us':>10}{'max us':>10}"]
+        for stage, stats in metrics["stages"].items():
+            lines.append(f"{stage:<20}{stats['count']:>10}{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}"
+                         f"{stats['p99.9_us']:>10.1f}{stats['max_us']:>10.1f}")
+        lines.append(f"messages/s: {metrics['messages_per_second']:.1f}")
+        for name, counters in metrics["counters"].items():
+            values = " ".join(f"{key}={value:.3g}" if isinstance(value, float) else f"{key}={value}"
+                              for key, value in counters.items())
+            lines.append(f"{name}: {values}")
+        return "\n".join(lines)
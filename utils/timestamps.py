@@ -0,0 +1,54 @@
+# trade_simulator/utils/timestamps.py
+import math
+from datetime import datetime, timezone
+
+
+def parse_exchange_timestamp(value):
+    """
+    Convert an exchange timestamp into seconds since the epoch
+
+    Accepts ISO 8601 strings such as '2025-05-04T10:39:13Z' (with or without
+    fractional seconds) and numeric epoch values in seconds or milliseconds,
+    as numbers or strings.
+
+    Args:
+        value: Timestamp from an L2 message
+
+    Returns:
+        float or None: Epoch seconds, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        # Exchanges commonly send epoch milliseconds
+        return value / 1000.0 if value > 1e11 else float(value)
+    try:
+        text = value.strip()
+        try:
+            number = float(text)
+        except ValueError:
+            pass
+        else:
+            # Epoch strings, possibly fractional; nan and inf are not times
+            return parse_exchange_timestamp(number) if math.isfinite(number) else None
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        parsed = datetime.fromisoformat(text)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def format_exchange_timestamp(epoch):
+    """
+    Format epoch seconds as an ISO 8601 UTC string with a trailing 'Z'
+
+    Args:
+        epoch (float): Seconds since the epoch
+
+    Returns:
+        str: Timestamp such as '2025-05-04T10:39:13.250000Z'
+    """
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")